@@ -35,9 +35,12 @@ bl_info = {
 
 def register() -> None:
     registration_system.reg()
-    bpy.utils.register_class(test.PT_something)
+    # Headless bakes have no UI to draw panels in
+    if registration_system.registration_profile() != registration_system.BATCH_PROFILE:
+        bpy.utils.register_class(test.PT_something)
 
 
 def unregister() -> None:
-    bpy.utils.unregister_class(test.PT_something)
+    if test.PT_something.is_registered:
+        bpy.utils.unregister_class(test.PT_something)
     registration_system.unreg()
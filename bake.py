@@ -0,0 +1,44 @@
+"""Headless batch bake entry point, run it with Blender in background mode.
+
+    blender --background --factory-startup --python BiomeNodes/bake.py -- description.json -o out -j 4
+
+The add-on is enabled with the batch registration profile(no icons, panels or pointer properties),
+then `core.batch.bake.main` bakes the description, see it for the arguments and the description format.
+Importing this module does nothing, so module discovery of the add-on can scan it safely.
+"""
+import importlib
+import logging
+import os
+import sys
+from pathlib import Path
+
+
+def enable_addon(package_name: str) -> None:
+    """`enable_addon` function enables the add-on with the batch registration profile.
+
+    Args:
+        package_name (str): Name of the add-on package.
+    """
+    import addon_utils  # noqa: WPS433  # Only available inside Blender
+
+    os.environ['BIOME_NODES_REGISTRATION'] = 'batch'
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    addon_utils.enable(package_name, default_set=False, handle_error=None)
+
+
+def main() -> int:
+    """`main` function enables the add-on and bakes with arguments after `--`.
+
+    Returns:
+        int: Exit code.
+    """
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    package_name = Path(__file__).resolve().parent.name
+    enable_addon(package_name)
+
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    return importlib.import_module('{package}.core.batch.bake'.format(package=package_name)).main(argv)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
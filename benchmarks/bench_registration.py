@@ -0,0 +1,212 @@
+"""Benchmarks of the registration subsystem on a plain Python interpreter.
+
+The add-on's `core` and `util` packages are copied into a temporary `BiomeNodes` package together with
+a generated `synthetic` package of Operators, PropertyGroups and IconGroups, and `bpy` is replaced by
+`benchmarks/fake_bpy`. Every measurement runs in a fresh interpreter, so import costs are real:
+
+    python benchmarks/bench_registration.py --operators 2000 --property-groups 500 --icon-groups 100
+
+Phases: cold discovery(no manifest), warm discovery(manifest present), register, unregister.
+Reported are the median wall time and the peak of traced memory of every phase.
+"""
+import argparse
+import json
+import shutil
+import statistics
+import struct
+import subprocess  # noqa: S404
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+import zlib
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FAKE_BPY = Path(__file__).resolve().parent / 'fake_bpy'
+PACKAGE_NAME = 'BiomeNodes'
+
+OPERATOR_TEMPLATE = '''
+class OT_Synth{module}_Operator{index}Name(bt.Operator):
+    bl_description = 'Synthetic Operator {index} of module {module}.'
+
+    def execute(self, context):
+        return {{'FINISHED'}}
+'''
+
+PROPERTY_GROUP_TEMPLATE = '''
+@register_property_group(bt.Scene, 'bn_synth_{module}_{index}')
+class PG_Synth{module}_{index}(bt.PropertyGroup):
+    value: bp.FloatProperty(name='Value', default={index})
+    enabled: bp.BoolProperty(name='Enabled')
+'''
+
+ICON_GROUP_TEMPLATE = '''
+class IconsSynth{module}_{index}(IconGroup):
+    icon = IconProperty('synth_{module}_{index}', 'icon.png')
+'''
+
+MODULE_HEADER = '''import bpy.props as bp
+import bpy.types as bt
+
+from ...core.class_register.decorators import register_property_group
+from ...core.class_register.icon_reg import IconGroup, IconProperty
+'''
+
+
+def png_bytes(size: int = 32) -> bytes:
+    """Returns a valid grey PNG image, so icons can be loaded without image libraries."""
+
+    def chunk(kind: bytes, payload: bytes) -> bytes:
+        body = kind + payload
+        return struct.pack('>I', len(payload)) + body + struct.pack('>I', zlib.crc32(body))
+
+    rows = b''.join(b'\x00' + b'\x80' * size for _ in range(size))
+    header = struct.pack('>IIBBBBB', size, size, 8, 0, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(rows)) + chunk(b'IEND', b'')
+
+
+def spread(total: int, parts: int) -> list[int]:
+    """Splits `total` into `parts` nearly equal counts."""
+    return [total // parts + (1 if index < total % parts else 0) for index in range(parts)]
+
+
+def build_tree(root: Path, args: argparse.Namespace) -> None:
+    """Creates the temporary add-on package with a synthetic package of registrable Classes."""
+    package = root / PACKAGE_NAME
+    shutil.copytree(REPO_ROOT / 'core', package / 'core', ignore=shutil.ignore_patterns('__pycache__'))
+    shutil.copytree(REPO_ROOT / 'util', package / 'util', ignore=shutil.ignore_patterns('__pycache__'))
+    (package / '__init__.py').write_text('', encoding='utf-8')
+
+    synthetic = package / 'synthetic'
+    for sub_package in range(args.packages):
+        directory = synthetic / 'pack{index}'.format(index=sub_package)
+        directory.mkdir(parents=True)
+        (directory / '__init__.py').write_text('', encoding='utf-8')
+        (directory / 'icon.png').write_bytes(png_bytes())
+    (synthetic / '__init__.py').write_text('', encoding='utf-8')
+
+    operators = spread(args.operators, args.modules)
+    property_groups = spread(args.property_groups, args.modules)
+    icon_groups = spread(args.icon_groups, args.modules)
+    for module in range(args.modules):
+        source = [MODULE_HEADER]
+        source += [OPERATOR_TEMPLATE.format(module=module, index=index) for index in range(operators[module])]
+        source += [
+            PROPERTY_GROUP_TEMPLATE.format(module=module, index=index) for index in range(property_groups[module])
+        ]
+        source += [ICON_GROUP_TEMPLATE.format(module=module, index=index) for index in range(icon_groups[module])]
+        directory = synthetic / 'pack{index}'.format(index=module % args.packages)
+        (directory / 'module{index}.py'.format(index=module)).write_text('\n'.join(source), encoding='utf-8')
+
+    # Modules without registrable Classes, the manifest lets warm starts skip importing them
+    for helper in range(args.helper_modules):
+        directory = synthetic / 'pack{index}'.format(index=helper % args.packages)
+        (directory / 'helper{index}.py'.format(index=helper)).write_text(
+            'CONSTANT = {index}\n\n\ndef helper():\n    return CONSTANT\n'.format(index=helper),
+            encoding='utf-8',
+        )
+
+
+def measure(phase: str, function: Any) -> tuple[Any, dict[str, float]]:
+    """Runs `function` and returns its result with wall time and peak traced memory."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, {
+        '{phase}_ms'.format(phase=phase): elapsed * 1000,
+        '{phase}_peak_kib'.format(phase=phase): peak / 1024,
+    }
+
+
+def child(root: Path) -> None:
+    """Runs one measurement in the current interpreter and prints it as JSON."""
+    sys.path[:0] = [str(FAKE_BPY), str(root)]
+
+    # The package `__init__` imports UI modules, registration only needs the package itself
+    package = types.ModuleType(PACKAGE_NAME)
+    package.__path__ = [str(root / PACKAGE_NAME)]
+    sys.modules[PACKAGE_NAME] = package
+
+    import importlib  # noqa: WPS433
+
+    register = importlib.import_module(PACKAGE_NAME + '.core.register')
+    _, results = measure('discovery', register.build_registration)
+    _, register_results = measure('register', lambda: register.reg(deferred=False))
+    results.update(register_results)
+    for icon_groups in register.register_icons.icon_groups:
+        for icon_group in icon_groups:
+            register.register_icons.ensure_loaded(icon_group)
+    _, unregister_results = measure('unregister', register.unreg)
+    results.update(unregister_results)
+    results['modules'] = len(register.modules)
+    print(json.dumps(results))  # noqa: WPS421
+
+
+def run_child(root: Path) -> dict[str, float]:
+    """Runs `child` in a fresh interpreter."""
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, __file__, '--child', str(root)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(output.stdout.splitlines()[-1])
+
+
+def main() -> None:
+    """Builds the synthetic tree and runs cold and warm measurements."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--operators', type=int, default=2000)
+    parser.add_argument('--property-groups', type=int, default=500)
+    parser.add_argument('--icon-groups', type=int, default=100)
+    parser.add_argument('--modules', type=int, default=200)
+    parser.add_argument('--helper-modules', type=int, default=200)
+    parser.add_argument('--packages', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', type=Path, help='Write the results to this file.')
+    parser.add_argument('--child', type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        child(args.child)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='bn_bench_') as tmp:
+        root = Path(tmp)
+        build_tree(root, args)
+
+        cache = root / PACKAGE_NAME / '__pycache__'
+        runs: dict[str, list[dict[str, float]]] = {'cold': [], 'warm': []}
+        for _ in range(args.repeat):
+            shutil.rmtree(cache, ignore_errors=True)
+            runs['cold'].append(run_child(root))
+            runs['warm'].append(run_child(root))
+
+    report = {
+        'parameters': {key: value for key, value in vars(args).items() if key not in {'json', 'child'}},
+        'results': {
+            start: {key: statistics.median(run[key] for run in start_runs) for key in start_runs[0]}
+            for start, start_runs in runs.items()
+        },
+    }
+
+    print('{phase:<24}{cold:>14}{warm:>14}'.format(phase='median', cold='cold', warm='warm'))  # noqa: WPS421
+    for key in report['results']['cold']:
+        print('{key:<24}{cold:>14.2f}{warm:>14.2f}'.format(  # noqa: WPS421
+            key=key,
+            cold=report['results']['cold'][key],
+            warm=report['results']['warm'][key],
+        ))
+
+    if args.json is not None:
+        args.json.write_text(json.dumps(report, indent=2), encoding='utf-8')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,7 @@
+"""Headless stand-in for Blender's `bpy` module.
+
+Covers the part of the API the add-on uses outside of drawing, so registration can be
+benchmarked and exercised on a plain Python interpreter. Put `benchmarks/fake_bpy` on `sys.path`
+before importing the add-on. It is never imported inside Blender.
+"""
+from . import app, props, types, utils  # noqa: F401
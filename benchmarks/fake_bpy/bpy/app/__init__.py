@@ -0,0 +1,5 @@
+"""Stand-ins for `bpy.app`."""
+from . import timers  # noqa: F401
+
+background = True
+version = (3, 4, 1)
@@ -0,0 +1,26 @@
+"""Stand-in for `bpy.app.timers`, registered functions run when `run_pending` is called."""
+from collections.abc import Callable
+from typing import Any
+
+registered: list[Callable[[], Any]] = []
+
+
+def register(function: Callable[[], Any], first_interval: float = 0, persistent: bool = False) -> None:  # noqa: D103
+    registered.append(function)
+
+
+def unregister(function: Callable[[], Any]) -> None:  # noqa: D103
+    registered.remove(function)
+
+
+def is_registered(function: Callable[[], Any]) -> bool:  # noqa: D103
+    return function in registered
+
+
+def run_pending() -> None:
+    """Runs every registered function once, functions that return a number are kept registered."""
+    for function in list(registered):
+        if function not in registered:
+            continue
+        if function() is None:
+            registered.remove(function)
@@ -0,0 +1,20 @@
+"""Stand-ins for `bpy.props` functions, properties are recorded as `(function name, keywords)` pairs."""
+from typing import Any
+
+
+def _property(name: str) -> Any:
+    def property_function(**kwargs: Any) -> tuple[str, dict[str, Any]]:
+        return (name, kwargs)
+
+    property_function.__name__ = name
+    return property_function
+
+
+BoolProperty = _property('BoolProperty')
+CollectionProperty = _property('CollectionProperty')
+EnumProperty = _property('EnumProperty')
+FloatProperty = _property('FloatProperty')
+FloatVectorProperty = _property('FloatVectorProperty')
+IntProperty = _property('IntProperty')
+PointerProperty = _property('PointerProperty')
+StringProperty = _property('StringProperty')
@@ -0,0 +1,61 @@
+"""Stand-ins for `bpy.types` Classes, only the Class hierarchy matters for registration."""
+from typing import Any
+
+
+class bpy_struct():  # noqa: N801
+    """Base Class of all Blender types."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.__dict__.update(kwargs)
+
+
+class ID(bpy_struct):  # noqa: D101
+    pass
+
+
+class Operator(bpy_struct):  # noqa: D101
+    pass
+
+
+class PropertyGroup(bpy_struct):  # noqa: D101
+    pass
+
+
+class Panel(bpy_struct):  # noqa: D101
+    pass
+
+
+class Menu(bpy_struct):  # noqa: D101
+    pass
+
+
+class ImagePreview(bpy_struct):  # noqa: D101
+    pass
+
+
+class Context(bpy_struct):  # noqa: D101
+    pass
+
+
+class Scene(ID):  # noqa: D101
+    pass
+
+
+class Object(ID):  # noqa: D101
+    pass
+
+
+class Image(ID):  # noqa: D101
+    pass
+
+
+class Mesh(ID):  # noqa: D101
+    pass
+
+
+class WindowManager(ID):  # noqa: D101
+    pass
+
+
+class Event(bpy_struct):  # noqa: D101
+    pass
@@ -0,0 +1,24 @@
+"""Stand-ins for `bpy.utils` registration functions.
+
+Like Blender, registering a Class twice or unregistering a not registered Class raises `RuntimeError`,
+and an `Operator` needs a `bl_idname` in the `category.name` form.
+"""
+from . import previews  # noqa: F401
+
+registered_classes: dict[type, None] = {}
+
+
+def register_class(cls: type) -> None:  # noqa: D103
+    from ..types import Operator  # noqa: WPS433
+
+    if cls in registered_classes:
+        raise RuntimeError('register_class(...): already registered as a subclass {name}'.format(name=cls.__name__))
+    if issubclass(cls, Operator) and str(getattr(cls, 'bl_idname', '')).count('.') != 1:
+        raise RuntimeError('register_class(...): invalid bl_idname of {name}'.format(name=cls.__name__))
+    registered_classes[cls] = None
+
+
+def unregister_class(cls: type) -> None:  # noqa: D103
+    if cls not in registered_classes:
+        raise RuntimeError('unregister_class(...): missing bl_rna of {name}'.format(name=cls.__name__))
+    del registered_classes[cls]  # noqa: WPS420
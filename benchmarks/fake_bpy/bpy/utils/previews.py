@@ -0,0 +1,29 @@
+"""Stand-ins for `bpy.utils.previews`, images are not decoded."""
+import itertools
+
+from ..types import ImagePreview
+
+_icon_ids = itertools.count(1)
+collections: list['ImagePreviewCollection'] = []
+
+
+class ImagePreviewCollection(dict[str, ImagePreview]):
+    """Dictionary of previews, like the one returned by `bpy.utils.previews.new`."""
+
+    def load(self, name: str, path: str, path_type: str, force_reload: bool = False) -> ImagePreview:  # noqa: D102
+        with open(path, 'rb') as image_file:
+            image_file.read()
+        preview = ImagePreview(icon_id=next(_icon_ids), path=path, path_type=path_type)
+        self[name] = preview
+        return preview
+
+
+def new() -> ImagePreviewCollection:  # noqa: D103
+    collection = ImagePreviewCollection()
+    collections.append(collection)
+    return collection
+
+
+def remove(collection: ImagePreviewCollection) -> None:  # noqa: D103
+    collection.clear()
+    collections.remove(collection)
@@ -0,0 +1,123 @@
+"""Import-time budget check of the add-on on a plain Python interpreter.
+
+The registration module is imported in fresh interpreters under `python -X importtime`, with `bpy`
+replaced by `benchmarks/fake_bpy`, and the median import time is compared with a budget:
+
+    python benchmarks/import_budget.py --budget-ms 100 --preload logging --preload typing
+
+The budget can also be set with `BIOME_NODES_IMPORT_BUDGET_MS` environment variable. Bytecode is
+compiled by a first, unmeasured import, like on every start after the first one. The exit status is 1
+if the budget is exceeded, the modules that took the longest are listed either way. Modules the host
+process has already imported(Blender imports plenty of the standard library on startup) are excluded
+from the measurement with `--preload`.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess  # noqa: S404
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FAKE_BPY = Path(__file__).resolve().parent / 'fake_bpy'
+PACKAGE_NAME = 'BiomeNodes'
+MODULE_NAME = PACKAGE_NAME + '.core.register'
+
+BUDGET_ENV = 'BIOME_NODES_IMPORT_BUDGET_MS'
+DEFAULT_BUDGET_MS = 100
+
+# `import time: self [us] | cumulative | imported package`, nesting is indentation of the name
+IMPORTTIME_PATTERN = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+MEASUREMENT_MARKER = '-- measured imports --'
+
+# The package `__init__` imports UI modules, so the package itself is a stub pointing at the repository
+CHILD_SOURCE = '''
+import importlib, sys, types
+sys.path[:0] = [{fake_bpy!r}]
+package = types.ModuleType({package!r})
+package.__path__ = [{path!r}]
+sys.modules[{package!r}] = package
+for name in {preload!r}:
+    importlib.import_module(name)
+sys.stderr.write({marker!r} + '\\n')
+sys.stderr.flush()
+importlib.import_module({module!r})
+'''
+
+
+def import_times(module: str, preload: list[str]) -> list[tuple[str, int, int, int]]:
+    """Imports `module` in a fresh interpreter and returns name, depth, self and cumulative us of every import."""
+    source = CHILD_SOURCE.format(
+        fake_bpy=str(FAKE_BPY),
+        package=PACKAGE_NAME,
+        path=str(REPO_ROOT),
+        preload=preload,
+        marker=MEASUREMENT_MARKER,
+        module=module,
+    )
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, '-X', 'importtime', '-c', source],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    times = []
+    # Imports of preloaded modules are reported before the marker and are not part of the measurement
+    measured = output.stderr.split(MEASUREMENT_MARKER, maxsplit=1)[-1]
+    for line in measured.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match is not None:
+            self_us, cumulative_us, indent, name = match.groups()
+            times.append((name, len(indent) // 2, int(self_us), int(cumulative_us)))
+    return times
+
+
+def total_ms(times: list[tuple[str, int, int, int]]) -> float:
+    """Returns the time of all imports the module triggered, that is the sum of top level imports."""
+    return sum(cumulative for _, depth, _, cumulative in times if depth == 0) / 1000
+
+
+def main() -> None:
+    """Measures the import time and exits with status 1 if it is over the budget."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget-ms', type=float, default=float(os.environ.get(BUDGET_ENV, DEFAULT_BUDGET_MS)))
+    parser.add_argument('--module', default=MODULE_NAME)
+    parser.add_argument('--preload', action='append', default=[], help='Module imported before the measurement.')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help='Number of slowest modules to list.')
+    args = parser.parse_args()
+
+    import_times(args.module, args.preload)
+    runs = [import_times(args.module, args.preload) for _ in range(args.repeat)]
+    median_ms = statistics.median(total_ms(times) for times in runs)
+
+    slowest = sorted(runs[-1], key=lambda entry: entry[2], reverse=True)[:args.top]
+    print('{name:<60}{self:>12}{cumulative:>14}'.format(  # noqa: WPS421
+        name='slowest imports of the last run',
+        self='self ms',
+        cumulative='cumulative ms',
+    ))
+    for name, _, self_us, cumulative_us in slowest:
+        print('{name:<60}{self:>12.2f}{cumulative:>14.2f}'.format(  # noqa: WPS421
+            name=name,
+            self=self_us / 1000,
+            cumulative=cumulative_us / 1000,
+        ))
+
+    within = median_ms <= args.budget_ms
+    verdict = 'Import of {module} took {median:.2f} ms(median of {repeat}), the budget is {budget:.2f} ms: {result}.'
+    print(verdict.format(  # noqa: WPS421
+        module=args.module,
+        median=median_ms,
+        repeat=args.repeat,
+        budget=args.budget_ms,
+        result='ok' if within else 'exceeded',
+    ))
+    if not within:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
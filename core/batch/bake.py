@@ -0,0 +1,331 @@
+"""Headless batch baking of biome layers and instances, e.g. on render farm nodes.
+
+A bake description is a JSON file with a global seed, parameters of the pipeline stages and a list
+of variants(tiles or scenes), every variant overrides some of them. Seeds of stages select random streams
+below the global seed, like the Scene global seed does inside Blender:
+
+    {
+        "seed": 0,
+        "heightmap": {"resolution": 2048, "seed": 7},
+        "climate": {"size": 1000, "height_scale": 200},
+        "classifier": {"rules": [{"name": "forest", "moisture": [0.4, 1]}], "temperature": [-30, 40, 64]},
+        "scatter": {"species": [{"name": "tree", "radius": 4}]},
+        "outputs": ["heightmap", "biomes", "scatter"],
+        "variants": [{"name": "a"}, {"name": "b", "heightmap": {"seed": 8}}]
+    }
+
+Variants are baked in parallel on spawned worker processes, every worker evaluates its own graph
+of `add_biome_nodes`, so nothing here may depend on `bpy`. Results are written to one directory
+per variant, arrays as `.npy` and records(instances, lookup tables) as `.npz` of their fields.
+
+A graph file saved in Blender(see `graph_file`) can be baked instead of a description, as one variant
+named by the file. Only nodes the requested outputs depend on are read from it.
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from collections.abc import Sequence
+from concurrent.futures import as_completed
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ..biome.classification import AXES, BiomeRule, ClassifierParameters, LookupAxis
+from ..biome.climate import ClimateParameters
+from ..graph.evaluator import NodeGraph
+from ..graph.graph_file import GraphFile, is_graph_file
+from ..graph.pipeline import PIPELINE_OUTPUTS, add_biome_nodes
+from ..scatter.instances import InstanceBuffer
+from ..scatter.poisson import ScatterParameters, Species
+from ..terrain.heightmap import HeightmapParameters
+from ..terrain.tiling import spawn_executor, tile_workers
+from ...util.rng import RandomStreams
+
+DEFAULT_OUTPUTS = ('heightmap', 'biomes', 'scatter')
+
+# Sections of a description, variants override fields of the same sections
+SECTIONS = ('heightmap', 'climate', 'classifier', 'scatter')
+
+# Random streams of sections with a seed, the same as inside Blender
+STAGE_STREAMS = {'heightmap': 'heightmap', 'climate': 'climate', 'scatter': 'scatter'}
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BakeVariant():
+    """`BakeVariant` Class is one bake of a description, a tile or a scene.
+
+    Args:
+        name (str): Name of the variant, also the name of its output directory.
+        parameters (dict[str, dict[str, Any]]): Node name to its parameters, see `NodeGraph.set_parameters`.
+    """
+
+    name: str
+    parameters: dict[str, dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class BakeDescription():
+    """`BakeDescription` Class is a parsed bake description.
+
+    Args:
+        outputs (tuple[str, ...]): Names of nodes to bake.
+        variants (tuple[BakeVariant, ...]): Variants to bake.
+    """
+
+    outputs: tuple[str, ...]
+    variants: tuple[BakeVariant, ...]
+
+
+def _checked(cls: type, values: dict[str, Any]) -> dict[str, Any]:
+    known = {field.name for field in fields(cls)}
+    unknown = set(values) - known
+    if unknown:
+        raise ValueError('Unknown {name} fields: {fields}.'.format(
+            name=cls.__name__,
+            fields=', '.join(sorted(unknown)),
+        ),
+        )
+    return values
+
+
+def _range(value_range: Sequence[float] | None) -> tuple[float, float] | None:
+    return None if value_range is None else (float(value_range[0]), float(value_range[1]))
+
+
+def classifier_parameters(values: dict[str, Any]) -> ClassifierParameters:
+    """`classifier_parameters` function builds lookup table parameters from their JSON form.
+
+    Args:
+        values (dict[str, Any]): Fields of `ClassifierParameters`, rules as objects and axes as \
+        `[low, high, resolution]` lists.
+
+    Returns:
+        ClassifierParameters: Parameters of the lookup table.
+    """
+    values = dict(_checked(ClassifierParameters, values))
+    rules = []
+    for rule in values.pop('rules', ()):
+        rule = _checked(BiomeRule, rule)
+        rules.append(BiomeRule(rule['name'], **{axis: _range(rule.get(axis)) for axis in AXES}))
+    axes = {axis: LookupAxis(*values.pop(axis)) for axis in AXES if axis in values}
+    return ClassifierParameters(rules=tuple(rules), **axes, **values)
+
+
+def scatter_parameters(values: dict[str, Any]) -> ScatterParameters:
+    """`scatter_parameters` function builds scatter parameters from their JSON form.
+
+    Args:
+        values (dict[str, Any]): Fields of `ScatterParameters`, species as objects.
+
+    Returns:
+        ScatterParameters: Parameters of the scatter.
+    """
+    values = dict(_checked(ScatterParameters, values))
+    species = tuple(Species(**_checked(Species, item)) for item in values.pop('species', ()))
+    return ScatterParameters(species=species, **values)
+
+
+def node_parameters(sections: dict[str, dict[str, Any]], seed: int = 0) -> dict[str, dict[str, Any]]:
+    """`node_parameters` function maps sections of a description to parameters of pipeline nodes.
+
+    Args:
+        sections (dict[str, dict[str, Any]]): Section name to its fields, see `SECTIONS`.
+        seed (int): Global seed, stage seeds are derived from it as `PG_Random.derive_seed` does.
+
+    Returns:
+        dict[str, dict[str, Any]]: Node name to its parameters.
+    """
+    streams = RandomStreams(seed)
+    sections = {
+        name: {**fields, 'seed': streams.derive_seed(STAGE_STREAMS[name], fields.get('seed', 0))}
+        if name in STAGE_STREAMS else fields
+        for name, fields in sections.items()
+    }
+    heightmap = HeightmapParameters(**_checked(HeightmapParameters, sections.get('heightmap', {})))
+    climate = ClimateParameters(**_checked(ClimateParameters, sections.get('climate', {})))
+    return {
+        'heightmap': {'parameters': heightmap},
+        'temperature': {'parameters': climate},
+        'moisture': {'parameters': climate},
+        'slope': {'size': climate.size, 'height_scale': climate.height_scale},
+        'biome_lookup': {'parameters': classifier_parameters(sections.get('classifier', {}))},
+        'scatter': {'parameters': scatter_parameters(sections.get('scatter', {}))},
+    }
+
+
+def load_description(path: str | Path) -> BakeDescription:
+    """`load_description` function reads a bake description.
+
+    Args:
+        path (str | Path): Path of the JSON description.
+
+    Returns:
+        BakeDescription: Parsed description, a description without variants has one named 'default'.
+
+    Raises:
+        ValueError: If the description is invalid.
+    """
+    data = json.loads(Path(path).read_text(encoding='utf-8'))
+    outputs = tuple(data.get('outputs', DEFAULT_OUTPUTS))
+    unknown = set(outputs) - set(PIPELINE_OUTPUTS)
+    if unknown:
+        raise ValueError('Unknown outputs: {outputs}.'.format(outputs=', '.join(sorted(unknown))))
+
+    variants = []
+    for variant in data.get('variants') or [{'name': 'default'}]:
+        sections = {
+            section: {**data.get(section, {}), **variant.get(section, {})}
+            for section in SECTIONS
+        }
+        seed = int(variant.get('seed', data.get('seed', 0)))
+        variants.append(BakeVariant(str(variant['name']), node_parameters(sections, seed)))
+    return BakeDescription(outputs, tuple(variants))
+
+
+def graph_description(path: str | Path, outputs: Sequence[str] | None = None) -> BakeDescription:
+    """`graph_description` function reads a bake description of one variant from a graph file.
+
+    Args:
+        path (str | Path): Path of the graph file.
+        outputs (Sequence[str] | None): Names of nodes to bake, `DEFAULT_OUTPUTS` stored in the file if not specified.
+
+    Returns:
+        BakeDescription: Description with one variant named by the file.
+
+    Raises:
+        ValueError: If the file is invalid.
+    """
+    with GraphFile(path) as graph_file:
+        if not outputs:
+            outputs = [name for name in DEFAULT_OUTPUTS if name in graph_file.nodes]
+        unknown = set(outputs) - set(PIPELINE_OUTPUTS)
+        if unknown:
+            raise ValueError('Unknown outputs: {outputs}.'.format(outputs=', '.join(sorted(unknown))))
+        parameters = {name: graph_file.node(name).parameters for name in graph_file.upstream(outputs)}
+    return BakeDescription(tuple(outputs), (BakeVariant(Path(path).stem, parameters),))
+
+
+def save_result(path: Path, result: Any) -> Path:
+    """`save_result` function writes a node result next to `path`, with the suffix of its format.
+
+    Args:
+        path (Path): Path of the result without a suffix.
+        result (Any): NumPy array, `InstanceBuffer` or a NamedTuple of arrays.
+
+    Returns:
+        Path: Path of the written file.
+    """
+    if isinstance(result, np.ndarray):
+        path = path.with_suffix('.npy')
+        np.save(path, result, allow_pickle=False)
+        return path
+
+    if isinstance(result, InstanceBuffer):
+        arrays = {name: result[name] for name in result.arrays}
+    else:
+        arrays = {name: array for name, array in result._asdict().items() if isinstance(array, np.ndarray)}
+    path = path.with_suffix('.npz')
+    np.savez(path, **arrays)
+    return path
+
+
+def bake_variant(variant: BakeVariant, outputs: Sequence[str], directory: str | Path, workers: int = 1) -> list[Path]:
+    """`bake_variant` function evaluates outputs of a variant and writes them to its directory.
+
+    Args:
+        variant (BakeVariant): Variant to bake.
+        outputs (Sequence[str]): Names of nodes to bake.
+        directory (str | Path): Output directory, results go to its subdirectory named by the variant.
+        workers (int): Number of tile worker processes, see `TileScheduler`.
+
+    Returns:
+        list[Path]: Paths of the written files.
+    """
+    graph = add_biome_nodes(NodeGraph())
+    for name, parameters in variant.parameters.items():
+        graph.set_parameters(name, **parameters)
+
+    with tile_workers(workers):
+        results = graph.evaluate_many(outputs)
+    variant_directory = Path(directory) / variant.name
+    variant_directory.mkdir(parents=True, exist_ok=True)
+    return [save_result(variant_directory / name, results[name]) for name in outputs]
+
+
+def bake(description: BakeDescription, directory: str | Path, jobs: int = 1) -> dict[str, list[Path]]:
+    """`bake` function bakes all variants of a description.
+
+    With one job variants are baked one by one, tiles of every heightmap run on all CPUs.
+    With more jobs variants are baked in parallel, one worker process per variant.
+
+    Args:
+        description (BakeDescription): Description to bake.
+        directory (str | Path): Output directory.
+        jobs (int): Number of variants baked at once.
+
+    Returns:
+        dict[str, list[Path]]: Variant name to paths of its files.
+    """
+    baked: dict[str, list[Path]] = {}
+    if jobs <= 1 or len(description.variants) <= 1:
+        for variant in description.variants:
+            start = time.perf_counter()
+            baked[variant.name] = bake_variant(variant, description.outputs, directory, os.cpu_count() or 1)
+            logger.info('Baked %s in %.2fs.', variant.name, time.perf_counter() - start)
+        return baked
+
+    executor = spawn_executor(min(jobs, len(description.variants)))
+    try:
+        futures = {
+            executor.submit(bake_variant, variant, description.outputs, directory): variant.name
+            for variant in description.variants
+        }
+        for future in as_completed(futures):
+            baked[futures[future]] = future.result()
+            logger.info('Baked %s.', futures[future])
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return baked
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """`main` function is the command line interface of batch bakes, see `bake.py` of the add-on.
+
+    Args:
+        argv (Sequence[str] | None): Command line arguments, `sys.argv` if not specified.
+
+    Returns:
+        int: Exit code.
+    """
+    parser = argparse.ArgumentParser(prog='bake', description='Bake biome layers and instances to disk.')
+    parser.add_argument('description', help='Path of the JSON bake description or of a graph file.')
+    parser.add_argument('-o', '--output', default='bake', help='Output directory.')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Number of variants baked in parallel.')
+    parser.add_argument('--outputs', nargs='+', choices=PIPELINE_OUTPUTS, help='Nodes to bake.')
+    parser.add_argument('--variants', nargs='+', help='Names of variants to bake, e.g. a share of a farm node.')
+    arguments = parser.parse_args(argv)
+
+    try:
+        if is_graph_file(arguments.description):
+            description = graph_description(arguments.description, arguments.outputs)
+        else:
+            description = load_description(arguments.description)
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        logger.error('Invalid bake description %s: %s', arguments.description, error)
+        return 2
+
+    variants = description.variants
+    if arguments.variants:
+        variants = tuple(variant for variant in variants if variant.name in set(arguments.variants))
+    description = BakeDescription(tuple(arguments.outputs or description.outputs), variants)
+
+    start = time.perf_counter()
+    baked = bake(description, arguments.output, arguments.jobs)
+    logger.info('Baked %d variants to %s in %.2fs.', len(baked), arguments.output, time.perf_counter() - start)
+    return 0
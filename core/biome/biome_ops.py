@@ -0,0 +1,234 @@
+"""Operators and settings of the biome classification."""
+import logging
+import math
+from typing import Any
+
+import bpy.props as bp  # noqa: WPS301
+import bpy.types as bt  # noqa: WPS301
+import numpy as np
+import numpy.typing as npt
+from typing_extensions import Self
+
+from ..class_register.decorators import register_property_group, registration_tier
+from ..graph.biome_graph import biome_graph
+from ..jobs.job_ops import run_job
+from ..jobs.runner import Job
+from ..terrain.heightmap_ops import float_image
+from .classification import BiomeRule, ClassifierParameters, LookupAxis
+from .climate import ClimateParameters
+
+PACK_TIER = 'nodes.biomes'
+
+logger = logging.getLogger(__name__)
+
+
+class PG_BiomeRule(bt.PropertyGroup):  # noqa: N801
+    """Rule of one biome, an item of `PG_Biomes.rules`."""
+
+    name: bp.StringProperty(name='Name', default='Biome')
+    color: bp.FloatVectorProperty(name='Color', subtype='COLOR', size=3, min=0, max=1, default=(0.3, 0.6, 0.2))
+    use_temperature: bp.BoolProperty(name='Use Temperature')
+    min_temperature: bp.FloatProperty(name='Min Temperature', default=0)
+    max_temperature: bp.FloatProperty(name='Max Temperature', default=20)
+    use_moisture: bp.BoolProperty(name='Use Moisture')
+    min_moisture: bp.FloatProperty(name='Min Moisture', default=0, min=0, max=1, subtype='FACTOR')
+    max_moisture: bp.FloatProperty(name='Max Moisture', default=1, min=0, max=1, subtype='FACTOR')
+    use_altitude: bp.BoolProperty(name='Use Altitude')
+    min_altitude: bp.FloatProperty(name='Min Altitude', default=0, min=0, max=1, subtype='FACTOR')
+    max_altitude: bp.FloatProperty(name='Max Altitude', default=1, min=0, max=1, subtype='FACTOR')
+    use_slope: bp.BoolProperty(name='Use Slope')
+    min_slope: bp.FloatProperty(name='Min Slope', default=0, min=0, max=math.pi / 2, subtype='ANGLE')
+    max_slope: bp.FloatProperty(name='Max Slope', default=math.pi / 2, min=0, max=math.pi / 2, subtype='ANGLE')
+
+    def rule(self: Self) -> BiomeRule:
+        """`rule` function returns the engine rule of the settings.
+
+        Returns:
+            BiomeRule: Rule of the biome, disabled ranges match anything.
+        """
+        return BiomeRule(
+            name=self.name,
+            temperature=(self.min_temperature, self.max_temperature) if self.use_temperature else None,
+            moisture=(self.min_moisture, self.max_moisture) if self.use_moisture else None,
+            altitude=(self.min_altitude, self.max_altitude) if self.use_altitude else None,
+            slope=(self.min_slope, self.max_slope) if self.use_slope else None,
+        )
+
+
+@register_property_group(bt.Scene, 'bn_biomes')
+class PG_Biomes(bt.PropertyGroup):  # noqa: N801
+    """Climate settings and biome rules, stored per Scene."""
+
+    image_name: bp.StringProperty(name='Image', default='BN Biomes')
+    seed: bp.IntProperty(
+        name='Seed',
+        description='Selects the random stream of the climate below the Scene global seed',
+        default=0,
+        min=0,
+    )
+    sea_level_temperature: bp.FloatProperty(name='Sea Level Temperature', default=15)
+    lapse_rate: bp.FloatProperty(
+        name='Lapse Rate',
+        description='Temperature drop per 1000 meters of altitude',
+        default=6.5,
+        min=0,
+    )
+    temperature_variation: bp.FloatProperty(name='Temperature Variation', default=5, min=0)
+    temperature_scale: bp.FloatProperty(name='Temperature Scale', default=1, min=0.01)
+    moisture: bp.FloatProperty(name='Moisture', default=0.5, min=0, max=1, subtype='FACTOR')
+    moisture_variation: bp.FloatProperty(name='Moisture Variation', default=0.3, min=0, max=1)
+    moisture_scale: bp.FloatProperty(name='Moisture Scale', default=2, min=0.01)
+    temperature_resolution: bp.IntProperty(name='Temperature Resolution', default=64, min=1, max=1024)
+    moisture_resolution: bp.IntProperty(name='Moisture Resolution', default=64, min=1, max=1024)
+    altitude_resolution: bp.IntProperty(name='Altitude Resolution', default=8, min=1, max=256)
+    slope_resolution: bp.IntProperty(name='Slope Resolution', default=8, min=1, max=256)
+    blend: bp.FloatProperty(
+        name='Blend',
+        description='Width of transitions between biomes as a share of the value ranges',
+        default=0.05,
+        min=0.001,
+        max=1,
+    )
+    rules: bp.CollectionProperty(type=PG_BiomeRule)
+    active_rule_index: bp.IntProperty(name='Active Rule', default=0, min=0)
+
+    def climate_parameters(self: Self) -> ClimateParameters:
+        """`climate_parameters` function returns climate parameters of the settings.
+
+        Returns:
+            ClimateParameters: Parameters of the climate layers.
+        """
+        terrain = self.id_data.bn_heightmap
+        return ClimateParameters(
+            seed=self.id_data.bn_random.derive_seed('climate', self.seed),
+            size=terrain.size,
+            height_scale=terrain.height_scale,
+            sea_level_temperature=self.sea_level_temperature,
+            lapse_rate=self.lapse_rate,
+            temperature_variation=self.temperature_variation,
+            temperature_scale=self.temperature_scale,
+            moisture=self.moisture,
+            moisture_variation=self.moisture_variation,
+            moisture_scale=self.moisture_scale,
+        )
+
+    def classifier_parameters(self: Self) -> ClassifierParameters:
+        """`classifier_parameters` function returns lookup table parameters of the settings.
+
+        Returns:
+            ClassifierParameters: Rules and axes of the lookup table.
+        """
+        default = ClassifierParameters()
+        return ClassifierParameters(
+            rules=tuple(rule.rule() for rule in self.rules),
+            temperature=LookupAxis(default.temperature.low, default.temperature.high, self.temperature_resolution),
+            moisture=LookupAxis(default.moisture.low, default.moisture.high, self.moisture_resolution),
+            altitude=LookupAxis(default.altitude.low, default.altitude.high, self.altitude_resolution),
+            slope=LookupAxis(default.slope.low, default.slope.high, self.slope_resolution),
+            blend=self.blend,
+        )
+
+    def palette(self: Self) -> npt.NDArray[np.float32]:
+        """`palette` function returns RGBA colors of rules indexed by biome ID.
+
+        Returns:
+            NDArray[float32]: Colors shaped `(rules, 4)`.
+        """
+        colors = np.ones((len(self.rules), 4), dtype=np.float32)
+        for index, rule in enumerate(self.rules):
+            colors[index, :3] = rule.color
+        return colors
+
+
+def biome_parameters(scene: bt.Scene) -> dict[str, dict[str, Any]]:
+    """`biome_parameters` function returns parameters of the biome nodes of `biome_graph` from Scene settings.
+
+    Args:
+        scene (Scene): Scene with heightmap and biome settings.
+
+    Returns:
+        dict[str, dict[str, Any]]: Node name to its parameters, see `NodeGraph.set_parameters`.
+    """
+    settings = scene.bn_biomes
+    terrain = scene.bn_heightmap
+    climate = settings.climate_parameters()
+    return {
+        'heightmap': {'parameters': terrain.parameters()},
+        'temperature': {'parameters': climate},
+        'moisture': {'parameters': climate},
+        'slope': {'size': terrain.size, 'height_scale': terrain.height_scale},
+        'biome_lookup': {'parameters': settings.classifier_parameters()},
+    }
+
+
+@registration_tier(PACK_TIER)
+class OT_BiomeNodes_ClassifyBiomes(bt.Operator):  # noqa: N801
+    """`OT_BiomeNodes_ClassifyBiomes` Operator classifies the heightmap into biomes and shows them in an Image.
+
+    Biomes are the 'biomes' node of `biome_graph`, the lookup table of the rules is rebuilt only
+    if the rules or the table resolution changed. It runs as a background job by default.
+    """
+
+    bl_description = 'Classify the heightmap into biomes of the Scene biome rules'
+
+    background: bp.BoolProperty(
+        name='Background',
+        description='Classify as a background job, without blocking the UI',
+        default=True,
+    )
+
+    def execute(self: Self, context: bt.Context) -> set[str]:  # noqa: D102
+        settings = context.scene.bn_biomes
+        if not settings.rules:
+            self.report({'WARNING'}, 'No biome rules to classify by.')
+            return {'CANCELLED'}
+
+        parameters = biome_parameters(context.scene)
+        palette = settings.palette()
+        image_name = settings.image_name
+
+        def evaluate(job: Job) -> npt.NDArray[np.uint8]:
+            # Only nodes whose parameters actually changed are marked dirty
+            with biome_graph.lock:
+                for name, node_parameters in parameters.items():
+                    biome_graph.set_parameters(name, **node_parameters)
+                return biome_graph.evaluate('biomes', job.cancelled, job.report)
+
+        def done(ids: npt.NDArray[np.uint8]) -> None:
+            height, width = ids.shape
+            image = float_image(image_name, width, height)
+            image.pixels.foreach_set(palette[ids].ravel())
+            image.update()
+            logger.info('Classified %d cells.', ids.size)
+
+        run_job(Job('Biomes', evaluate, on_done=done), self.background)
+        return {'FINISHED'}
+
+
+@registration_tier(PACK_TIER)
+class OT_BiomeNodes_AddBiomeRule(bt.Operator):  # noqa: N801
+    """`OT_BiomeNodes_AddBiomeRule` Operator adds a rule to the Scene biome settings."""
+
+    bl_description = 'Add a biome rule'
+
+    def execute(self: Self, context: bt.Context) -> set[str]:  # noqa: D102
+        settings = context.scene.bn_biomes
+        settings.rules.add()
+        settings.active_rule_index = len(settings.rules) - 1
+        return {'FINISHED'}
+
+
+@registration_tier(PACK_TIER)
+class OT_BiomeNodes_RemoveBiomeRule(bt.Operator):  # noqa: N801
+    """`OT_BiomeNodes_RemoveBiomeRule` Operator removes the active rule from the Scene biome settings."""
+
+    bl_description = 'Remove the active biome rule'
+
+    def execute(self: Self, context: bt.Context) -> set[str]:  # noqa: D102
+        settings = context.scene.bn_biomes
+        if not settings.rules:
+            return {'CANCELLED'}
+
+        settings.rules.remove(settings.active_rule_index)
+        settings.active_rule_index = max(0, min(settings.active_rule_index, len(settings.rules) - 1))
+        return {'FINISHED'}
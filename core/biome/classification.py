@@ -0,0 +1,209 @@
+"""Biome classification with Whittaker-style lookup tables.
+
+Rules are evaluated once per cell of a lookup table over temperature, moisture, altitude and slope,
+instead of once per cell of the terrain. Classifying a terrain is then a quantization of its layers and
+one gather from the table, without any per-cell branching.
+"""
+import math
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from ..terrain.noise import FloatArray
+
+# Axes of lookup tables, in the order of their dimensions
+AXES = ('temperature', 'moisture', 'altitude', 'slope')
+
+MAX_BIOMES = 256
+
+
+@dataclass(frozen=True)
+class LookupAxis():
+    """`LookupAxis` Class describes one dimension of a lookup table.
+
+    Args:
+        low (float): Lowest value of the axis, lower values are clamped.
+        high (float): Highest value of the axis, higher values are clamped.
+        resolution (int): Number of table cells along the axis, 1 ignores the axis.
+    """
+
+    low: float
+    high: float
+    resolution: int
+
+
+@dataclass(frozen=True)
+class BiomeRule():
+    """`BiomeRule` Class describes where a biome occurs, ranges that are not specified match anything.
+
+    Args:
+        name (str): Name of the biome.
+        temperature (tuple[float, float] | None): Range of temperatures in degrees Celsius.
+        moisture (tuple[float, float] | None): Range of moisture in [0, 1].
+        altitude (tuple[float, float] | None): Range of normalized heights.
+        slope (tuple[float, float] | None): Range of slopes in radians.
+    """
+
+    name: str
+    temperature: tuple[float, float] | None = None
+    moisture: tuple[float, float] | None = None
+    altitude: tuple[float, float] | None = None
+    slope: tuple[float, float] | None = None
+
+
+@dataclass(frozen=True)
+class ClassifierParameters():
+    """`ClassifierParameters` Class stores everything a lookup table depends on.
+
+    Args:
+        rules (tuple[BiomeRule, ...]): Biomes in order of priority, their indices are biome IDs.
+        temperature (LookupAxis): Temperature axis in degrees Celsius.
+        moisture (LookupAxis): Moisture axis.
+        altitude (LookupAxis): Normalized height axis.
+        slope (LookupAxis): Slope axis in radians.
+        blend (float): Width of transitions between biomes as a share of the axis ranges.
+    """
+
+    rules: tuple[BiomeRule, ...] = ()
+    temperature: LookupAxis = LookupAxis(-30, 40, 64)
+    moisture: LookupAxis = LookupAxis(0, 1, 64)
+    altitude: LookupAxis = LookupAxis(0, 1, 8)
+    slope: LookupAxis = LookupAxis(0, math.pi / 2, 8)
+    blend: float = 0.05
+
+
+class BiomeLookup(NamedTuple):
+    """`BiomeLookup` Class is a lookup table of biomes.
+
+    Args:
+        ids (NDArray[uint8]): Biome ID of every table cell, shaped by resolutions of the axes.
+        weights (NDArray[float32]): Blend weight of every biome in every table cell, \
+        shaped `(biomes, *ids.shape)`, weights of a cell sum to 1.
+        axes (tuple[LookupAxis, ...]): Axes of the table in the order of `AXES`.
+    """
+
+    ids: npt.NDArray[np.uint8]
+    weights: FloatArray
+    axes: tuple[LookupAxis, ...]
+
+
+def build_lookup(parameters: ClassifierParameters) -> BiomeLookup:
+    """`build_lookup` function evaluates all rules over every cell of a lookup table.
+
+    The affinity of a biome falls off with the squared distance outside of its ranges, measured in `blend`
+    widths. The biome of a cell is the one with the highest affinity, ties are won by earlier rules, so rules
+    that override others(e.g. cliffs by slope) go first. Blend weights are the affinities normalized
+    over all biomes, so transitions between neighbouring biomes are smooth.
+
+    Args:
+        parameters (ClassifierParameters): Rules and axes of the table.
+
+    Returns:
+        BiomeLookup: Lookup table of the rules.
+
+    Raises:
+        ValueError: If there are no rules or more than `MAX_BIOMES` of them.
+    """
+    if not 0 < len(parameters.rules) <= MAX_BIOMES:
+        raise ValueError('Biome classification needs 1 to {max} rules, got {count}.'.format(
+            max=MAX_BIOMES,
+            count=len(parameters.rules),
+        ),
+        )
+
+    axes = tuple(getattr(parameters, name) for name in AXES)
+    shape = tuple(max(1, axis.resolution) for axis in axes)
+    blend = max(parameters.blend, 1e-6)
+    log_affinity = np.zeros((len(parameters.rules), *shape), dtype=np.float32)
+
+    for dimension, (name, axis) in enumerate(zip(AXES, axes)):
+        if axis.resolution <= 1:
+            continue
+        values = np.linspace(axis.low, axis.high, axis.resolution, dtype=np.float32)
+        broadcast = [1] * len(shape)
+        broadcast[dimension] = axis.resolution
+        span = max(axis.high - axis.low, 1e-6)
+
+        for index, rule in enumerate(parameters.rules):
+            value_range = getattr(rule, name)
+            if value_range is None:
+                continue
+            low, high = value_range
+            outside = np.maximum(np.maximum(low - values, values - high), 0) / np.float32(span * blend)
+            log_affinity[index] -= (outside * outside).reshape(broadcast)
+
+    # Softmax over biomes, shifted by the maximum so far away cells don't underflow to all zeros
+    weights = np.exp(log_affinity - log_affinity.max(axis=0, keepdims=True))
+    weights /= weights.sum(axis=0, keepdims=True)
+    return BiomeLookup(log_affinity.argmax(axis=0).astype(np.uint8), weights.astype(np.float32), axes)
+
+
+def lookup_index(layers: tuple[FloatArray, ...], lookup: BiomeLookup) -> npt.NDArray[np.int32]:
+    """`lookup_index` function quantizes layers into flat indices of lookup table cells.
+
+    Args:
+        layers (tuple[NDArray[float32], ...]): Temperature, moisture, altitude and slope layers.
+        lookup (BiomeLookup): Lookup table.
+
+    Returns:
+        NDArray[int32]: Flat index of the table cell of every terrain cell.
+    """
+    flat = np.zeros(layers[0].shape, dtype=np.int32)
+    for layer, axis in zip(layers, lookup.axes):
+        resolution = max(1, axis.resolution)
+        flat *= resolution
+        if resolution > 1:
+            scale = np.float32((resolution - 1) / max(axis.high - axis.low, 1e-6))
+            cell = np.rint((layer - np.float32(axis.low)) * scale)
+            flat += np.clip(cell, 0, resolution - 1).astype(np.int32)
+    return flat
+
+
+def classify(  # noqa: WPS211
+    temperature: FloatArray,
+    moisture: FloatArray,
+    heights: FloatArray,
+    slopes: FloatArray,
+    lookup: BiomeLookup,
+) -> npt.NDArray[np.uint8]:
+    """`classify` function assigns a biome ID to every cell of a terrain.
+
+    Args:
+        temperature (NDArray[float32]): Temperature layer.
+        moisture (NDArray[float32]): Moisture layer.
+        heights (NDArray[float32]): Normalized heightmap.
+        slopes (NDArray[float32]): Slope layer.
+        lookup (BiomeLookup): Lookup table, see `build_lookup`.
+
+    Returns:
+        NDArray[uint8]: Biome IDs shaped like the layers.
+    """
+    flat = lookup_index((temperature, moisture, heights, slopes), lookup)
+    return lookup.ids.reshape(-1)[flat]
+
+
+def biome_weights(  # noqa: WPS211
+    temperature: FloatArray,
+    moisture: FloatArray,
+    heights: FloatArray,
+    slopes: FloatArray,
+    lookup: BiomeLookup,
+    biome: int,
+) -> FloatArray:
+    """`biome_weights` function returns the blend weight of one biome in every cell of a terrain.
+
+    Args:
+        temperature (NDArray[float32]): Temperature layer.
+        moisture (NDArray[float32]): Moisture layer.
+        heights (NDArray[float32]): Normalized heightmap.
+        slopes (NDArray[float32]): Slope layer.
+        lookup (BiomeLookup): Lookup table, see `build_lookup`.
+        biome (int): Biome ID.
+
+    Returns:
+        NDArray[float32]: Weights in [0, 1] shaped like the layers, e.g. a density map for scattering.
+    """
+    flat = lookup_index((temperature, moisture, heights, slopes), lookup)
+    return lookup.weights[biome].reshape(-1)[flat]
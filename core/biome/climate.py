@@ -0,0 +1,114 @@
+"""Climate layers over a heightmap: temperature and moisture.
+
+Both layers are noise fields evaluated with the heightmap noise functions, temperature additionally
+drops with altitude by a lapse rate. They are the inputs of the biome classification next to altitude and slope.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from ...util.rng import RandomStreams
+from ..terrain.noise import FloatArray, fbm, perlin, permutation
+
+# Largest grid climate noise is evaluated on, larger layers are interpolated
+CLIMATE_RESOLUTION = 256
+
+
+@dataclass(frozen=True)
+class ClimateParameters():
+    """`ClimateParameters` Class stores everything climate layers depend on.
+
+    Args:
+        seed (int): Seed of the climate noise.
+        size (float): Width and depth of the terrain in meters.
+        height_scale (float): Height of the terrain at normalized height 1 in meters.
+        sea_level_temperature (float): Mean temperature at height 0 in degrees Celsius.
+        lapse_rate (float): Temperature drop per 1000 meters of altitude in degrees Celsius.
+        temperature_variation (float): Amplitude of temperature noise in degrees Celsius.
+        temperature_scale (float): Number of temperature noise features across the terrain.
+        moisture (float): Mean moisture in [0, 1].
+        moisture_variation (float): Amplitude of moisture noise.
+        moisture_scale (float): Number of moisture noise features across the terrain.
+    """
+
+    seed: int = 0
+    size: float = 100
+    height_scale: float = 10
+    sea_level_temperature: float = 15
+    lapse_rate: float = 6.5
+    temperature_variation: float = 5
+    temperature_scale: float = 1
+    moisture: float = 0.5
+    moisture_variation: float = 0.3
+    moisture_scale: float = 2
+
+
+def _noise_field(shape: tuple[int, int], seed: int, scale: float) -> FloatArray:
+    # Climate varies over a few features across the terrain, so noise is evaluated on a coarse grid
+    # and interpolated, which is indistinguishable from full resolution and orders of magnitude faster
+    rows, columns = shape
+    coarse_rows = min(rows, CLIMATE_RESOLUTION)
+    coarse_columns = min(columns, CLIMATE_RESOLUTION)
+    row_nodes = np.linspace(0, rows - 1, coarse_rows, dtype=np.float32)
+    column_nodes = np.linspace(0, columns - 1, coarse_columns, dtype=np.float32)
+    coarse = fbm(
+        perlin,
+        (column_nodes * np.float32(scale / max(columns, 1)))[None, :],
+        (row_nodes * np.float32(scale / max(rows, 1)))[:, None],
+        permutation(seed),
+        octaves=4,
+    )
+    return _interpolate_axis(_interpolate_axis(coarse, row_nodes, rows, 0), column_nodes, columns, 1)
+
+
+def _interpolate_axis(grid: FloatArray, nodes: FloatArray, size: int, axis: int) -> FloatArray:
+    if len(nodes) == size:
+        return grid
+
+    positions = np.arange(size, dtype=np.float32)
+    upper = np.clip(np.searchsorted(nodes, positions, side='right'), 1, len(nodes) - 1)
+    lower = upper - 1
+    weight = (positions - nodes[lower]) / (nodes[upper] - nodes[lower])
+    shape = [1, 1]
+    shape[axis] = size
+    return (
+        np.take(grid, lower, axis=axis) * (1 - weight).reshape(shape)
+        + np.take(grid, upper, axis=axis) * weight.reshape(shape)
+    ).astype(np.float32)
+
+
+def temperature_layer(heights: FloatArray, parameters: ClimateParameters) -> FloatArray:
+    """`temperature_layer` function returns the temperature of every cell of a heightmap.
+
+    Args:
+        heights (NDArray[float32]): Normalized heightmap.
+        parameters (ClimateParameters): Parameters of the climate.
+
+    Returns:
+        NDArray[float32]: Temperatures in degrees Celsius.
+    """
+    # Own streams, so climate noise is not correlated with the heightmap noise of the same seed
+    seed = RandomStreams(parameters.seed).derive_seed('temperature')
+    noise = _noise_field(heights.shape, seed, parameters.temperature_scale)
+    lapse = np.float32(parameters.lapse_rate * parameters.height_scale / 1000)
+    return (
+        np.float32(parameters.sea_level_temperature)
+        - lapse * heights
+        + np.float32(parameters.temperature_variation) * noise
+    ).astype(np.float32)
+
+
+def moisture_layer(heights: FloatArray, parameters: ClimateParameters) -> FloatArray:
+    """`moisture_layer` function returns the moisture of every cell of a heightmap.
+
+    Args:
+        heights (NDArray[float32]): Normalized heightmap, only its shape is used.
+        parameters (ClimateParameters): Parameters of the climate.
+
+    Returns:
+        NDArray[float32]: Moisture in [0, 1].
+    """
+    seed = RandomStreams(parameters.seed).derive_seed('moisture')
+    noise = _noise_field(heights.shape, seed, parameters.moisture_scale)
+    moisture = np.float32(parameters.moisture) + np.float32(parameters.moisture_variation) * noise
+    return np.clip(moisture, 0, 1).astype(np.float32)
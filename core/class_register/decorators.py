@@ -48,3 +48,27 @@ def bl_options(
         return cls
 
     return decorator
+
+
+def registration_tier(
+    tier: str,
+) -> Callable[[type[bt.bpy_struct]], type[bt.bpy_struct]]:
+    """`registration_tier` decorator is used to decorate `Operator` and `PropertyGroup` Classes.
+
+    Classes of the eager tiers(`CONSTANTS.eager_registration_tiers`) are registered with the add-on,
+    Classes of any other tier are registered on first use of the tier, see `TierRegistry`.
+    If Class is not decorated - it belongs to `CONSTANTS.default_registration_tier`. Node packs decorate
+    their Operators only, their settings PropertyGroups are Scene data other packs and saved files read.
+
+    Args:
+        tier (str): Name of the tier(e.g. 'core', 'nodes.terrain').
+
+    Returns:
+        Callable[[type[bpy_struct]], type[bpy_struct]]: Wrapper function.
+    """
+
+    def decorator(cls: type[bt.bpy_struct]) -> type[bt.bpy_struct]:
+        cls.registration_tier = tier
+        return cls
+
+    return decorator
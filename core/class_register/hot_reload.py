@@ -0,0 +1,416 @@
+# noqa: D100
+import ast
+import importlib
+import importlib.util
+import logging
+import os
+import sys
+from collections.abc import Collection, Iterable
+from pathlib import Path
+from typing import Any
+
+import bpy
+import bpy.types as bt  # noqa: WPS301
+from typing_extensions import Self
+
+from ...util.core_utils import ClassIndex, file_hash, list_all_modules_helper
+from ...util.ledger import ledger
+from .operator_reg import RegisterOperators
+from .prop_reg import RegisterPropertyGroups, property_types
+from .tiers import TierRegistry
+
+HOT_RELOAD_ENV = 'BIOME_NODES_HOT_RELOAD'
+
+# Seconds between checks of module files while watching
+HOT_RELOAD_INTERVAL = 1.0
+
+# Attributes of Classes that are never patched, Blender and Python own them
+PATCH_SKIPPED = frozenset(('__dict__', '__weakref__', '__module__', '__qualname__', '__annotations__'))
+
+# `bpy.data` collections of ID types, PropertyGroups attached to them keep their data across re-registration
+ID_COLLECTIONS = {
+    'Collection': 'collections',
+    'Image': 'images',
+    'Material': 'materials',
+    'Mesh': 'meshes',
+    'NodeTree': 'node_groups',
+    'Object': 'objects',
+    'Scene': 'scenes',
+    'Texture': 'textures',
+    'WindowManager': 'window_managers',
+    'World': 'worlds',
+}
+
+
+def _stable(value: Any) -> Any:
+    # Functions and Classes are compared by name, their identity changes with every reload
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), _stable(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_stable(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(repr(_stable(item)) for item in value))
+    if hasattr(value, 'function') and hasattr(value, 'keywords'):
+        # Deferred properties of `bpy.props`
+        return (value.function.__name__, _stable(value.keywords))
+    if isinstance(value, type) or callable(value):
+        return '{module}.{name}'.format(module=value.__module__, name=getattr(value, '__qualname__', ''))
+    return repr(value)
+
+
+def class_signature(class_obj: type) -> str:
+    """`class_signature` function returns what Blender registers of a Class, stable between reloads.
+
+    That is the name, bases, `bl_*` attributes, property definitions, registration tier and pointer property.
+    Classes with equal signatures differ only in code, which can be patched without registering them again.
+
+    Args:
+        class_obj (type): Operator or PropertyGroup Class.
+
+    Returns:
+        str: Signature of the Class.
+    """
+    attributes = {name: value for name, value in vars(class_obj).items() if name.startswith('bl_') and name != 'bl_rna'}
+    return repr((
+        class_obj.__qualname__,
+        _stable(class_obj.__bases__),
+        _stable(attributes),
+        _stable(vars(class_obj).get('__annotations__', {})),
+        _stable(getattr(class_obj, 'registration_tier', None)),
+        _stable(getattr(class_obj, 'property_group_type', None)),
+        getattr(class_obj, 'property_group_attribute', None),
+    ))
+
+
+def _uses_class_cell(class_obj: type) -> bool:
+    # Methods calling `super()` are bound to their Class, they can't be moved to another one
+    for value in vars(class_obj).values():
+        function = getattr(value, '__func__', value)
+        code = getattr(function, '__code__', None)
+        if code is not None and '__class__' in code.co_freevars:
+            return True
+    return False
+
+
+def module_imports(module_name: str, path: Path) -> set[str]:
+    """`module_imports` function returns names a module imports, read from its source.
+
+    Imported objects(e.g. the node graph) can't be traced back to their module at runtime, imports can.
+
+    Args:
+        module_name (str): Name of the module, relative imports are resolved against it.
+        path (Path): Path of the module file.
+
+    Returns:
+        set[str]: Imported modules, and every `from` import as `module.name` in case it is a module.
+    """
+    package = module_name.rpartition('.')[0]
+    imported: set[str] = set()
+    for node in ast.walk(ast.parse(path.read_bytes())):
+        if isinstance(node, ast.Import):
+            imported.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = importlib.util.resolve_name('.' * node.level + (node.module or ''), package)
+            imported.add(base)
+            imported.update('{base}.{name}'.format(base=base, name=alias.name) for alias in node.names)
+    return imported
+
+
+def _patch(registered: type, reloaded: type) -> None:
+    for name in set(vars(registered)) - set(vars(reloaded)):
+        if name not in PATCH_SKIPPED and not name.startswith(('bl_', '__')):
+            delattr(registered, name)
+    for name, value in vars(reloaded).items():
+        if name not in PATCH_SKIPPED and not name.startswith('bl_'):
+            setattr(registered, name, value)
+
+
+class ModuleWatcher():
+    """`ModuleWatcher` Class reports modules of a package whose files changed since the last check.
+
+    Files are keyed by `mtime` and size, touched files are hashed so a checkout doesn't count as a change.
+    Imports of modules are parsed whenever their files change, see `module_imports`.
+
+    Args:
+        package_name (str): The name of the package to watch.
+        excluded (Collection[str]): Names of modules that are never reported.
+    """
+
+    def __init__(
+        self: Self,
+        package_name: str,
+        excluded: Collection[str] = (),
+    ) -> None:
+        self.package_name = package_name
+        self.excluded = excluded
+        self.files: dict[str, tuple[int, int, str]] = {}
+        self.imports: dict[str, set[str]] = {}
+
+    def module_path(self: Self, module_name: str) -> Path:
+        """`module_path` function returns the path of a module file of the package.
+
+        Args:
+            module_name (str): Name of the module.
+
+        Returns:
+            Path: Path of the module file.
+        """
+        root = Path(importlib.import_module(self.package_name).__path__[0])
+        relative_name = module_name[len(self.package_name) + 1:]
+        return root.joinpath(*relative_name.split('.')).with_suffix('.py')
+
+    def snapshot(self: Self) -> None:
+        """`snapshot` function records the current state of module files, later changes are reported."""
+        self.files = {}
+        self.imports = {}
+        for module_name in self._modules():
+            self._record(module_name)
+
+    def changed(self: Self) -> list[str]:
+        """`changed` function returns modules that are new or changed since the last check.
+
+        Returns:
+            list[str]: Names of the modules in package order, removed modules are forgotten.
+        """
+        changed = []
+        previous_files = self.files
+        self.files = {}
+        for module_name in self._modules():
+            previous = previous_files.get(module_name)
+            stat = self.module_path(module_name).stat()
+            if previous is not None and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+                self.files[module_name] = previous
+                continue
+
+            self._record(module_name)
+            if previous is None or previous[2] != self.files[module_name][2]:
+                changed.append(module_name)
+
+        for removed in set(self.imports) - set(self.files):
+            del self.imports[removed]  # noqa: WPS420
+        return changed
+
+    def _modules(self: Self) -> list[str]:
+        return [
+            module_name for module_name in list_all_modules_helper(self.package_name)
+            if module_name not in self.excluded
+        ]
+
+    def _record(self: Self, module_name: str) -> None:
+        path = self.module_path(module_name)
+        stat = path.stat()
+        sha1 = file_hash(path)
+        previous = self.files.get(module_name)
+        if previous is None or previous[2] != sha1 or module_name not in self.imports:
+            self.imports[module_name] = module_imports(module_name, path)
+        self.files[module_name] = (stat.st_mtime_ns, stat.st_size, sha1)
+
+
+class HotReloader():  # noqa: WPS214
+    """`HotReloader` Class reloads changed modules and registers again only Classes whose definitions changed.
+
+    Modules that import from a changed module are reloaded after it. A reloaded Class whose signature
+    (see `class_signature`) didn't change has its code patched into the registered Class, which stays
+    registered. Other Classes are unregistered, their PropertyGroup data is kept through the
+    `property_group_type`/`property_group_attribute` mapping, and new Classes of live tiers are registered.
+    State created at import(e.g. the node graph) is created again by a reload, which is fine while developing.
+
+    Args:
+        class_index (ClassIndex): Shared index of Classes of the modules.
+        register_operators (RegisterOperators): Register of `Operator` Classes.
+        register_pgroups (RegisterPropertyGroups): Register of `PropertyGroup` Classes.
+        tier_registry (TierRegistry): Registry of live tiers.
+        package_name (str | None): The name of the package, \
+        if not specified will be extracted from the module name.
+        excluded (Collection[str]): Names of modules that are never reloaded, e.g. the module holding the registers.
+        logger (Logger | None): Logger object to use for Info output.
+    """
+
+    def __init__(  # noqa: WPS211
+        self: Self,
+        class_index: ClassIndex,
+        register_operators: RegisterOperators,
+        register_pgroups: RegisterPropertyGroups,
+        tier_registry: TierRegistry,
+        package_name: str | None = None,
+        excluded: Collection[str] = (),
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        if package_name is None:
+            package_name = __name__.split('.', maxsplit=1)[0]
+
+        self.class_index = class_index
+        self.register_operators = register_operators
+        self.register_pgroups = register_pgroups
+        self.tier_registry = tier_registry
+        self.watcher = ModuleWatcher(package_name, {__name__, *excluded})
+        self.interval = HOT_RELOAD_INTERVAL
+        # Timers are identified by the function object, a bound method is a new object on every access
+        self.timer = self._poll
+
+    @staticmethod
+    def enabled() -> bool:
+        """`enabled` function returns whether watching is enabled by `BIOME_NODES_HOT_RELOAD` environment variable.
+
+        Returns:
+            bool: True if the variable is set to a non-empty value other than '0'.
+        """
+        return os.environ.get(HOT_RELOAD_ENV, '0') not in {'', '0'}
+
+    def watch(self: Self, interval: float = HOT_RELOAD_INTERVAL) -> None:
+        """`watch` function starts checking module files on a `bpy.app.timers` timer.
+
+        Args:
+            interval (float): Seconds between checks.
+        """
+        self.interval = interval
+        self.watcher.snapshot()
+        if not bpy.app.timers.is_registered(self.timer):
+            bpy.app.timers.register(self.timer, first_interval=interval)
+            ledger.record('timers', self.timer, self.stop, name='hot reload')
+
+    def stop(self: Self) -> None:
+        """`stop` function stops checking module files."""
+        ledger.discard(self.timer)
+        if bpy.app.timers.is_registered(self.timer):
+            bpy.app.timers.unregister(self.timer)
+
+    def reload(self: Self) -> list[str]:
+        """`reload` function reloads changed modules and their dependents, then updates registered Classes.
+
+        Changes are relative to the state of module files when `watch` was called, the first call
+        without `watch` only records that state.
+
+        Returns:
+            list[str]: Names of reloaded modules in reload order.
+        """
+        if not self.watcher.files:
+            self.watcher.snapshot()
+            return []
+
+        changed = self.watcher.changed()
+        if not changed:
+            return []
+
+        imports = self.watcher.imports
+        modules = self._reload_order(self._with_dependents(changed, imports), imports)
+        registered = [*self.register_operators.registered, *self.register_pgroups.registered]
+        stale: list[type] = []
+        patched = 0
+        for module_name in modules:
+            old_classes = {
+                class_obj.__qualname__: class_obj
+                for class_obj in registered
+                if class_obj.__module__ == module_name
+            }
+            if module_name in sys.modules:
+                module = importlib.reload(sys.modules[module_name])
+            else:
+                module = importlib.import_module(module_name)
+
+            for name, class_obj in list(vars(module).items()):
+                if not isinstance(class_obj, type) or class_obj.__module__ != module_name:
+                    continue
+                old_class = old_classes.pop(class_obj.__qualname__, None)
+                if old_class is None or old_class is class_obj:
+                    continue
+                if self._can_patch(old_class, class_obj, stale):
+                    _patch(old_class, class_obj)
+                    setattr(module, name, old_class)
+                    patched += 1
+                else:
+                    stale.append(old_class)
+
+            # Registered Classes that were removed from the module
+            stale += old_classes.values()
+            self.class_index.reindex(module_name)
+
+        snapshots = self._snapshot(stale)
+        self.register_pgroups.unregister(stale)
+        self.register_operators.unregister(stale)
+        for register in self.tier_registry.registers:
+            register.register(self.tier_registry.live)
+        self._restore(snapshots)
+
+        self.logger.info(
+            'Reloaded %d modules, patched %d Classes, registered %d Classes again.',
+            len(modules),
+            patched,
+            len(stale),
+            extra={'fields': {'modules': modules, 'patched': patched, 'classes': [cls.__name__ for cls in stale]}},
+        )
+        return modules
+
+    def _poll(self: Self) -> float:
+        try:
+            self.reload()
+        except Exception:  # noqa: B902  # A broken edit must not stop watching
+            self.logger.exception('Hot reload failed.')
+        return self.interval
+
+    def _can_patch(self: Self, old_class: type, new_class: type, stale: Iterable[type]) -> bool:
+        if issubclass(new_class, bt.Operator):
+            # Compare with the generated `bl_idname`, `bl_label` and `bl_options` of the registered Class
+            self.register_operators.generate(new_class)
+        if _uses_class_cell(new_class) or property_types(old_class) & set(stale):
+            return False
+        return class_signature(old_class) == class_signature(new_class)
+
+    @staticmethod
+    def _with_dependents(changed: list[str], imports: dict[str, set[str]]) -> list[str]:
+        # Not imported modules have nothing to update, changed ones are imported for the first time
+        modules = list(changed)
+        added = True
+        while added:
+            added = False
+            for module_name, imported in imports.items():
+                if module_name in sys.modules and module_name not in modules and imported.intersection(modules):
+                    modules.append(module_name)
+                    added = True
+        return modules
+
+    @staticmethod
+    def _reload_order(modules: list[str], imports: dict[str, set[str]]) -> list[str]:
+        # Dependencies first, modules in a cycle keep package order
+        remaining = [module_name for module_name in imports if module_name in modules]
+        ordered: list[str] = []
+        while remaining:
+            ready = [
+                module_name for module_name in remaining
+                if not imports[module_name].intersection(set(remaining) - {module_name})
+            ]
+            module_name = ready[0] if ready else remaining[0]
+            ordered.append(module_name)
+            remaining.remove(module_name)
+        return ordered
+
+    @staticmethod
+    def _snapshot(classes: Iterable[type]) -> list[tuple[Any, str, Any]]:
+        snapshots = []
+        for class_obj in classes:
+            property_group_type = getattr(class_obj, 'property_group_type', None)
+            attribute = getattr(class_obj, 'property_group_attribute', None)
+            collection_name = ID_COLLECTIONS.get(getattr(property_group_type, '__name__', ''))
+            if collection_name is None or not attribute:
+                continue
+            try:
+                id_blocks = list(getattr(bpy.data, collection_name))
+            except AttributeError:
+                # Blender data is restricted, e.g. while add-ons are enabled
+                continue
+            for id_block in id_blocks:
+                data = id_block.get(attribute)
+                if data is not None:
+                    snapshots.append((id_block, attribute, data.to_dict() if hasattr(data, 'to_dict') else data))
+        return snapshots
+
+    @staticmethod
+    def _restore(snapshots: list[tuple[Any, str, Any]]) -> None:
+        for id_block, attribute, data in snapshots:
+            if id_block.get(attribute) is None:
+                id_block[attribute] = data
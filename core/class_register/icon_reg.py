@@ -1,15 +1,29 @@
-from pathlib import Path
+# noqa: D100
+import logging
+import os
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing_extensions import Self
+from functools import partial
+from pathlib import Path
+from typing import Any
 
-import bpy.types as bt
+import bpy.utils.previews  # noqa: WPS301
+from typing_extensions import Self
 
-from ...util.core_utils import (get_classes,
-                                get_class_attrs,
-                                CONSTANTS)
+from ...util.core_utils import ClassIndex, get_class_attrs, get_user_cache_path
+from ...util.ledger import ledger
+from ...util.thumbnails import ThumbnailCache, pillow_available
 
 
 class IconProperty():  # pylint: disable=too-few-public-methods
+    """`IconProperty` Class declares an icon of an `IconGroup` Class.
+
+    Args:
+        name (str): Name of the icon in the preview collection.
+        path (str | Path): Path of the image, relative paths are relative to the module of the `IconGroup`.
+    """
+
     def __init__(self: Self,
                  name: str,
                  path: str | Path) -> None:
@@ -19,37 +33,176 @@ class IconProperty():  # pylint: disable=too-few-public-methods
 
 @dataclass()
 class IconGroup():
-    bn_preview_collection: list[type[bt.ImagePreview]]
+    """`IconGroup` Class groups `IconProperty` attributes that are loaded into one preview collection.
+
+    `bn_preview_collection` is set by `RegisterIcon` on the group itself when it is loaded for the first time,
+    subclasses have collections of their own.
+    """
+
+    bn_preview_collection: Any = None
 
 
 @dataclass()
 class Icons(IconGroup):
-    bn_preview_collection = []
     qqoqoqoq = str()
     icon1 = IconProperty("my_icon", ".")
 
 
-class RegisterIcon():
-    def __init__(self: Self,
-                 modules: list[str]) -> None:
-        self.icon_groups = [get_classes(mod, IconGroup) for mod in modules]
+class RegisterIcon():  # noqa: WPS306
+    """`RegisterIcon` Class provides functional to load icons of `IconGroup` Classes into preview collections.
+
+    On register image files are hashed and downscaled into the thumbnail cache on a thread pool, if Pillow
+    is installed, otherwise no pool is started and icons are loaded from their files at full resolution.
+    Preview collections are created lazily, when an icon of a group is requested for the first time
+    (e.g. when a node category is drawn), so enabling the add-on doesn't wait for image decoding.
+
+    Args:
+        modules (list[str]): list of names of modules to take in account when registering.
+        class_index (ClassIndex | None): Shared index of Classes of the modules, built if not specified.
+        logger (Logger | None): Logger object to use for Info and Warnings output.
+        thumbnail_cache (ThumbnailCache | None): Cache of downscaled icons, `get_user_cache_path` if not specified.
+    """
+
+    def __init__(
+        self: Self,
+        modules: list[str],
+        class_index: ClassIndex | None = None,
+        logger: logging.Logger | None = None,
+        thumbnail_cache: ThumbnailCache | None = None,
+    ) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        if class_index is None:
+            class_index = ClassIndex(modules, (IconGroup,))
+        if thumbnail_cache is None:
+            thumbnail_cache = ThumbnailCache(get_user_cache_path('thumbnails'))
+
+        self.icon_groups = class_index.get(IconGroup)
+        self.thumbnail_cache = thumbnail_cache
+        self.executor: ThreadPoolExecutor | None = None
+        self.prepared: dict[type[IconGroup], dict[str, Future[Path] | Path]] = {}
+        self.loaded: list[type[IconGroup]] = []
+
+    @staticmethod
+    def icon_path(icon_group: type[IconGroup], icon: IconProperty) -> Path:
+        """`icon_path` function resolves the path of an icon.
+
+        Args:
+            icon_group (type[IconGroup]): Class the icon belongs to.
+            icon (IconProperty): Icon to resolve the path of.
+
+        Returns:
+            Path: Absolute path of the image.
+        """
+        path = Path(icon.path)
+        if path.is_absolute():
+            return path
+        return Path(str(sys.modules[icon_group.__module__].__file__)).parent / path
 
     def register(self: Self) -> None:
+        """`register` function starts preparing icons of `IconGroup` Classes on a thread pool."""
+        # Without Pillow thumbnails are the source images, there is nothing to prepare
+        if pillow_available():
+            self.executor = ThreadPoolExecutor(
+                max_workers=min(8, os.cpu_count() or 1),
+                thread_name_prefix='bn_icons',
+            )
+            ledger.record('worker pools', self.executor, self.stop_preparing, name='icons')
+
         for icon_groups in self.icon_groups:
             for icon_group in icon_groups:
-                if hasattr(icon_group, "bn_preview_collection"):
-                    try:
-                        prev_col_type = getattr(IconGroup, "bn_preview_collection")
-                    except AttributeError:
-                        setattr(IconGroup, "bn_preview_collection", [])
-                        prev_col_type = getattr(IconGroup, "bn_preview_collection")
-                    if isinstance(ig_col := icon_group.bn_preview_collection, col_type := type(prev_col_type)):
-                        print(get_class_attrs(icon_group, IconProperty))
-                    else:
-                        print(f"{CONSTANTS.BColors.WARNING}Warning: 'bn_preview_collection' attribute in object \
-                              {icon_group} has invalid type. Get: {type(ig_col)}, Expected: \
-                              {col_type}.{CONSTANTS.BColors.ENDC}")
-                else:
-                    print(f"{CONSTANTS.BColors.WARNING}Warning: \
-                          {icon_group.__name__} object has no attribute 'bn_preview_collection', \
-                          skipping register.{CONSTANTS.BColors.ENDC}")
+                icons = get_class_attrs(icon_group, IconProperty)
+                if not icons:
+                    self.logger.warning('%s has no icons, skipping register.', icon_group.__name__)
+                    continue
+
+                self.prepared[icon_group] = {
+                    icon.name: self._prepare(self.icon_path(icon_group, icon))
+                    for _, icon in icons
+                }
+
+    def ensure_loaded(self: Self, icon_group: type[IconGroup]) -> Any:
+        """`ensure_loaded` function loads icons of an `IconGroup` Class into its preview collection.
+
+        Must be called from the main thread, waits for icons of the group that are still being prepared.
+
+        Args:
+            icon_group (type[IconGroup]): Class to load icons of.
+
+        Returns:
+            ImagePreviewCollection: Preview collection of the group.
+        """
+        # Looked up on the group itself, a subclass of a loaded group must not get the collection of its base
+        loaded_collection = vars(icon_group).get('bn_preview_collection')
+        if loaded_collection is not None:
+            return loaded_collection
+
+        collection = bpy.utils.previews.new()
+        for name, prepared in self.prepared.get(icon_group, {}).items():
+            path = prepared.result() if isinstance(prepared, Future) else prepared
+            if not path.is_file():
+                self.logger.warning("Icon '%s' of %s is not a file: %s.", name, icon_group.__name__, path)
+                continue
+            collection.load(name, str(path), 'IMAGE')
+
+        icon_group.bn_preview_collection = collection
+        self.loaded.append(icon_group)
+        ledger.record(
+            'preview collections',
+            icon_group,
+            partial(self.remove_previews, icon_group),
+            name=icon_group.__name__,
+        )
+        self.logger.info('Loaded icons: %s.', icon_group.__name__)
+        return collection
+
+    def icon_id(self: Self, icon_group: type[IconGroup], name: str) -> int:
+        """`icon_id` function returns the `icon_value` of an icon, loading its group on first use.
+
+        Args:
+            icon_group (type[IconGroup]): Class the icon belongs to.
+            name (str): Name of the icon.
+
+        Returns:
+            int: `icon_value` to use in UI layouts, 0 if the icon is not loaded.
+        """
+        collection = self.ensure_loaded(icon_group)
+        if name not in collection:
+            return 0
+        return int(collection[name].icon_id)
+
+    def stop_preparing(self: Self) -> None:
+        """`stop_preparing` function stops the thread pool preparing icons, icons not prepared yet are dropped."""
+        if self.executor is not None:
+            ledger.discard(self.executor)
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def remove_previews(self: Self, icon_group: type[IconGroup]) -> None:
+        """`remove_previews` function removes the preview collection of an `IconGroup` Class and frees its images.
+
+        Args:
+            icon_group (type[IconGroup]): Class to remove the preview collection of.
+        """
+        ledger.discard(icon_group)
+        loaded_collection = vars(icon_group).get('bn_preview_collection')
+        if loaded_collection is not None:
+            bpy.utils.previews.remove(loaded_collection)
+            icon_group.bn_preview_collection = None
+        if icon_group in self.loaded:
+            self.loaded.remove(icon_group)
+
+    def unregister(self: Self) -> None:
+        """`unregister` function removes loaded preview collections in reverse order and stops preparing icons."""
+        for icon_group in reversed(list(self.loaded)):
+            self.remove_previews(icon_group)
+        self.stop_preparing()
+        self.prepared.clear()
+
+    def _prepare(self: Self, path: Path) -> Future[Path] | Path:
+        if self.executor is None:
+            return path
+        return self.executor.submit(self.thumbnail_cache.prepare, path)
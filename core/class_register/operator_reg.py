@@ -1,13 +1,183 @@
 # noqa: D100
+import json
 import logging
+import os
 import re
+from collections.abc import Collection
+from functools import lru_cache, partial
+from pathlib import Path
 from typing import Any, NamedTuple
 
 import bpy.types as bt  # noqa: WPS301
 from bpy.utils import register_class, unregister_class
 from typing_extensions import Self
 
-from ...util.core_utils import CONSTANTS, get_classes
+from ...util.core_utils import CONSTANTS, ClassIndex
+from ...util.ledger import ledger
+from ...util.log import log_summary
+from ...util.profiler import profiler
+from .tiers import get_tier
+
+# Compiled once, naming helpers run for every Operator on every registration
+SNAKE_CASE_PATTERN = re.compile('(?<!^)(?=[A-Z])')
+UPPER_CASE_PATTERN = re.compile('([A-Z]+)')
+PASCAL_WORD_PATTERN = re.compile('([A-Z][a-z]+)')
+
+
+@lru_cache(maxsize=None)
+def snake_case(name: str) -> str:
+    """`snake_case` function converts PascalCase to snake_case.
+
+    Args:
+        name (str): PascalCase name.
+
+    Returns:
+        str: snake_case name.
+    """
+    return SNAKE_CASE_PATTERN.sub('_', name).lower()
+
+
+@lru_cache(maxsize=None)
+def split_pascal_case(name: str) -> str:
+    """`split_pascal_case` function splits PascalCase with spaces(e.g. 'Pascal Case Some Other Text').
+
+    Args:
+        name (str): PascalCase name.
+
+    Returns:
+        str: Words of the name separated with spaces.
+    """
+    return ' '.join(PASCAL_WORD_PATTERN.sub(r' \1', UPPER_CASE_PATTERN.sub(r' \1', name)).split())
+
+
+class OperatorNamingCache():
+    """`OperatorNamingCache` Class persists generated `bl_idname`, `bl_label` and `bl_options` between sessions.
+
+    Entries are keyed by Class qualified name and store a fingerprint of everything the generated attributes
+    depend on(Class name, declared `bl_idname`, `bl_label`, `bl_options` and `bl_options` decorator argument).
+    An entry is only used if the fingerprint of the Class still matches.
+
+    Args:
+        path (str | Path): Path of the JSON cache file.
+        logger (Logger | None): Logger object that is going to be used for debug output.
+    """
+
+    def __init__(
+        self: Self,
+        path: str | Path,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.path = Path(path)
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.dirty = False
+        self.load()
+
+    @staticmethod
+    def key(class_obj: type[bt.Operator]) -> str:
+        """`key` function returns the cache key of a Class.
+
+        Args:
+            class_obj (type[Operator]): Operator Class.
+
+        Returns:
+            str: Qualified name of the Class including its module.
+        """
+        return '{module}.{qualname}'.format(module=class_obj.__module__, qualname=class_obj.__qualname__)
+
+    @staticmethod
+    def fingerprint(class_obj: type[bt.Operator]) -> str:
+        """`fingerprint` function returns the fingerprint of declared attributes of a Class.
+
+        Must be taken before the attributes are generated.
+
+        Args:
+            class_obj (type[Operator]): Operator Class.
+
+        Returns:
+            str: Fingerprint of the Class.
+        """
+        bl_options = getattr(class_obj, 'bl_options', None)
+        bl_options_options = getattr(class_obj, 'bl_options_options', 'missing')
+        if isinstance(bl_options_options, (set, frozenset, dict)):
+            # Sets are ordered by hash, which is randomised per session
+            bl_options_options = (type(bl_options_options).__name__, sorted(bl_options_options))
+        return repr((
+            class_obj.__name__,
+            getattr(class_obj, 'bl_idname', None),
+            getattr(class_obj, 'bl_label', None),
+            sorted(bl_options) if bl_options else bl_options,
+            bl_options_options,
+        ))
+
+    def load(self: Self) -> None:
+        """`load` function reads the cache from disk, an unreadable cache is discarded."""
+        try:
+            with self.path.open(encoding='utf-8') as cache_file:
+                self.entries = json.load(cache_file)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self: Self) -> None:
+        """`save` function writes the cache to disk if anything has changed since `load`."""
+        if not self.dirty:
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with tmp_path.open('w', encoding='utf-8') as cache_file:
+                json.dump(self.entries, cache_file, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as error:
+            self.logger.debug('Could not write naming cache %s: %s.', self.path, error)
+            return
+        self.dirty = False
+
+    def apply(self: Self, class_obj: type[bt.Operator], fingerprint: str) -> bool:
+        """`apply` function sets cached attributes to a Class.
+
+        Args:
+            class_obj (type[Operator]): Operator Class.
+            fingerprint (str): Fingerprint of the Class, see `fingerprint`.
+
+        Returns:
+            bool: True if the Class was found in the cache and its fingerprint matches.
+        """
+        entry = self.entries.get(self.key(class_obj))
+        if entry is None or entry['fingerprint'] != fingerprint:
+            return False
+
+        class_obj.bl_idname = entry['bl_idname']
+        class_obj.bl_label = entry['bl_label']
+        if entry['bl_options'] is not None:
+            class_obj.bl_options = set(entry['bl_options'])
+        return True
+
+    def store(self: Self, class_obj: type[bt.Operator], fingerprint: str) -> None:
+        """`store` function caches generated attributes of a Class.
+
+        Classes with invalid `bl_options` are not cached, so the warning is raised on every registration.
+
+        Args:
+            class_obj (type[Operator]): Operator Class with generated attributes.
+            fingerprint (str): Fingerprint of the Class taken before generation, see `fingerprint`.
+        """
+        bl_options = getattr(class_obj, 'bl_options', None)
+        if bl_options is None and getattr(class_obj, 'bl_options_options', None):
+            return
+
+        self.entries[self.key(class_obj)] = {
+            'fingerprint': fingerprint,
+            'bl_idname': class_obj.bl_idname,
+            'bl_label': class_obj.bl_label,
+            'bl_options': sorted(bl_options) if bl_options is not None else None,
+        }
+        self.dirty = True
 
 
 class RegisterOperators():  # noqa: WPS306
@@ -15,10 +185,13 @@ class RegisterOperators():  # noqa: WPS306
 
     It automatically generates `bl_idname`, `bl_description` and optionally `bl_options`.
     It also warns user about not missing Class description or improper Class naming convention.
+    Classes can be registered tier by tier, see `registration_tier` decorator and `TierRegistry`.
 
     Args:
         modules (list[str]): List of module names. Those modules will be parsed for Classes of `Operator` type.
         logger (Logger | None): Logger object that is going to be used to raise warnings.
+        class_index (ClassIndex | None): Shared index of Classes of the modules, built if not specified.
+        naming_cache (OperatorNamingCache | None): Persisted cache of generated attributes, not used if not specified.
     """
 
     class Helpers(NamedTuple):
@@ -48,9 +221,7 @@ class RegisterOperators():  # noqa: WPS306
                 id_end = no_ot[id_end_index + 1:len(no_ot)]
 
                 # PascalCase to snake_case
-                id_end_modified = re.compile('(?<!^)(?=[A-Z])').sub('_', id_end).lower()
-
-                class_obj.bl_idname = '.'.join([id_attr, id_end_modified])
+                class_obj.bl_idname = '.'.join([id_attr, snake_case(id_end)])
                 return id_end
             return class_obj.bl_idname.split('.')[-1].capitalize()
 
@@ -67,12 +238,7 @@ class RegisterOperators():  # noqa: WPS306
             """
             if not getattr(class_obj, 'bl_label', None):
                 # Splitting PascalCase with spaces(e.g [Pascal, Case, Some, Other, Text])
-                label = ' '.join(
-                    re.sub(
-                        '([A-Z][a-z]+)', r' \1', re.sub('([A-Z]+)', r' \1', id_end),
-                    ).split(),
-                )
-                class_obj.bl_label = label
+                class_obj.bl_label = split_pascal_case(id_end)
 
         @staticmethod
         def bl_options_helpers(  # noqa: WPS231
@@ -93,12 +259,7 @@ class RegisterOperators():  # noqa: WPS306
                         if (blo := set(class_obj.bl_options_options)).issubset(constants.operator_flag_items):
                             class_obj.bl_options = blo
                         else:
-                            logger.warning("{warning}Not valid 'bl_options' argument in {class_name}.{endc}".format(
-                                warning=constants.BColors.warning,
-                                class_name=class_obj.__name__,
-                                endc=constants.BColors.endc,
-                            ),
-                            )
+                            logger.warning("Not valid 'bl_options' argument in %s.", class_obj.__name__)
                 else:
                     try:  # pylint: disable=too-many-try-statements
                         if not isinstance(class_obj.bl_options_options, dict):
@@ -110,82 +271,187 @@ class RegisterOperators():  # noqa: WPS306
         self: Self,
         modules: list[str],
         logger: logging.Logger | None = None,
+        class_index: ClassIndex | None = None,
+        naming_cache: OperatorNamingCache | None = None,
     ) -> None:
         if logger is None:
             self.logger = logging.getLogger(__name__)
         else:
             self.logger = logger
 
-        self.operators = [get_classes(mod, bt.Operator) for mod in modules]
+        if class_index is None:
+            class_index = ClassIndex(modules, (bt.Operator,))
+
+        self.operators = class_index.get(bt.Operator)
         self.constants = CONSTANTS()
+        self.naming_cache = naming_cache
+        self.registered: list[type[bt.Operator]] = []
+        self.generated: set[type[bt.Operator]] = set()
+
+    def tiers(self: Self) -> set[str]:
+        """`tiers` function returns names of tiers of `Operator` Classes.
+
+        Returns:
+            set[str]: Names of tiers.
+        """
+        return {
+            get_tier(class_obj, self.constants)
+            for list_of_operators in self.operators
+            for class_obj in list_of_operators
+        }
+
+    def pending(self: Self, tiers: Collection[str] | None = None) -> list[list[type[bt.Operator]]]:
+        """`pending` function returns not registered `Operator` Classes of specified tiers.
+
+        Args:
+            tiers (Collection[str] | None): Names of tiers, if not specified all tiers are taken in account.
+
+        Returns:
+            list[list[type[Operator]]]: Lists of `Operator` Classes per module.
+        """
+        registered = set(self.registered)
+        return [
+            [
+                class_obj for class_obj in list_of_operators
+                if class_obj not in registered and (tiers is None or get_tier(class_obj, self.constants) in tiers)
+            ]
+            for list_of_operators in self.operators
+        ]
+
+    def warn(self: Self, class_obj: type[bt.Operator]) -> None:
+        """`warn` function is used to warn user about missing description or 'OT' prefix in an `Operator` Class.
+
+        Args:
+            class_obj (type[Operator]): Class to check.
+        """
+        bl_description = getattr(class_obj, 'bl_description', '')
+        description = getattr(class_obj, 'description', None)
+        class_name = class_obj.__name__
+
+        # If Operator is missing description
+        if not any([bl_description, description]):
+            self.logger.warning('Missing description in %s Operator.', class_name)
+
+        # If Operator's Class name doesn't start with OT
+        if not class_name.startswith('OT'):
+            self.logger.warning("%s does not contain 'OT' with prefix.", class_name)
+
+    def generate(self: Self, class_obj: type[bt.Operator]) -> None:
+        """`generate` function generates `bl_idname`, `bl_label` and `bl_options` attributes of an `Operator` Class.
+
+        Attributes are taken from the naming cache if the Class is cached and didn't change.
+        Every Class is generated once per session.
+
+        Args:
+            class_obj (type[Operator]): Class to generate attributes for.
+        """
+        if class_obj in self.generated:
+            return
+        self.generated.add(class_obj)
 
-    def warnings(self: Self) -> None:
-        """`warnings` function is used to warn user about missing description or 'OT' prefix in `Operator` Classes."""
-        warning = self.constants.BColors.warning
-        endc = self.constants.BColors.endc
+        if self.naming_cache is not None:
+            fingerprint = self.naming_cache.fingerprint(class_obj)
+            if self.naming_cache.apply(class_obj, fingerprint):
+                return
 
-        for list_of_operators in self.operators:
+        # bl_idname attribute generation
+        id_end = self.Helpers.bl_idname_helper(class_obj)
+
+        # bl_label attribute generation
+        self.Helpers.bl_label_helper(class_obj, id_end)
+
+        # bl_options attribute generation
+        self.Helpers.bl_options_helpers(class_obj, self.logger, self.constants)
+
+        if self.naming_cache is not None:
+            self.naming_cache.store(class_obj, fingerprint)
+
+    def warnings(self: Self, operators: list[list[type[bt.Operator]]] | None = None) -> None:
+        """`warnings` function is used to warn user about missing description or 'OT' prefix in `Operator` Classes.
+
+        Args:
+            operators (list[list[type[Operator]]] | None): Lists of `Operator` Classes, all Classes by default.
+        """
+        if operators is None:
+            operators = self.operators
+
+        for list_of_operators in operators:
+            for class_obj in list_of_operators:
+                self.warn(class_obj)
+
+    def generate_attributes(self: Self, operators: list[list[type[bt.Operator]]] | None = None) -> None:
+        """`generate_attributes` function generates `bl_idname`, `bl_label` and `bl_options` attributes.
+
+        Args:
+            operators (list[list[type[Operator]]] | None): Lists of `Operator` Classes, all Classes by default.
+        """
+        if operators is None:
+            operators = self.operators
+
+        for list_of_operators in operators:
             for class_obj in list_of_operators:
-                bl_description = getattr(class_obj, 'bl_description', '')
-                description = getattr(class_obj, 'description', None)
-                class_name = class_obj.__name__
-
-                # If Operator is missing description
-                if not any([bl_description, description]):
-                    self.logger.warning('{warning}Missing description in {class_name} Operator.{endc}'.format(
-                        warning=warning,
-                        class_name=class_name,
-                        endc=endc,
-                    ),
-                    )
-
-                # If Operator's Class name doesn't start with OT
-                if not class_name.startswith('OT'):
-                    self.logger.warning("{warning}{class_name} does not contain 'OT' with prefix.{endc}".format(
-                        warning=warning,
-                        class_name=class_name,
-                        endc=endc,
-                    ),
-                    )
-
-    def generate_attributes(self: Self) -> None:
-        """`generate_attributes` function generates `bl_idname`, `bl_label` and `bl_options` attributes."""
-        helpers = self.Helpers
-
-        for list_of_operators in self.operators:
+                self.generate(class_obj)
+
+    def prepare(self: Self, operators: list[list[type[bt.Operator]]] | None = None) -> None:
+        """`prepare` function warns and generates attributes in one pass over `Operator` Classes.
+
+        The naming cache is saved afterwards.
+
+        Args:
+            operators (list[list[type[Operator]]] | None): Lists of `Operator` Classes, all Classes by default.
+        """
+        if operators is None:
+            operators = self.operators
+
+        for list_of_operators in operators:
             for class_obj in list_of_operators:
-                # bl_idname attribute generation
-                id_end = helpers.bl_idname_helper(class_obj)
+                self.warn(class_obj)
+                self.generate(class_obj)
 
-                # bl_label attribute generation
-                helpers.bl_label_helper(class_obj, id_end)
+        if self.naming_cache is not None:
+            self.naming_cache.save()
 
-                # bl_options attribute generation
-                helpers.bl_options_helpers(class_obj, self.logger, self.constants)
+    def register(self: Self, tiers: Collection[str] | None = None) -> None:
+        """`register` function automatically registers `Operator` Classes, warns and generates attributes.
 
-    def register(self: Self) -> None:
-        """`register` function automatically registers `Operator` Classes, warns and generates attributes."""
-        self.warnings()
-        self.generate_attributes()
+        Args:
+            tiers (Collection[str] | None): Names of tiers to register, if not specified all tiers are registered.
+        """
+        operators = self.pending(tiers)
+        with profiler.phase('operator naming'):
+            self.prepare(operators)
 
-        for list_of_operators in self.operators:
+        start = len(self.registered)
+        for list_of_operators in operators:
             for class_obj in list_of_operators:
-                register_class(class_obj)
-                self.logger.info('{info}Registered Operator: {class_name}.{endc}'.format(
-                    info=self.constants.BColors.info,
-                    class_name=class_obj.__name__,
-                    endc=self.constants.BColors.endc,
-                ),
-                )
-
-    def unregister(self: Self) -> None:
-        """`unregister` function automatically unregisters `Operator` Classes."""
-        for list_of_operators in self.operators:
-            for class_obj in reversed(list_of_operators):
-                unregister_class(class_obj)
-                self.logger.info('{info}Unregistered Operator: {class_name}.{endc}'.format(
-                    info=self.constants.BColors.info,
-                    class_name=class_obj.__name__,
-                    endc=self.constants.BColors.endc,
-                ),
-                )
+                with profiler.phase('register_class', class_obj.__name__):
+                    register_class(class_obj)
+                self.registered.append(class_obj)
+                ledger.record('Operators', class_obj, partial(self.release, class_obj), name=class_obj.__name__)
+        log_summary(self.logger, 'Registered', 'Operators', self.registered[start:])
+
+    def unregister(self: Self, classes: Collection[type[bt.Operator]] | None = None) -> None:
+        """`unregister` function automatically unregisters registered `Operator` Classes in reverse order.
+
+        Args:
+            classes (Collection[type[Operator]] | None): Classes to unregister(e.g. changed by a hot reload), \
+            all registered Classes by default.
+        """
+        unregistered = [
+            class_obj for class_obj in reversed(self.registered)
+            if classes is None or class_obj in classes
+        ]
+        for class_obj in unregistered:
+            self.release(class_obj)
+        log_summary(self.logger, 'Unregistered', 'Operators', unregistered)
+
+    def release(self: Self, class_obj: type[bt.Operator]) -> None:
+        """`release` function unregisters one registered `Operator` Class, it is its `ledger` release.
+
+        Args:
+            class_obj (type[Operator]): Registered Class.
+        """
+        ledger.discard(class_obj)
+        with profiler.phase('unregister_class', class_obj.__name__):
+            unregister_class(class_obj)
+        self.registered.remove(class_obj)
@@ -1,12 +1,50 @@
 # noqa: D100
 import logging
+from collections.abc import Collection
+from functools import partial
 
 import bpy.props as bp  # noqa: WPS301
 import bpy.types as bt  # noqa: WPS301
 from bpy.utils import register_class, unregister_class
 from typing_extensions import Self
 
-from ...util.core_utils import CONSTANTS, get_classes
+from ...util.core_utils import CONSTANTS, ClassIndex
+from ...util.ledger import ledger
+from ...util.log import log_summary
+from ...util.profiler import profiler
+from .tiers import get_tier
+
+
+def _pointer_type(pointer: object) -> type | None:
+    # Deferred `PointerProperty` keeps its arguments in `keywords`
+    keywords = getattr(pointer, 'keywords', None)
+    return keywords.get('type') if isinstance(keywords, dict) else None
+
+
+def property_types(class_obj: type) -> set[type]:
+    """`property_types` function returns Classes the properties of a Class refer to.
+
+    E.g. the `type` of its `PointerProperty` and `CollectionProperty` attributes.
+
+    Args:
+        class_obj (type): Operator or PropertyGroup Class.
+
+    Returns:
+        set[type]: Classes found in property definitions of the Class itself, not of its bases.
+    """
+    types: set[type] = set()
+    pending = list(vars(class_obj).get('__annotations__', {}).values())
+    while pending:
+        value = pending.pop()
+        if isinstance(value, type):
+            types.add(value)
+        elif isinstance(value, dict):
+            pending += value.values()
+        elif isinstance(value, (list, tuple)):
+            pending += value
+        elif hasattr(value, 'keywords'):
+            pending += value.keywords.values()
+    return types
 
 
 class RegisterPropertyGroups():  # noqa: WPS306
@@ -14,46 +52,102 @@ class RegisterPropertyGroups():  # noqa: WPS306
 
     It has a useful decorator to wrap `PropertyGroup` Classes,
     where user can specify `bpy_struct` object and property attribute.
+    Classes can be registered tier by tier, see `registration_tier` decorator and `TierRegistry`.
 
     Args:
         modules (list[str]): list of names of modules to take in account when registering.
         logger (Logger | None): Logger object to use for Info and Warnings output.
+        class_index (ClassIndex | None): Shared index of Classes of the modules, built if not specified.
+        assign_pointers (bool): Whether pointer properties of decorated Classes are assigned on register, \
+        headless bakes don't store settings in Blender data and skip them.
     """
 
     def __init__(
         self: Self,
         modules: list[str],
         logger: logging.Logger | None = None,
+        class_index: ClassIndex | None = None,
+        assign_pointers: bool = True,
     ) -> None:
         if logger is None:
             self.logger = logging.getLogger(__name__)
         else:
             self.logger = logger
 
-        self.property_groups = [get_classes(mod, bt.PropertyGroup) for mod in modules]
+        if class_index is None:
+            class_index = ClassIndex(modules, (bt.PropertyGroup,))
+
+        self.property_groups = class_index.get(bt.PropertyGroup)
         self.constants = CONSTANTS()
+        self.assign_pointers = assign_pointers
+        self.registered: list[type[bt.PropertyGroup]] = []
+
+    def tiers(self: Self) -> set[str]:
+        """`tiers` function returns names of tiers of `PropertyGroup` Classes.
+
+        Returns:
+            set[str]: Names of tiers.
+        """
+        return {get_tier(pr_group, self.constants) for list_of_pg in self.property_groups for pr_group in list_of_pg}
+
+    def pending(self: Self, tiers: Collection[str] | None = None) -> list[list[type[bt.PropertyGroup]]]:
+        """`pending` function returns not registered `PropertyGroup` Classes of specified tiers.
+
+        Args:
+            tiers (Collection[str] | None): Names of tiers, if not specified all tiers are taken in account.
 
-    def warnings(self: Self) -> None:
-        """`warnings` function is used to warn user about not decorated `PropertyGroup` Classes."""
-        for list_of_pg in self.property_groups:
+        Returns:
+            list[list[type[PropertyGroup]]]: Lists of `PropertyGroup` Classes per module.
+        """
+        registered = set(self.registered)
+        return [
+            [
+                pr_group for pr_group in list_of_pg
+                if pr_group not in registered and (tiers is None or get_tier(pr_group, self.constants) in tiers)
+            ]
+            for list_of_pg in self.property_groups
+        ]
+
+    def warnings(self: Self, property_groups: list[list[type[bt.PropertyGroup]]] | None = None) -> None:
+        """`warnings` function is used to warn user about not decorated `PropertyGroup` Classes.
+
+        Classes another `PropertyGroup` refers to(e.g. items of its `CollectionProperty`) need no decorator.
+
+        Args:
+            property_groups (list[list[type[PropertyGroup]]] | None): Lists of Classes, all Classes by default.
+        """
+        if property_groups is None:
+            property_groups = self.property_groups
+
+        nested = {
+            property_type
+            for list_of_pg in self.property_groups
+            for pr_group in list_of_pg
+            for property_type in property_types(pr_group)
+        }
+        for list_of_pg in property_groups:
             for pr_group in list_of_pg:
+                if pr_group in nested:
+                    continue
                 property_group_type = getattr(pr_group, 'property_group_type', None)
                 property_group_attribute = getattr(pr_group, 'property_group_attribute', None)
 
                 if not all([property_group_type, property_group_attribute]):
-                    self.logger.warning('{warning}Skipping registering {class_name} Class.{endc}'.format(
-                        warning=self.constants.BColors.warning,
-                        class_name=pr_group.__name__,
-                        endc=self.constants.BColors.endc,
-                    ),
-                    )
+                    self.logger.warning('Skipping registering %s Class.', pr_group.__name__)
 
-    def assign_attributes(self: Self) -> None:
+    def assign_attributes(self: Self, property_groups: list[list[type[bt.PropertyGroup]]] | None = None) -> None:
         """`assign_attributes` is called on register.
 
         Automatically sets an attribute(decorator property) to a `bpy_struct` object(decorator property).
+        Attributes are recorded in the `ledger`, so they are deleted before their Classes are unregistered.
+
+        Args:
+            property_groups (list[list[type[PropertyGroup]]] | None): Lists of Classes, all Classes by default.
         """
-        for list_of_pg in self.property_groups:
+        if property_groups is None:
+            property_groups = self.property_groups
+
+        for list_of_pg in property_groups:
             for pr_group in list_of_pg:
                 property_group_attribute = getattr(pr_group, 'property_group_attribute', None)
                 property_group_type = getattr(pr_group, 'property_group_type', None)
@@ -64,31 +158,83 @@ class RegisterPropertyGroups():  # noqa: WPS306
                         str(pr_group.property_group_attribute),
                         bp.PointerProperty(type=pr_group),
                     )
+                    ledger.record(
+                        'pointer properties',
+                        (property_group_type, property_group_attribute),
+                        partial(self.remove_attribute, pr_group),
+                        name='{type}.{attribute}'.format(
+                            type=property_group_type.__name__,
+                            attribute=property_group_attribute,
+                        ),
+                    )
 
-    def register(self: Self) -> None:
-        """`register` function automatically registers `PropertyGroups` Classes."""
-        self.warnings()
+    @staticmethod
+    def remove_attribute(pr_group: type[bt.PropertyGroup]) -> None:
+        """`remove_attribute` function deletes the pointer property of a `PropertyGroup` Class, if it is assigned.
 
-        for list_of_pg in self.property_groups:
+        Args:
+            pr_group (type[PropertyGroup]): Class decorated with `register_property_group`.
+        """
+        property_group_type = getattr(pr_group, 'property_group_type', None)
+        property_group_attribute = getattr(pr_group, 'property_group_attribute', None)
+        if property_group_type is None or not property_group_attribute:
+            return
+
+        ledger.discard((property_group_type, property_group_attribute))
+        # Only the pointer to this Class, a reloaded Class may have assigned its own already
+        pointer = getattr(property_group_type, property_group_attribute, None)
+        if pointer is not None and _pointer_type(pointer) in {pr_group, None}:
+            delattr(property_group_type, property_group_attribute)
+
+    def register(self: Self, tiers: Collection[str] | None = None) -> None:
+        """`register` function automatically registers `PropertyGroups` Classes.
+
+        Args:
+            tiers (Collection[str] | None): Names of tiers to register, if not specified all tiers are registered.
+        """
+        property_groups = self.pending(tiers)
+        with profiler.phase('property group warnings'):
+            self.warnings(property_groups)
+
+        start = len(self.registered)
+        for list_of_pg in property_groups:
             for pr_group in list_of_pg:
-                register_class(pr_group)
-                self.logger.info('{info}Registered Property Group: {class_name}.{endc}'.format(
-                    info=self.constants.BColors.info,
-                    class_name=pr_group.__name__,
-                    endc=self.constants.BColors.endc,
-                ),
-                )
-
-        self.assign_attributes()
-
-    def unregister(self: Self) -> None:
-        """`unregister` function automatically unregisters `PropertyGroups` Classes."""
-        for list_of_pg in self.property_groups:
-            for pr_group in reversed(list_of_pg):
-                unregister_class(pr_group)
-                self.logger.info('{info}Unregistered Property Group: {class_name}.{endc}'.format(
-                    info=self.constants.BColors.info,
-                    class_name=pr_group.__name__,
-                    endc=self.constants.BColors.endc,
-                ),
-                )
+                with profiler.phase('register_class', pr_group.__name__):
+                    register_class(pr_group)
+                self.registered.append(pr_group)
+                ledger.record('Property Groups', pr_group, partial(self.release, pr_group), name=pr_group.__name__)
+        log_summary(self.logger, 'Registered', 'Property Groups', self.registered[start:])
+
+        if self.assign_pointers:
+            with profiler.phase('pointer properties'):
+                self.assign_attributes(property_groups)
+
+    def unregister(self: Self, classes: Collection[type[bt.PropertyGroup]] | None = None) -> None:
+        """`unregister` function automatically unregisters registered `PropertyGroups` Classes in reverse order.
+
+        Pointer properties of the unregistered Classes are deleted first, they are assigned again on register.
+
+        Args:
+            classes (Collection[type[PropertyGroup]] | None): Classes to unregister(e.g. changed by a hot reload), \
+            all registered Classes by default.
+        """
+        unregistered = [
+            pr_group for pr_group in reversed(self.registered)
+            if classes is None or pr_group in classes
+        ]
+        for pr_group in unregistered:
+            self.remove_attribute(pr_group)
+        for pr_group in unregistered:
+            self.release(pr_group)
+        log_summary(self.logger, 'Unregistered', 'Property Groups', unregistered)
+
+    def release(self: Self, pr_group: type[bt.PropertyGroup]) -> None:
+        """`release` function unregisters one registered `PropertyGroup` Class, it is its `ledger` release.
+
+        Args:
+            pr_group (type[PropertyGroup]): Registered Class.
+        """
+        ledger.discard(pr_group)
+        with profiler.phase('unregister_class', pr_group.__name__):
+            unregister_class(pr_group)
+        self.registered.remove(pr_group)
@@ -0,0 +1,167 @@
+# noqa: D100
+import logging
+from collections.abc import Collection, Sequence
+from typing import Protocol
+
+from typing_extensions import Self
+
+from ...util.core_utils import CONSTANTS
+
+
+def get_tier(class_obj: type, constants: CONSTANTS) -> str:
+    """`get_tier` function returns the registration tier of a Class.
+
+    Args:
+        class_obj (type): Class decorated(or not) with `registration_tier` decorator.
+        constants (CONSTANTS): Dataclass of constants.
+
+    Returns:
+        str: Name of the tier.
+    """
+    return str(getattr(class_obj, 'registration_tier', constants.default_registration_tier))
+
+
+class TieredRegister(Protocol):
+    """`TieredRegister` Protocol describes register Classes that can register their Classes tier by tier."""
+
+    def tiers(self: Self) -> set[str]:
+        """Returns names of tiers of all Classes."""
+
+    def register(self: Self, tiers: Collection[str] | None = None) -> None:
+        """Registers Classes of specified tiers."""
+
+    def unregister(self: Self) -> None:
+        """Unregisters all registered Classes."""
+
+
+class TierRegistry():
+    """`TierRegistry` Class registers Classes in tiers and reports which tiers are live.
+
+    Eager tiers are registered with the add-on, the rest is registered on first use of the tier
+    (e.g. when a category or a menu of a node pack is accessed for the first time).
+
+    Args:
+        registers (Sequence[TieredRegister]): Register Classes instances, in registration order.
+        logger (Logger | None): Logger object to use for Info output.
+    """
+
+    def __init__(
+        self: Self,
+        registers: Sequence[TieredRegister],
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.registers = registers
+        self.constants = CONSTANTS()
+        self.live: set[str] = set()
+        self.requested: set[str] = set()
+
+    def all_tiers(self: Self) -> set[str]:
+        """`all_tiers` function returns names of all known tiers.
+
+        Returns:
+            set[str]: Names of tiers of all Classes of all register Classes.
+        """
+        return set().union(*(register.tiers() for register in self.registers))
+
+    def live_tiers(self: Self) -> frozenset[str]:
+        """`live_tiers` function returns names of registered tiers.
+
+        Returns:
+            frozenset[str]: Names of registered tiers.
+        """
+        return frozenset(self.live)
+
+    def pending_tiers(self: Self) -> frozenset[str]:
+        """`pending_tiers` function returns names of tiers that are not registered yet.
+
+        Returns:
+            frozenset[str]: Names of not registered tiers.
+        """
+        return frozenset(self.all_tiers() - self.live)
+
+    def report(self: Self) -> dict[str, bool]:
+        """`report` function maps every known tier to whether it is live.
+
+        Returns:
+            dict[str, bool]: Tier name to its state.
+        """
+        return {tier: tier in self.live for tier in sorted(self.all_tiers())}
+
+    def register_eager(self: Self) -> None:
+        """`register_eager` function registers tiers from `CONSTANTS.eager_registration_tiers`."""
+        self._register_tiers(set(self.constants.eager_registration_tiers))
+
+    def register_all(self: Self) -> None:
+        """`register_all` function registers all tiers, that is how the add-on registers without deferral."""
+        self._register_tiers(self.all_tiers())
+
+    def ensure_tier(self: Self, tier: str) -> bool:
+        """`ensure_tier` function registers a tier if it isn't live yet.
+
+        Must not be called from `draw` callbacks, use `request_tier` there.
+
+        Args:
+            tier (str): Name of the tier.
+
+        Returns:
+            bool: True if the tier was registered by this call.
+        """
+        self.requested.discard(tier)
+        if tier in self.live:
+            return False
+
+        self._register_tiers({tier})
+        return True
+
+    def request_tier(self: Self, tier: str) -> None:
+        """`request_tier` function schedules registration of a tier on the next event loop iteration.
+
+        Safe to call from `draw` callbacks of menus and panels, Classes can't be registered while drawing.
+
+        Args:
+            tier (str): Name of the tier.
+        """
+        if tier in self.live or tier in self.requested:
+            return
+
+        from bpy.app import timers  # noqa: WPS433
+
+        self.requested.add(tier)
+        timers.register(lambda: self._ensure_requested(tier), first_interval=0)
+
+    def request_pending(self: Self) -> None:
+        """`request_pending` function schedules registration of all tiers that are not registered yet.
+
+        Used when nothing accesses the tiers before(e.g. no menu of a node pack is drawn), so they are live
+        shortly after the add-on is enabled, without blocking its registration.
+        """
+        for tier in sorted(self.pending_tiers()):
+            self.request_tier(tier)
+
+    def unregister(self: Self) -> None:
+        """`unregister` function unregisters all live tiers in reverse registration order."""
+        for register in reversed(self.registers):
+            register.unregister()
+        self.live.clear()
+        self.requested.clear()
+
+    def _register_tiers(self: Self, tiers: set[str]) -> None:
+        tiers -= self.live
+        if not tiers:
+            return
+
+        for register in self.registers:
+            register.register(tiers)
+        self.live |= tiers
+        if self.logger.isEnabledFor(logging.INFO):
+            names = sorted(tiers)
+            self.logger.info('Registered tiers: %s.', ', '.join(names), extra={'fields': {'tiers': names}})
+
+    def _ensure_requested(self: Self, tier: str) -> None:
+        if tier in self.requested:
+            self.ensure_tier(tier)
@@ -0,0 +1,127 @@
+"""Node graph shared by generation Operators and its cache settings."""
+import logging
+
+import bpy
+import bpy.props as bp  # noqa: WPS301
+import bpy.types as bt  # noqa: WPS301
+from typing_extensions import Self
+
+from ..class_register.decorators import register_property_group
+from .cache import DEFAULT_CACHE_BUDGET
+from .disk_cache import DEFAULT_DISK_BUDGET, LayerCache
+from .evaluator import NodeGraph
+from .pipeline import add_biome_nodes
+from ...util.ledger import ledger
+from ...util.rng import RandomStreams
+
+# Shared by generation Operators, so results of shared stages(e.g. the heightmap) are reused
+biome_graph = add_biome_nodes(NodeGraph(disk_cache=LayerCache()))
+
+# Reported by Operators that find `biome_graph` held by a background job, they don't wait for it in the UI
+GRAPH_BUSY = 'The biome graph is busy with a background job, try again when it finishes'
+
+# Seconds between attempts to apply changed layer cache settings while a job holds the graph
+DISK_CACHE_RETRY = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+def _resize_cache(settings: 'PG_GraphCache', context: bt.Context) -> None:  # pylint: disable=unused-argument
+    biome_graph.cache.resize(settings.budget_mb << 20)
+
+
+def _apply_disk_cache() -> float | None:
+    # Replacing the cache in the middle of an evaluation would split its layers between two caches
+    with biome_graph.try_lock() as locked:
+        if not locked:
+            return DISK_CACHE_RETRY
+        settings = bpy.context.scene.bn_graph_cache
+        if biome_graph.disk_cache is not None:
+            biome_graph.disk_cache.flush()
+        biome_graph.disk_cache = LayerCache(
+            directory=bpy.path.abspath(settings.disk_directory) if settings.disk_directory else None,
+            max_bytes=settings.disk_budget_gb << 30,
+        )
+        biome_graph.disk_cache.evict()
+    ledger.discard(_apply_disk_cache)
+    return None
+
+
+def _stop_applying_disk_cache() -> None:
+    ledger.discard(_apply_disk_cache)
+    if bpy.app.timers.is_registered(_apply_disk_cache):
+        bpy.app.timers.unregister(_apply_disk_cache)
+
+
+def _update_disk_cache(settings: 'PG_GraphCache', context: bt.Context) -> None:  # pylint: disable=unused-argument
+    if _apply_disk_cache() is None or bpy.app.timers.is_registered(_apply_disk_cache):
+        return
+    logger.warning('The biome graph is busy with a background job, layer cache settings apply once it finishes.')
+    bpy.app.timers.register(_apply_disk_cache, first_interval=DISK_CACHE_RETRY)
+    ledger.record('timers', _apply_disk_cache, _stop_applying_disk_cache, name='layer cache settings')
+
+
+@register_property_group(bt.Scene, 'bn_graph_cache')
+class PG_GraphCache(bt.PropertyGroup):  # noqa: N801
+    """Budgets of the node result cache in memory and of generated layers on disk."""
+
+    budget_mb: bp.IntProperty(
+        name='Cache Budget (MB)',
+        description='Memory budget of cached node results, least recently used results are evicted first',
+        default=DEFAULT_CACHE_BUDGET >> 20,
+        min=0,
+        update=_resize_cache,
+    )
+    disk_directory: bp.StringProperty(
+        name='Layer Cache Directory',
+        description='Directory generated layers are kept in between sessions, the user cache of the add-on if empty',
+        subtype='DIR_PATH',
+        update=_update_disk_cache,
+    )
+    disk_budget_gb: bp.IntProperty(
+        name='Layer Cache Budget (GB)',
+        description='Disk budget of cached layers, least recently used layers are deleted first',
+        default=DEFAULT_DISK_BUDGET >> 30,
+        min=0,
+        update=_update_disk_cache,
+    )
+
+
+@register_property_group(bt.Scene, 'bn_random')
+class PG_Random(bt.PropertyGroup):  # noqa: N801
+    """Global seed of the Scene, seeds of generation settings select random streams below it."""
+
+    seed: bp.IntProperty(
+        name='Global Seed',
+        description='Seed all generation stages derive their random streams from',
+        default=0,
+        min=0,
+    )
+
+    def derive_seed(self: Self, stream: str, seed: int) -> int:
+        """`derive_seed` function returns the seed a generation stage is evaluated with.
+
+        Args:
+            stream (str): Name of the stage, e.g. 'heightmap'.
+            seed (int): Seed of the stage settings.
+
+        Returns:
+            int: Seed of the stream of the stage, see `RandomStreams`.
+        """
+        return RandomStreams(self.seed).derive_seed(stream, seed)
+
+
+class OT_BiomeNodes_ClearLayerCache(bt.Operator):  # noqa: N801
+    """`OT_BiomeNodes_ClearLayerCache` Operator deletes all layers of the disk cache of `biome_graph`."""
+
+    bl_description = 'Delete all generated layers cached on disk'
+
+    def execute(self: Self, context: bt.Context) -> set[str]:  # noqa: D102
+        with biome_graph.try_lock() as locked:
+            # A job may be storing layers, they would be deleted while it reads them
+            if not locked:
+                self.report({'WARNING'}, GRAPH_BUSY)
+                return {'CANCELLED'}
+            if biome_graph.disk_cache is not None:
+                biome_graph.disk_cache.clear()
+        return {'FINISHED'}
@@ -0,0 +1,110 @@
+"""Content-addressed LRU cache of node results with a memory budget."""
+import sys
+from collections import OrderedDict
+from typing import Any
+
+from typing_extensions import Self
+
+DEFAULT_CACHE_BUDGET = 1 << 30
+
+
+def result_size(result: Any) -> int:
+    """`result_size` function estimates the memory held by a node result.
+
+    Args:
+        result (Any): Node result, NumPy arrays and tuples/lists of them are measured exactly.
+
+    Returns:
+        int: Size in bytes.
+    """
+    nbytes = getattr(result, 'nbytes', None)
+    if nbytes is not None:
+        return int(nbytes)
+    if isinstance(result, (tuple, list)):
+        return sys.getsizeof(result) + sum(result_size(item) for item in result)
+    if isinstance(result, dict):
+        return sys.getsizeof(result) + sum(result_size(item) for item in result.values())
+    return sys.getsizeof(result)
+
+
+class ResultCache():
+    """`ResultCache` Class stores node results by content hash and evicts the least recently used ones.
+
+    Args:
+        max_bytes (int): Memory budget of the cache, results larger than the budget are not cached.
+    """
+
+    def __init__(self: Self, max_bytes: int = DEFAULT_CACHE_BUDGET) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries: OrderedDict[str, tuple[Any, int]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self: Self, key: str) -> bool:
+        return key in self.entries
+
+    def __len__(self: Self) -> int:
+        return len(self.entries)
+
+    def get(self: Self, key: str) -> tuple[bool, Any]:
+        """`get` function returns a cached result and marks it as recently used.
+
+        Args:
+            key (str): Content hash of the result.
+
+        Returns:
+            tuple[bool, Any]: Whether the result was found and the result itself.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[0]
+
+    def put(self: Self, key: str, result: Any) -> None:
+        """`put` function caches a result, evicting least recently used results to stay within the budget.
+
+        Args:
+            key (str): Content hash of the result.
+            result (Any): Result to cache.
+        """
+        size = result_size(result)
+        self.discard(key)
+        if size > self.max_bytes:
+            return
+
+        self.entries[key] = (result, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.size -= evicted_size
+
+    def discard(self: Self, key: str) -> None:
+        """`discard` function removes a result if it is cached.
+
+        Args:
+            key (str): Content hash of the result.
+        """
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def resize(self: Self, max_bytes: int) -> None:
+        """`resize` function changes the memory budget, evicting results if needed.
+
+        Args:
+            max_bytes (int): New memory budget.
+        """
+        self.max_bytes = max_bytes
+        while self.size > self.max_bytes and self.entries:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.size -= evicted_size
+
+    def clear(self: Self) -> None:
+        """`clear` function removes all results."""
+        self.entries.clear()
+        self.size = 0
@@ -0,0 +1,248 @@
+"""Persistent on-disk cache of node results that are NumPy arrays(layers).
+
+Layers are stored as `.npy` files named by the content hash of their node chain and the add-on version,
+a small JSON index tracks sizes and last use. Cached layers are reopened with `numpy.load(mmap_mode='r')`,
+so loading a layer of any size only maps the file, pages are read when they are used.
+
+The cache is an optimization only: if its directory can't be written(e.g. it is read-only or the disk
+is full), the failure is logged once and results are kept in the memory cache of the graph only.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import suppress
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+from typing_extensions import Self
+
+from ...util.core_utils import get_addon_version, get_user_cache_path
+from ...util.ledger import ledger
+
+DEFAULT_DISK_BUDGET = 16 << 30
+
+# Bumped whenever generation code changes results of the same parameters, so older layers are never reused
+LAYER_VERSION = 2
+
+INDEX_NAME = 'index.json'
+
+
+class LayerCache():
+    """`LayerCache` Class stores arrays on disk by key and reopens them memory-mapped.
+
+    Keys are combined with the add-on version and `LAYER_VERSION`, so layers of another version are never reused.
+    Least recently used layers are deleted to keep the directory within its budget. The index is read
+    on first use, so creating a cache(e.g. on import of `biome_graph`) doesn't touch the disk. Hits update
+    last use in memory only, the index is written by `put`, `discard`, `clear` and `flush`, which is recorded
+    in the `ledger`, so it runs when the add-on is disabled.
+
+    The cache is thread-safe, layers are written outside of its lock, the index under it.
+
+    Args:
+        directory (str | Path | None): Directory of the cache, see `get_user_cache_path` if not specified.
+        version (tuple[int, ...] | None): Version of the add-on, `bl_info` version if not specified.
+        max_bytes (int): Disk budget of the cache.
+        logger (Logger | None): Logger object that is going to be used for debug output.
+    """
+
+    def __init__(
+        self: Self,
+        directory: str | Path | None = None,
+        version: tuple[int, ...] | None = None,
+        max_bytes: int = DEFAULT_DISK_BUDGET,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.directory = Path(directory) if directory else get_user_cache_path('layers')
+        self.version = '{addon}/{layers}'.format(
+            addon='.'.join(str(part) for part in (version or get_addon_version())),
+            layers=LAYER_VERSION,
+        )
+        self.max_bytes = max_bytes
+        self.writable = True
+        self.index_dirty = False
+        # Jobs store layers while the main thread clears the cache or the ledger flushes the index
+        self.lock = threading.RLock()
+        self._entries: dict[str, dict[str, Any]] | None = None
+
+    @property
+    def entries(self: Self) -> dict[str, dict[str, Any]]:
+        """Index entries by key, the index is read on first use instead of on creation of the cache."""
+        with self.lock:
+            if self._entries is None:
+                self.load()
+            return self._entries
+
+    @entries.setter
+    def entries(self: Self, entries: dict[str, dict[str, Any]]) -> None:
+        self._entries = entries
+
+    def load(self: Self) -> None:
+        """`load` function reads the index, entries of missing files are dropped.
+
+        Layers of other add-on versions can never be hit again, so they are deleted.
+        """
+        try:
+            index = json.loads((self.directory / INDEX_NAME).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            index = {}
+
+        with self.lock:
+            self.entries = {
+                key: entry for key, entry in index.get('entries', {}).items()
+                if (self.directory / entry['file']).exists()
+            }
+            outdated = [key for key, entry in self.entries.items() if entry.get('version') != self.version]
+            for key in outdated:
+                self._delete(key)
+            if outdated:
+                self.save()
+
+    def save(self: Self) -> None:
+        """`save` function writes the index atomically, a failure disables writes of the cache."""
+        with self.lock:
+            if not self.writable:
+                return
+            path = self.directory / INDEX_NAME
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                tmp_path = self._tmp_path(path)
+                tmp_path.write_text(json.dumps({'entries': self.entries}), encoding='utf-8')
+                os.replace(tmp_path, path)
+            except OSError as error:
+                self._disable(error)
+                return
+            self.index_dirty = False
+            ledger.discard(self)
+
+    def flush(self: Self) -> None:
+        """`flush` function writes the index if hits updated last use of layers since it was written."""
+        with self.lock:
+            if self.index_dirty:
+                self.save()
+
+    def key(self: Self, content_hash: str) -> str:
+        """`key` function returns the cache key of a content hash for the current add-on version.
+
+        Args:
+            content_hash (str): Content hash of a node chain, see `NodeGraph.node_hash`.
+
+        Returns:
+            str: Hex digest of the version and the content hash.
+        """
+        digest = hashlib.sha1(usedforsecurity=False)
+        digest.update('{version}:{hash}'.format(version=self.version, hash=content_hash).encode())
+        return digest.hexdigest()
+
+    def get(self: Self, content_hash: str) -> npt.NDArray[Any] | None:
+        """`get` function reopens a cached layer memory-mapped and read-only.
+
+        Args:
+            content_hash (str): Content hash of the layer.
+
+        Returns:
+            NDArray | None: Memory-mapped layer or None if it is not cached.
+        """
+        key = self.key(content_hash)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            try:
+                layer = np.load(self.directory / entry['file'], mmap_mode='r')
+            except (OSError, ValueError):
+                self.logger.debug('Dropping unreadable cached layer %s.', entry['file'])
+                self.discard(content_hash)
+                return None
+
+            entry['used'] = time.time()
+            if not self.index_dirty:
+                self.index_dirty = True
+                ledger.record('cache indexes', self, self.flush, name=str(self.directory / INDEX_NAME))
+            return layer
+
+    def put(self: Self, content_hash: str, layer: Any) -> None:
+        """`put` function stores a layer, deleting least recently used layers to stay within the budget.
+
+        Args:
+            content_hash (str): Content hash of the layer.
+            layer (Any): Layer to store, anything but plain NumPy arrays over the budget is ignored.
+        """
+        if not self.writable:
+            return
+        if not isinstance(layer, np.ndarray) or layer.dtype.hasobject or layer.nbytes > self.max_bytes:
+            return
+
+        key = self.key(content_hash)
+        file_name = '{key}.npy'.format(key=key)
+        tmp_path = self._tmp_path(self.directory / file_name)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'wb') as tmp_file:
+                np.save(tmp_file, layer, allow_pickle=False)
+            os.replace(tmp_path, self.directory / file_name)
+        except OSError as error:
+            with suppress(OSError):
+                tmp_path.unlink(missing_ok=True)
+            self._disable(error)
+            return
+
+        with self.lock:
+            self.entries[key] = {'file': file_name, 'size': layer.nbytes, 'used': time.time(), 'version': self.version}
+            self.evict()
+            self.save()
+
+    def discard(self: Self, content_hash: str) -> None:
+        """`discard` function deletes a cached layer.
+
+        Args:
+            content_hash (str): Content hash of the layer.
+        """
+        with self.lock:
+            self._delete(self.key(content_hash))
+            self.save()
+
+    def evict(self: Self) -> None:
+        """`evict` function deletes least recently used layers until the cache is within its budget."""
+        with self.lock:
+            by_use = sorted(self.entries, key=lambda key: self.entries[key]['used'])
+            size = sum(entry['size'] for entry in self.entries.values())
+            for key in by_use:
+                if size <= self.max_bytes:
+                    break
+                size -= self.entries[key]['size']
+                self._delete(key)
+
+    def clear(self: Self) -> None:
+        """`clear` function deletes all cached layers."""
+        with self.lock:
+            for key in list(self.entries):
+                self._delete(key)
+            self.save()
+
+    def _disable(self: Self, error: OSError) -> None:
+        self.writable = False
+        ledger.discard(self)
+        self.logger.warning('Layers are cached in memory only, %s is not writable: %s', self.directory, error)
+
+    @staticmethod
+    def _tmp_path(path: Path) -> Path:
+        # Other Blender instances and threads may write the same file, each writes its own temporary file
+        return path.with_suffix('.{pid}.{tid}.tmp'.format(pid=os.getpid(), tid=threading.get_ident()))
+
+    def _delete(self: Self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            # Layers that are still mapped can't be deleted on Windows, they are dropped from the index only
+            with suppress(OSError):
+                (self.directory / entry['file']).unlink(missing_ok=True)
@@ -0,0 +1,456 @@
+"""Incremental evaluation of biome node graphs.
+
+A graph is a DAG of nodes, every node is a function of its parameters and of the results of its inputs.
+Results are cached by content hash(function, parameters and hashes of inputs), so a node is recomputed
+only if something upstream of it actually changed, and reverting a parameter hits the cache again.
+Results of persistent nodes are also kept in a `LayerCache` on disk, so they survive the session.
+"""
+import functools
+import hashlib
+import logging
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import CancelledError
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from typing_extensions import Self
+
+from .cache import DEFAULT_CACHE_BUDGET, ResultCache
+from .disk_cache import LayerCache
+
+_F = TypeVar('_F', bound=Callable[..., Any])  # noqa: WPS111
+
+# The add-on package, `<package>.core.graph.evaluator`, e.g. `bl_ext.user_default.biome_nodes` for extensions
+PACKAGE_NAME = __name__.rsplit('.', maxsplit=3)[0]
+
+
+def _synchronized(method: _F) -> _F:
+    # Graphs are shared by the main thread and background jobs, public methods hold the lock of the graph
+    @functools.wraps(method)
+    def wrapper(self: 'NodeGraph', *args: Any, **kwargs: Any) -> Any:
+        with self.lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def function_reference(function: Any) -> str:
+    """`function_reference` function returns the reference a function or Class is hashed and stored by.
+
+    Modules of the add-on are relative to its package, so content hashes and graph files don't depend
+    on the name the add-on is installed under.
+
+    Args:
+        function (Any): Function or Class.
+
+    Returns:
+        str: Module and qualified name separated by a colon.
+    """
+    module = function.__module__
+    if module.startswith(PACKAGE_NAME + '.'):
+        module = module[len(PACKAGE_NAME) + 1:]
+    return '{module}:{name}'.format(module=module, name=function.__qualname__)
+
+
+@dataclass()
+class GraphNode():
+    """`GraphNode` Class is a node of a `NodeGraph`.
+
+    Args:
+        name (str): Unique name of the node.
+        function (Callable[..., Any]): Called with results of inputs as positional arguments, \
+        followed by parameters as keyword arguments.
+        inputs (tuple[str, ...]): Names of input nodes.
+        parameters (dict[str, Any]): Parameters of the node, their `repr` must be deterministic.
+        persistent (bool): Whether results(NumPy arrays) are kept in the disk cache of the graph between sessions.
+    """
+
+    name: str
+    function: Callable[..., Any]
+    inputs: tuple[str, ...] = ()
+    parameters: dict[str, Any] = field(default_factory=dict)
+    persistent: bool = False
+
+
+class GraphError(Exception):
+    """`GraphError` is raised for unknown nodes and cycles."""
+
+
+class NodeGraph():  # noqa: WPS214
+    """`NodeGraph` Class evaluates a DAG of nodes incrementally.
+
+    The topological order is computed once per change of the structure. Changing parameters of a node
+    marks it and all nodes downstream of it dirty, only dirty nodes get their hashes recomputed on evaluation.
+    Graphs are thread-safe, `lock` is held while a graph is modified or evaluated.
+
+    Args:
+        max_bytes (int): Memory budget of the result cache.
+        disk_cache (LayerCache | None): Disk cache of results of persistent nodes.
+        logger (Logger | None): Logger object that is going to be used for debug output.
+    """
+
+    def __init__(
+        self: Self,
+        max_bytes: int = DEFAULT_CACHE_BUDGET,
+        disk_cache: LayerCache | None = None,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.nodes: dict[str, GraphNode] = {}
+        self.cache = ResultCache(max_bytes)
+        self.disk_cache = disk_cache
+        self.hashes: dict[str, str] = {}
+        self.dirty: set[str] = set()
+        # Results put into the memory cache, readers of cached results(e.g. overlays) retry misses once it changes
+        self.cache_updates = 0
+        self.lock = threading.RLock()
+        self._order: list[str] | None = None
+        self._downstream: dict[str, set[str]] | None = None
+
+    @contextmanager
+    def try_lock(self: Self) -> Iterator[bool]:
+        """`try_lock` function holds the lock of the graph if it is free, without waiting for it.
+
+        The main thread uses it to skip optional work(e.g. preview caching) while a job evaluates the graph.
+
+        Yields:
+            bool: Whether the lock is held.
+        """
+        acquired = self.lock.acquire(blocking=False)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self.lock.release()
+
+    @_synchronized
+    def add_node(self: Self, node: GraphNode) -> None:
+        """`add_node` function adds or replaces a node.
+
+        Args:
+            node (GraphNode): Node to add.
+        """
+        # Consumers of a replaced node don't change, so they are found with the current structure
+        if node.name in self.nodes:
+            self.mark_dirty(node.name)
+
+        self.nodes[node.name] = node
+        self.dirty.add(node.name)
+        self._order = None
+        self._downstream = None
+
+    @_synchronized
+    def remove_node(self: Self, name: str) -> None:
+        """`remove_node` function removes a node, nodes that use it as input become invalid.
+
+        Args:
+            name (str): Name of the node.
+        """
+        self.mark_dirty(name)
+        del self.nodes[name]  # noqa: WPS420
+        self.hashes.pop(name, None)
+        self.dirty.discard(name)
+        self._order = None
+        self._downstream = None
+
+    @_synchronized
+    def set_parameters(self: Self, name: str, **parameters: Any) -> bool:
+        """`set_parameters` function updates parameters of a node, marking it dirty only if they changed.
+
+        Args:
+            name (str): Name of the node.
+            parameters (Any): Parameters to update.
+
+        Returns:
+            bool: True if any parameter has changed.
+        """
+        node = self._node(name)
+        changed = {key: parameter for key, parameter in parameters.items() if node.parameters.get(key) != parameter}
+        if not changed:
+            return False
+
+        node.parameters.update(changed)
+        self.mark_dirty(name)
+        return True
+
+    @_synchronized
+    def mark_dirty(self: Self, name: str) -> None:
+        """`mark_dirty` function marks a node and all nodes downstream of it dirty.
+
+        Args:
+            name (str): Name of the node.
+        """
+        self._node(name)
+        self.dirty.add(name)
+        self.dirty |= self.downstream()[name]
+
+    def order(self: Self) -> list[str]:
+        """`order` function returns names of nodes in topological order, computed once per structure change.
+
+        Returns:
+            list[str]: Names of nodes, every node comes after all of its inputs.
+
+        Raises:
+            GraphError: If the graph has a cycle or an input is unknown.
+        """
+        if self._order is not None:
+            return self._order
+
+        pending = {name: len(node.inputs) for name, node in self.nodes.items()}
+        consumers: dict[str, list[str]] = {name: [] for name in self.nodes}
+        for name, node in self.nodes.items():
+            for input_name in node.inputs:
+                if input_name not in self.nodes:
+                    raise GraphError('Unknown input {input} of node {node}.'.format(input=input_name, node=name))
+                consumers[input_name].append(name)
+
+        ready = [name for name, count in pending.items() if not count]
+        order = []
+        while ready:
+            name = ready.pop()
+            order.append(name)
+            for consumer in consumers[name]:
+                pending[consumer] -= 1
+                if not pending[consumer]:
+                    ready.append(consumer)
+
+        if len(order) != len(self.nodes):
+            raise GraphError('Node graph has a cycle through: {nodes}.'.format(
+                nodes=', '.join(sorted(set(self.nodes) - set(order))),
+            ),
+            )
+        self._order = order
+        return order
+
+    def downstream(self: Self) -> dict[str, set[str]]:
+        """`downstream` function maps every node to all nodes that depend on it, directly or indirectly.
+
+        Returns:
+            dict[str, set[str]]: Node name to names of downstream nodes.
+        """
+        if self._downstream is not None:
+            return self._downstream
+
+        downstream: dict[str, set[str]] = {name: set() for name in self.nodes}
+        for name in reversed(self.order()):
+            for input_name in self.nodes[name].inputs:
+                downstream[input_name] |= downstream[name] | {name}
+        self._downstream = downstream
+        return downstream
+
+    def upstream(self: Self, outputs: Iterable[str]) -> list[str]:
+        """`upstream` function returns requested nodes and everything they depend on in topological order.
+
+        Args:
+            outputs (Iterable[str]): Names of requested nodes.
+
+        Returns:
+            list[str]: Names of nodes needed to evaluate the requested nodes.
+        """
+        needed: set[str] = set()
+        stack = list(outputs)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self._node(name).inputs)
+        return [name for name in self.order() if name in needed]
+
+    def evaluate(
+        self: Self,
+        output: str,
+        cancelled: Callable[[], bool] | None = None,
+        progress: Callable[[float], None] | None = None,
+    ) -> Any:
+        """`evaluate` function returns the result of a node, recomputing only what is not cached.
+
+        Args:
+            output (str): Name of the node.
+            cancelled (Callable[[], bool] | None): See `evaluate_many`.
+            progress (Callable[[float], None] | None): See `evaluate_many`.
+
+        Returns:
+            Any: Result of the node.
+        """
+        return self.evaluate_many([output], cancelled, progress)[output]
+
+    @_synchronized
+    def evaluate_many(
+        self: Self,
+        outputs: Iterable[str],
+        cancelled: Callable[[], bool] | None = None,
+        progress: Callable[[float], None] | None = None,
+    ) -> dict[str, Any]:
+        """`evaluate_many` function returns results of several nodes, sharing evaluation of common inputs.
+
+        Nodes are resolved from the outputs backwards: a cached node is used as is, only inputs of nodes
+        that miss both caches are looked up further, so an evicted input of a cached output is never recomputed.
+
+        Args:
+            outputs (Iterable[str]): Names of nodes.
+            cancelled (Callable[[], bool] | None): Polled before every node, evaluation stops once it returns True.
+            progress (Callable[[float], None] | None): Called with the share of nodes done after every node.
+
+        Returns:
+            dict[str, Any]: Node name to its result.
+
+        Raises:
+            CancelledError: If the evaluation was cancelled.
+        """
+        outputs = list(outputs)
+        names = self.upstream(outputs)
+        for name in names:
+            self._update_hash(name)
+
+        # Results are held here, so evaluating a missing node can't evict a result that was already found
+        results: dict[str, Any] = {}
+        missing: set[str] = set()
+        stack = list(outputs)
+        while stack:
+            name = stack.pop()
+            if name in results or name in missing:
+                continue
+            found, result = self._lookup(self.nodes[name])
+            if found:
+                results[name] = result
+            else:
+                missing.add(name)
+                stack.extend(self.nodes[name].inputs)
+
+        pending = [name for name in names if name in missing]
+        for index, name in enumerate(pending):
+            if cancelled is not None and cancelled():
+                raise CancelledError()
+
+            results[name] = self._evaluate_node(self.nodes[name], results)
+            if progress is not None:
+                progress((index + 1) / len(pending))
+
+        return {name: results[name] for name in outputs}
+
+    @_synchronized
+    def cached(self: Self, name: str, **parameters: Any) -> tuple[bool, Any]:
+        """`cached` function looks up the result of a node in the memory cache without evaluating anything.
+
+        Args:
+            name (str): Name of the node.
+            parameters (Any): Parameters to update first, see `set_parameters`.
+
+        Returns:
+            tuple[bool, Any]: Whether the result of the current parameters is cached and the result.
+        """
+        if parameters:
+            self.set_parameters(name, **parameters)
+        for upstream_name in self.upstream([name]):
+            self._update_hash(upstream_name)
+        return self.cache.get(self.hashes[name])
+
+    @_synchronized
+    def store(self: Self, name: str, result: Any, **parameters: Any) -> None:
+        """`store` function caches a result computed outside of the graph as the result of a node.
+
+        The result is keyed by the current parameters of the node and its inputs, e.g. a preview that
+        evaluated the node itself hands over its final result, so the next evaluation is a cache hit.
+
+        Args:
+            name (str): Name of the node.
+            result (Any): Result of the node with its current parameters.
+            parameters (Any): Parameters the result was computed with, see `set_parameters`.
+        """
+        if parameters:
+            self.set_parameters(name, **parameters)
+        for upstream_name in self.upstream([name]):
+            self._update_hash(upstream_name)
+        self.cache.put(self.hashes[name], result)
+        self.cache_updates += 1
+
+    @_synchronized
+    def content_hashes(self: Self, outputs: Iterable[str] | None = None) -> dict[str, str]:
+        """`content_hashes` function returns up to date content hashes of nodes, without evaluating anything.
+
+        Args:
+            outputs (Iterable[str] | None): Names of requested nodes, all nodes if not specified.
+
+        Returns:
+            dict[str, str]: Node name to its content hash, for requested nodes and everything they depend on.
+        """
+        names = self.order() if outputs is None else self.upstream(outputs)
+        for name in names:
+            self._update_hash(name)
+        return {name: self.hashes[name] for name in names}
+
+    @_synchronized
+    def set_hash(self: Self, name: str, content_hash: str) -> None:
+        """`set_hash` function sets a known content hash of a clean node, e.g. one stored with a saved graph.
+
+        The hash must be the one `node_hash` would compute, results are looked up by it in the caches.
+
+        Args:
+            name (str): Name of the node.
+            content_hash (str): Content hash of the node with its current parameters and inputs.
+        """
+        self._node(name)
+        self.hashes[name] = content_hash
+        self.dirty.discard(name)
+
+    def _update_hash(self: Self, name: str) -> None:
+        node = self.nodes[name]
+        if name in self.dirty or name not in self.hashes:
+            self.hashes[name] = self.node_hash(node)
+            self.dirty.discard(name)
+
+    def _lookup(self: Self, node: GraphNode) -> tuple[bool, Any]:
+        content_hash = self.hashes[node.name]
+        found, result = self.cache.get(content_hash)
+        if found or not node.persistent or self.disk_cache is None:
+            return found, result
+
+        result = self.disk_cache.get(content_hash)
+        if result is None:
+            return False, None
+        self.logger.debug('Loaded node %s from the disk cache.', node.name)
+        self.cache.put(content_hash, result)
+        self.cache_updates += 1
+        return True, result
+
+    def _evaluate_node(self: Self, node: GraphNode, results: dict[str, Any]) -> Any:
+        content_hash = self.hashes[node.name]
+        disk_cache = self.disk_cache if node.persistent else None
+        self.logger.debug('Evaluating node %s.', node.name)
+        result = node.function(
+            *(results[input_name] for input_name in node.inputs),
+            **node.parameters,
+        )
+        self.cache.put(content_hash, result)
+        self.cache_updates += 1
+        if disk_cache is not None:
+            disk_cache.put(content_hash, result)
+        return result
+
+    def node_hash(self: Self, node: GraphNode) -> str:
+        """`node_hash` function returns the content hash of a node, hashes of its inputs must be up to date.
+
+        Args:
+            node (GraphNode): Node to hash.
+
+        Returns:
+            str: Hex digest of the function, parameters and hashes of inputs.
+        """
+        digest = hashlib.sha1(usedforsecurity=False)
+        digest.update(function_reference(node.function).encode())
+        digest.update(repr(sorted(node.parameters.items())).encode())
+        for input_name in node.inputs:
+            digest.update(self.hashes[input_name].encode())
+        return digest.hexdigest()
+
+    def _node(self: Self, name: str) -> GraphNode:
+        node = self.nodes.get(name)
+        if node is None:
+            raise GraphError('Unknown node {name}.'.format(name=name))
+        return node
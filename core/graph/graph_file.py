@@ -0,0 +1,499 @@
+"""Compact binary files of biome node graphs, independent of `bpy`.
+
+A graph file stores nodes of a `NodeGraph`(function, inputs, parameters), the content hash of every node
+and optionally settings of the Scene it was saved from(values of decorated PropertyGroups). Values are
+encoded in a tagged binary format in the spirit of MessagePack: ints as zigzag varints, floats as
+little-endian doubles, strings, bytes, lists, tuples, dicts and frozen dataclasses of the engine.
+Functions and dataclasses are referenced relative to the add-on package(see `function_reference`),
+so files load under any name the add-on is installed under.
+
+Layout: a fixed header with the offset of the index, one record per node, then the index of node names,
+inputs, content hashes and record offsets. Opening a file reads only the header and the index,
+nodes are decoded on demand: loading an output reads the records of it and its upstream nodes only,
+so libraries of many graphs load as fast as one. Index hashes alone tell which nodes of two files differ.
+
+Stored hashes are the ones `NodeGraph.node_hash` computes, so loaded nodes hit the memory and disk caches
+of results computed before the graph was saved, without hashing anything.
+"""
+import dataclasses
+import importlib
+import os
+import struct
+import threading
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from typing_extensions import Self
+
+from .evaluator import PACKAGE_NAME, GraphError, GraphNode, NodeGraph, function_reference
+
+MAGIC = b'BNGRAPH\x00'
+FORMAT_VERSION = 1
+GRAPH_SUFFIX = '.bngraph'
+
+# Magic, format version and offset of the index
+HEADER = struct.Struct('<8sIQ')
+FLOAT = struct.Struct('<d')
+
+# Type tags of encoded values
+TAG_NONE = 0
+TAG_FALSE = 1
+TAG_TRUE = 2
+TAG_INT = 3
+TAG_FLOAT = 4
+TAG_STR = 5
+TAG_BYTES = 6
+TAG_LIST = 7
+TAG_TUPLE = 8
+TAG_DICT = 9
+TAG_DATACLASS = 10
+
+
+def _write_varint(buffer: bytearray, number: int) -> None:
+    while number >= 0x80:  # noqa: WPS432
+        buffer.append((number & 0x7F) | 0x80)  # noqa: WPS432
+        number >>= 7
+    buffer.append(number)
+
+
+def _reference(obj: Any) -> str:
+    module = obj.__module__
+    if not module.startswith(PACKAGE_NAME + '.'):
+        raise TypeError('Only functions and Classes of the add-on can be stored, not {module}.{name}.'.format(
+            module=module,
+            name=obj.__qualname__,
+        ))
+    return function_reference(obj)
+
+
+def _resolve(reference: str) -> Any:
+    module_name, _, qualname = reference.partition(':')
+    try:
+        obj: Any = importlib.import_module('{package}.{module}'.format(package=PACKAGE_NAME, module=module_name))
+        for name in qualname.split('.'):
+            obj = getattr(obj, name)
+    except (ImportError, AttributeError) as error:
+        raise ValueError('Unknown function or Class {reference}.'.format(reference=reference)) from error
+    return obj
+
+
+def _encode_into(buffer: bytearray, value: Any) -> None:  # noqa: C901, WPS231
+    # bool is a subclass of int and must be tested first
+    if value is None:
+        buffer.append(TAG_NONE)
+    elif value is True or value is False:
+        buffer.append(TAG_TRUE if value else TAG_FALSE)
+    elif type(value) is int:  # noqa: E721  # Subclasses(e.g. IntEnum) would not round-trip
+        buffer.append(TAG_INT)
+        _write_varint(buffer, value << 1 if value >= 0 else (-value << 1) - 1)
+    elif type(value) is float:  # noqa: E721
+        buffer.append(TAG_FLOAT)
+        buffer += FLOAT.pack(value)
+    elif isinstance(value, str):
+        encoded = value.encode('utf-8')
+        buffer.append(TAG_STR)
+        _write_varint(buffer, len(encoded))
+        buffer += encoded
+    elif isinstance(value, (bytes, bytearray)):
+        buffer.append(TAG_BYTES)
+        _write_varint(buffer, len(value))
+        buffer += value
+    elif isinstance(value, (list, tuple)):
+        buffer.append(TAG_TUPLE if isinstance(value, tuple) else TAG_LIST)
+        _write_varint(buffer, len(value))
+        for item in value:
+            _encode_into(buffer, item)
+    elif isinstance(value, dict):
+        buffer.append(TAG_DICT)
+        _write_varint(buffer, len(value))
+        for key, item in value.items():
+            _encode_into(buffer, key)
+            _encode_into(buffer, item)
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        buffer.append(TAG_DATACLASS)
+        _encode_into(buffer, _reference(type(value)))
+        _encode_into(buffer, {
+            data_field.name: getattr(value, data_field.name)
+            for data_field in dataclasses.fields(value) if data_field.init
+        })
+    else:
+        raise TypeError('Values of type {type} can not be encoded.'.format(type=type(value).__name__))
+
+
+def encode(value: Any) -> bytes:
+    """`encode` function encodes a value in the binary format of graph files.
+
+    Args:
+        value (Any): None, bool, int, float, str, bytes, list, tuple, dict or a dataclass of the add-on,
+            containers may contain any of them.
+
+    Returns:
+        bytes: Encoded value.
+
+    Raises:
+        TypeError: If the value or anything it contains can't be encoded.
+    """
+    buffer = bytearray()
+    _encode_into(buffer, value)
+    return bytes(buffer)
+
+
+class Decoder():
+    """`Decoder` Class decodes values encoded by `encode` from a buffer.
+
+    Args:
+        data (bytes | memoryview): Encoded values.
+    """
+
+    def __init__(self: Self, data: bytes | memoryview) -> None:
+        self.data = memoryview(data)
+        self.position = 0
+        self.readers: dict[int, Callable[[], Any]] = {
+            TAG_NONE: lambda: None,
+            TAG_FALSE: lambda: False,
+            TAG_TRUE: lambda: True,
+            TAG_INT: self._int,
+            TAG_FLOAT: self._float,
+            TAG_STR: lambda: str(self._bytes(), 'utf-8'),
+            TAG_BYTES: self._bytes,
+            TAG_LIST: lambda: [self.decode() for _ in range(self._varint())],
+            TAG_TUPLE: lambda: tuple(self.decode() for _ in range(self._varint())),
+            TAG_DICT: lambda: {self.decode(): self.decode() for _ in range(self._varint())},
+            TAG_DATACLASS: self._dataclass,
+        }
+
+    def decode(self: Self) -> Any:
+        """`decode` function decodes the next value.
+
+        Returns:
+            Any: Decoded value.
+
+        Raises:
+            ValueError: If the data is not a valid encoding.
+        """
+        if self.position >= len(self.data):
+            raise ValueError('Unexpected end of encoded data.')
+        tag = self.data[self.position]
+        self.position += 1
+        reader = self.readers.get(tag)
+        if reader is None:
+            raise ValueError('Unknown type tag {tag}.'.format(tag=tag))
+        return reader()
+
+    def _varint(self: Self) -> int:
+        number = 0
+        shift = 0
+        while True:
+            if self.position >= len(self.data):
+                raise ValueError('Unexpected end of encoded data.')
+            byte = self.data[self.position]
+            self.position += 1
+            number |= (byte & 0x7F) << shift  # noqa: WPS432
+            if byte < 0x80:  # noqa: WPS432
+                return number
+            shift += 7
+
+    def _int(self: Self) -> int:
+        number = self._varint()
+        return -((number + 1) >> 1) if number & 1 else number >> 1
+
+    def _float(self: Self) -> float:
+        if self.position + FLOAT.size > len(self.data):
+            raise ValueError('Unexpected end of encoded data.')
+        value = FLOAT.unpack_from(self.data, self.position)[0]
+        self.position += FLOAT.size
+        return value
+
+    def _bytes(self: Self) -> bytes:
+        size = self._varint()
+        if self.position + size > len(self.data):
+            raise ValueError('Unexpected end of encoded data.')
+        value = bytes(self.data[self.position:self.position + size])
+        self.position += size
+        return value
+
+    def _dataclass(self: Self) -> Any:
+        reference = self.decode()
+        fields = self.decode()
+        cls = _resolve(reference)
+        if not (isinstance(cls, type) and dataclasses.is_dataclass(cls)):
+            raise ValueError('{reference} is not a dataclass.'.format(reference=reference))
+        try:
+            return cls(**fields)
+        except TypeError as error:
+            raise ValueError('Fields of {reference} have changed: {error}'.format(
+                reference=reference,
+                error=error,
+            )) from error
+
+
+def decode(data: bytes | memoryview) -> Any:
+    """`decode` function decodes a value encoded by `encode`.
+
+    Args:
+        data (bytes | memoryview): Encoded value.
+
+    Returns:
+        Any: Decoded value.
+
+    Raises:
+        ValueError: If the data is not a valid encoding.
+    """
+    return Decoder(data).decode()
+
+
+@dataclasses.dataclass(frozen=True)
+class IndexEntry():
+    """`IndexEntry` Class is the index entry of a node of a graph file.
+
+    Args:
+        inputs (tuple[str, ...]): Names of input nodes.
+        content_hash (str): Content hash of the node, see `NodeGraph.node_hash`.
+        offset (int): Offset of the node record in the file.
+        size (int): Size of the node record in bytes.
+    """
+
+    inputs: tuple[str, ...]
+    content_hash: str
+    offset: int
+    size: int
+
+
+def save_graph(
+    graph: NodeGraph,
+    path: str | Path,
+    outputs: Iterable[str] | None = None,
+    settings: dict[str, Any] | None = None,
+) -> dict[str, str]:
+    """`save_graph` function writes nodes of a graph to a graph file, atomically.
+
+    Args:
+        graph (NodeGraph): Graph to save.
+        path (str | Path): Path of the file.
+        outputs (Iterable[str] | None): Names of nodes to save with everything they depend on, all if not specified.
+        settings (dict[str, Any] | None): Settings the graph was made from, e.g. values of Scene PropertyGroups.
+
+    Returns:
+        dict[str, str]: Node name to content hash of the saved nodes.
+
+    Raises:
+        TypeError: If parameters of a node can't be encoded.
+    """
+    path = Path(path)
+    buffer = bytearray(HEADER.size)
+    index: dict[str, Any] = {'nodes': {}, 'settings': None}
+    with graph.lock:
+        hashes = graph.content_hashes(outputs)
+        for name, content_hash in hashes.items():
+            node = graph.nodes[name]
+            offset = len(buffer)
+            _encode_into(buffer, {
+                'function': _reference(node.function),
+                'parameters': node.parameters,
+                'persistent': node.persistent,
+            })
+            index['nodes'][name] = (node.inputs, content_hash, offset, len(buffer) - offset)
+
+    if settings is not None:
+        offset = len(buffer)
+        _encode_into(buffer, settings)
+        index['settings'] = (offset, len(buffer) - offset)
+
+    index_offset = len(buffer)
+    _encode_into(buffer, index)
+    HEADER.pack_into(buffer, 0, MAGIC, FORMAT_VERSION, index_offset)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Concurrent saves of one path(other threads or Blender instances) never share a temporary file
+    tmp_path = path.with_suffix('.{pid}.{tid}.tmp'.format(pid=os.getpid(), tid=threading.get_ident()))
+    tmp_path.write_bytes(buffer)
+    tmp_path.replace(path)
+    return hashes
+
+
+def is_graph_file(path: str | Path) -> bool:
+    """`is_graph_file` function tells whether a file is a graph file by its header.
+
+    Args:
+        path (str | Path): Path of the file.
+
+    Returns:
+        bool: True if the file starts with the magic of graph files.
+    """
+    try:
+        with open(path, 'rb') as graph_file:
+            return graph_file.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class GraphFile():
+    """`GraphFile` Class reads a graph file, decoding nodes only when they are needed.
+
+    Opening reads the header and the index only. It is a context manager that closes the file.
+
+    Args:
+        path (str | Path): Path of the file.
+
+    Raises:
+        ValueError: If the file is not a graph file of a supported version or it is malformed.
+    """
+
+    def __init__(self: Self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.file: BinaryIO = open(self.path, 'rb')  # noqa: WPS515, SIM115  # Closed by `close`
+        try:
+            magic, version, index_offset = HEADER.unpack(self.file.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError('{path} is not a graph file.'.format(path=self.path))
+            if version > FORMAT_VERSION:
+                raise ValueError('{path} has format version {version}, newer than {supported}.'.format(
+                    path=self.path,
+                    version=version,
+                    supported=FORMAT_VERSION,
+                ))
+            self.file.seek(index_offset)
+            self.nodes, self.settings_entry = self._read_index(decode(self.file.read()))
+        except struct.error as error:
+            self.file.close()
+            raise ValueError('{path} has a truncated header.'.format(path=self.path)) from error
+        except ValueError:
+            self.file.close()
+            raise
+
+    def __enter__(self: Self) -> Self:
+        """Returns the open file."""
+        return self
+
+    def __exit__(self: Self, *exc_info: Any) -> None:
+        """Closes the file."""
+        self.close()
+
+    def close(self: Self) -> None:
+        """`close` function closes the file."""
+        self.file.close()
+
+    @property
+    def hashes(self: Self) -> dict[str, str]:
+        """Node name to content hash of all nodes, read from the index only."""
+        return {name: entry.content_hash for name, entry in self.nodes.items()}
+
+    def upstream(self: Self, outputs: Iterable[str]) -> list[str]:
+        """`upstream` function returns requested nodes and everything they depend on, inputs first.
+
+        Nodes are stored in topological order, so the order of the index is kept.
+
+        Args:
+            outputs (Iterable[str]): Names of requested nodes.
+
+        Returns:
+            list[str]: Names of nodes needed to evaluate the requested nodes.
+
+        Raises:
+            GraphError: If a requested node or an input is not in the file.
+        """
+        needed: set[str] = set()
+        stack = list(outputs)
+        while stack:
+            name = stack.pop()
+            if name in needed:
+                continue
+            entry = self.nodes.get(name)
+            if entry is None:
+                raise GraphError('Unknown node {name} in {path}.'.format(name=name, path=self.path))
+            needed.add(name)
+            stack.extend(entry.inputs)
+        return [name for name in self.nodes if name in needed]
+
+    def node(self: Self, name: str) -> GraphNode:
+        """`node` function decodes one node.
+
+        Args:
+            name (str): Name of the node.
+
+        Returns:
+            GraphNode: Node with its stored parameters.
+
+        Raises:
+            ValueError: If the function of the node no longer exists.
+        """
+        entry = self.nodes[name]
+        record = self._read(entry.offset, entry.size)
+        return GraphNode(
+            name,
+            _resolve(record['function']),
+            inputs=entry.inputs,
+            parameters=record['parameters'],
+            persistent=record['persistent'],
+        )
+
+    def settings(self: Self) -> dict[str, Any] | None:
+        """`settings` function decodes the stored settings.
+
+        Returns:
+            dict[str, Any] | None: Settings the graph was saved with, None if there are none.
+        """
+        if self.settings_entry is None:
+            return None
+        return self._read(*self.settings_entry)
+
+    def load(self: Self, outputs: Iterable[str] | None = None, graph: NodeGraph | None = None) -> NodeGraph:
+        """`load` function adds nodes to a graph, only nodes needed for `outputs` are decoded.
+
+        Loaded nodes get their stored content hashes, so results cached under them are hit
+        without hashing, nodes of the graph downstream of replaced nodes are marked dirty.
+
+        Args:
+            outputs (Iterable[str] | None): Names of requested nodes, all nodes if not specified.
+            graph (NodeGraph | None): Graph to add the nodes to, a new graph if not specified.
+
+        Returns:
+            NodeGraph: The graph.
+        """
+        if graph is None:
+            graph = NodeGraph()
+        names = list(self.nodes) if outputs is None else self.upstream(outputs)
+        nodes = [self.node(name) for name in names]
+        with graph.lock:
+            for node in nodes:
+                graph.add_node(node)
+            for node in nodes:
+                graph.set_hash(node.name, self.nodes[node.name].content_hash)
+        return graph
+
+    def _read_index(self: Self, index: Any) -> tuple[dict[str, IndexEntry], tuple[int, int] | None]:
+        try:
+            nodes = {
+                name: IndexEntry(tuple(inputs), content_hash, offset, size)
+                for name, (inputs, content_hash, offset, size) in index['nodes'].items()
+            }
+            return nodes, index['settings']
+        except (AttributeError, KeyError, TypeError, ValueError) as error:
+            raise ValueError('{path} has a malformed index.'.format(path=self.path)) from error
+
+    def _read(self: Self, offset: int, size: int) -> Any:
+        self.file.seek(offset)
+        return decode(self.file.read(size))
+
+
+def diff_graphs(old: GraphFile, new: GraphFile) -> dict[str, list[str]]:
+    """`diff_graphs` function compares two graph files by content hashes, without decoding any node.
+
+    A node whose upstream changed has a changed hash too, so 'changed' lists everything to re-evaluate.
+
+    Args:
+        old (GraphFile): Graph file to compare with.
+        new (GraphFile): Graph file to compare.
+
+    Returns:
+        dict[str, list[str]]: Names of 'added', 'removed' and 'changed' nodes.
+    """
+    return {
+        'added': [name for name in new.nodes if name not in old.nodes],
+        'removed': [name for name in old.nodes if name not in new.nodes],
+        'changed': [
+            name for name, entry in new.nodes.items()
+            if name in old.nodes and old.nodes[name].content_hash != entry.content_hash
+        ],
+    }
@@ -0,0 +1,192 @@
+"""Operators saving `biome_graph` with Scene settings to graph files and loading them back."""
+import logging
+from typing import Any
+
+import bpy
+import bpy.props as bp  # noqa: WPS301
+import bpy.types as bt  # noqa: WPS301
+from typing_extensions import Self
+
+from ..biome.biome_ops import biome_parameters
+from ..class_register.decorators import registration_tier
+from .biome_graph import GRAPH_BUSY, biome_graph
+from .graph_file import GRAPH_SUFFIX, GraphFile, save_graph
+
+PACK_TIER = 'nodes.graph_files'
+
+# Properties every PropertyGroup has, they are not settings
+SKIPPED_PROPERTIES = frozenset(('rna_type',))
+
+logger = logging.getLogger(__name__)
+
+
+def property_values(property_group: bt.PropertyGroup) -> dict[str, Any]:
+    """`property_values` function returns values of a PropertyGroup as plain Python values.
+
+    Nested PropertyGroups become dicts, collections become lists of dicts, arrays become tuples
+    and enum flags sorted tuples.
+
+    Args:
+        property_group (PropertyGroup): PropertyGroup to read.
+
+    Returns:
+        dict[str, Any]: Property identifier to its value.
+    """
+    values: dict[str, Any] = {}
+    for prop in property_group.bl_rna.properties:
+        identifier = prop.identifier
+        if identifier in SKIPPED_PROPERTIES:
+            continue
+        value = getattr(property_group, identifier)
+        if prop.type == 'COLLECTION':
+            values[identifier] = [property_values(item) for item in value]
+        elif prop.type == 'POINTER':
+            if isinstance(value, bt.PropertyGroup):
+                values[identifier] = property_values(value)
+        elif prop.is_readonly:
+            continue
+        elif prop.type == 'ENUM' and prop.is_enum_flag:
+            values[identifier] = tuple(sorted(value))
+        elif getattr(prop, 'is_array', False):
+            values[identifier] = tuple(value)
+        else:
+            values[identifier] = value
+    return values
+
+
+def assign_values(property_group: bt.PropertyGroup, values: dict[str, Any]) -> None:
+    """`assign_values` function assigns values read by `property_values` to a PropertyGroup.
+
+    Values of unknown properties(e.g. removed in a newer add-on version) are skipped.
+
+    Args:
+        property_group (PropertyGroup): PropertyGroup to write.
+        values (dict[str, Any]): Property identifier to its value.
+    """
+    properties = property_group.bl_rna.properties
+    for identifier, value in values.items():
+        prop = properties.get(identifier)
+        if prop is None:
+            continue
+        if prop.type == 'COLLECTION':
+            collection = getattr(property_group, identifier)
+            collection.clear()
+            for item_values in value:
+                assign_values(collection.add(), item_values)
+        elif prop.type == 'POINTER':
+            assign_values(getattr(property_group, identifier), value)
+        elif prop.type == 'ENUM' and prop.is_enum_flag:
+            setattr(property_group, identifier, set(value))
+        else:
+            setattr(property_group, identifier, value)
+
+
+def scene_settings(scene: bt.Scene) -> dict[str, dict[str, Any]]:
+    """`scene_settings` function returns values of PropertyGroups decorated with `register_property_group`.
+
+    Args:
+        scene (Scene): Scene to read.
+
+    Returns:
+        dict[str, dict[str, Any]]: Attribute of the PropertyGroup on the Scene to its values.
+    """
+    settings = {}
+    for prop in scene.bl_rna.properties:
+        if prop.type != 'POINTER':
+            continue
+        property_group = getattr(scene, prop.identifier, None)
+        if getattr(property_group, 'property_group_type', None) is bt.Scene:
+            settings[prop.identifier] = property_values(property_group)
+    return settings
+
+
+def scene_parameters(scene: bt.Scene) -> dict[str, dict[str, Any]]:
+    """`scene_parameters` function returns parameters of all nodes of `biome_graph` from Scene settings.
+
+    Args:
+        scene (Scene): Scene with generation settings.
+
+    Returns:
+        dict[str, dict[str, Any]]: Node name to its parameters, see `NodeGraph.set_parameters`.
+    """
+    return {
+        **biome_parameters(scene),
+        'scatter': {'parameters': scene.bn_scatter.parameters()},
+    }
+
+
+@registration_tier(PACK_TIER)
+class OT_BiomeNodes_SaveGraph(bt.Operator):  # noqa: N801
+    """`OT_BiomeNodes_SaveGraph` Operator saves `biome_graph` and the Scene settings to a graph file.
+
+    Nodes are stored with their content hashes, see `graph_file`.
+    """
+
+    bl_description = 'Save the biome node graph and the Scene generation settings to a file'
+
+    filepath: bp.StringProperty(name='File Path', subtype='FILE_PATH')
+    filter_glob: bp.StringProperty(default='*' + GRAPH_SUFFIX, options={'HIDDEN'})
+
+    def invoke(self: Self, context: bt.Context, event: bt.Event) -> set[str]:  # noqa: D102
+        if not self.filepath:
+            self.filepath = bpy.path.ensure_ext(bpy.path.display_name_sanitized(context.scene.name), GRAPH_SUFFIX)
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self: Self, context: bt.Context) -> set[str]:  # noqa: D102
+        path = bpy.path.ensure_ext(bpy.path.abspath(self.filepath), GRAPH_SUFFIX)
+        with biome_graph.try_lock() as locked:
+            # A background job evaluates the graph, waiting for it would freeze the UI
+            if not locked:
+                self.report({'WARNING'}, GRAPH_BUSY)
+                return {'CANCELLED'}
+            for name, parameters in scene_parameters(context.scene).items():
+                biome_graph.set_parameters(name, **parameters)
+            try:
+                hashes = save_graph(biome_graph, path, settings=scene_settings(context.scene))
+            except (OSError, TypeError) as error:
+                self.report({'ERROR'}, 'Could not save the graph: {error}'.format(error=error))
+                return {'CANCELLED'}
+
+        logger.info('Saved %d nodes to %s.', len(hashes), path)
+        return {'FINISHED'}
+
+
+@registration_tier(PACK_TIER)
+class OT_BiomeNodes_LoadGraph(bt.Operator):  # noqa: N801
+    """`OT_BiomeNodes_LoadGraph` Operator loads a graph file into `biome_graph` and the Scene settings.
+
+    Nodes get their stored content hashes, so results cached before the graph was saved are reused.
+    """
+
+    bl_description = 'Load a biome node graph and generation settings from a file into the Scene'
+
+    filepath: bp.StringProperty(name='File Path', subtype='FILE_PATH')
+    filter_glob: bp.StringProperty(default='*' + GRAPH_SUFFIX, options={'HIDDEN'})
+
+    def invoke(self: Self, context: bt.Context, event: bt.Event) -> set[str]:  # noqa: D102
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self: Self, context: bt.Context) -> set[str]:  # noqa: D102
+        path = bpy.path.abspath(self.filepath)
+        with biome_graph.try_lock() as locked:
+            if not locked:
+                self.report({'WARNING'}, GRAPH_BUSY)
+                return {'CANCELLED'}
+            try:
+                with GraphFile(path) as graph_file:
+                    settings = graph_file.settings() or {}
+                    graph_file.load(graph=biome_graph)
+                    node_count = len(graph_file.nodes)
+            except (OSError, ValueError) as error:
+                self.report({'ERROR'}, 'Could not load the graph: {error}'.format(error=error))
+                return {'CANCELLED'}
+
+        for attribute, values in settings.items():
+            property_group = getattr(context.scene, attribute, None)
+            if property_group is not None:
+                assign_values(property_group, values)
+
+        logger.info('Loaded %d nodes from %s.', node_count, path)
+        return {'FINISHED'}
@@ -0,0 +1,40 @@
+"""Nodes of the biome generation pipeline, independent of `bpy`.
+
+The same nodes back `biome_graph` inside Blender and graphs of batch bakes in worker processes,
+so both produce identical layers for identical parameters.
+"""
+from ..biome.classification import build_lookup, classify
+from ..biome.climate import moisture_layer, temperature_layer
+from ..scatter.poisson import scatter
+from ..terrain.heightmap import slope_angles
+from ..terrain.tiling import generate_heightmap_tiled
+from .evaluator import GraphNode, NodeGraph
+
+# Nodes whose results can be baked, in the order of the pipeline
+PIPELINE_OUTPUTS = ('heightmap', 'temperature', 'moisture', 'slope', 'biome_lookup', 'biomes', 'scatter')
+
+
+def add_biome_nodes(graph: NodeGraph) -> NodeGraph:
+    """`add_biome_nodes` function adds all nodes of the pipeline to a graph.
+
+    The lookup table is a node of its own, so it is rebuilt only when the rules change, not with every layer.
+
+    Args:
+        graph (NodeGraph): Graph to add the nodes to.
+
+    Returns:
+        NodeGraph: The graph.
+    """
+    graph.add_node(GraphNode('heightmap', generate_heightmap_tiled, persistent=True))
+    graph.add_node(GraphNode('temperature', temperature_layer, inputs=('heightmap',), persistent=True))
+    graph.add_node(GraphNode('moisture', moisture_layer, inputs=('heightmap',), persistent=True))
+    graph.add_node(GraphNode('slope', slope_angles, inputs=('heightmap',)))
+    graph.add_node(GraphNode('biome_lookup', build_lookup))
+    graph.add_node(GraphNode(
+        'biomes',
+        classify,
+        inputs=('temperature', 'moisture', 'heightmap', 'slope', 'biome_lookup'),
+        persistent=True,
+    ))
+    graph.add_node(GraphNode('scatter', scatter, inputs=('heightmap',)))
+    return graph
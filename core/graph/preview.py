@@ -0,0 +1,144 @@
+"""Progressive preview evaluation for interactive editing.
+
+A preview request is a sequence of levels of detail, e.g. a heightmap at 1/16, 1/4 and full resolution.
+Levels are evaluated one after another on a worker thread, every finished level is queued for the main
+thread, which polls the queue from a timer and shows the newest refinement. A newer request cancels
+the older one: its remaining levels are skipped and the running level is asked to stop through the
+cancel check it was called with. Results of stale requests are dropped, so they never reach the UI.
+
+This module must not depend on `bpy`, only the main thread touches Blender data.
+"""
+import logging
+import queue
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from typing_extensions import Self
+
+from ..terrain.tiling import CancelCheck
+from ...util.ledger import ledger
+
+# Level of detail of a preview, called with a cancel check it should poll while it runs
+PreviewLevel = Callable[[CancelCheck], Any]
+
+# Resolution divisors of preview levels, from the coarsest to full resolution
+PREVIEW_DIVISORS = (16, 4, 1)
+
+
+@dataclass(frozen=True)
+class PreviewResult():
+    """`PreviewResult` Class is a finished level of a preview request.
+
+    Args:
+        generation (int): Request the level belongs to, see `PreviewScheduler.request`.
+        level (int): Index of the level, higher levels are more detailed.
+        final (bool): Whether this is the last level of the request.
+        value (Any): Result of the level, None if it failed.
+        error (BaseException | None): Exception raised by the level.
+    """
+
+    generation: int
+    level: int
+    final: bool
+    value: Any = None
+    error: BaseException | None = None
+
+
+class PreviewScheduler():
+    """`PreviewScheduler` Class evaluates levels of preview requests on a worker thread.
+
+    Only the latest request is ever evaluated, requesting a preview cancels the previous one.
+    `request`, `poll` and `cancel` are meant to be called from the main thread.
+
+    Args:
+        logger (Logger | None): Logger object that is going to be used for debug output.
+    """
+
+    def __init__(self: Self, logger: logging.Logger | None = None) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.generation = 0
+        self.results: queue.SimpleQueue[PreviewResult] = queue.SimpleQueue()
+        self.executor: ThreadPoolExecutor | None = None
+        self._cancel_event = threading.Event()
+        self._future: Future[None] | None = None
+
+    @property
+    def busy(self: Self) -> bool:
+        """`busy` property tells whether levels of a request are still being evaluated.
+
+        Returns:
+            bool: True while the worker thread runs a request.
+        """
+        return self._future is not None and not self._future.done()
+
+    def request(self: Self, levels: Sequence[PreviewLevel]) -> int:
+        """`request` function cancels the running preview and starts evaluating new levels.
+
+        Args:
+            levels (Sequence[PreviewLevel]): Levels from the coarsest to the most detailed.
+
+        Returns:
+            int: Generation of the request, `PreviewResult.generation` of its levels.
+        """
+        self.cancel()
+        cancel_event = threading.Event()
+        self._cancel_event = cancel_event
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='BiomeNodesPreview')
+            ledger.record('worker pools', self, self.shutdown, name='preview')
+        self._future = self.executor.submit(self._run, self.generation, tuple(levels), cancel_event)
+        return self.generation
+
+    def poll(self: Self) -> list[PreviewResult]:
+        """`poll` function returns finished levels of the current request, results of older requests are dropped.
+
+        Returns:
+            list[PreviewResult]: Finished levels in order of completion.
+        """
+        finished = []
+        while True:
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                return finished
+            if result.generation == self.generation:
+                finished.append(result)
+
+    def cancel(self: Self) -> None:
+        """`cancel` function cancels the current request, its finished levels are no longer returned."""
+        self._cancel_event.set()
+        self.generation += 1
+
+    def shutdown(self: Self) -> None:
+        """`shutdown` function cancels the current request and stops the worker thread."""
+        self.cancel()
+        if self.executor is not None:
+            ledger.discard(self)
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+    def _run(self: Self, generation: int, levels: tuple[PreviewLevel, ...], cancel_event: threading.Event) -> None:
+        for index, level in enumerate(levels):
+            if cancel_event.is_set():
+                return
+            try:
+                value = level(cancel_event.is_set)
+            except CancelledError:
+                self.logger.debug('Cancelled preview %d.', generation)
+                return
+            except Exception as error:  # noqa: B902, WPS424  # Reported to the main thread
+                self.results.put(PreviewResult(generation, index, final=True, error=error))
+                return
+            self.results.put(PreviewResult(generation, index, final=index == len(levels) - 1, value=value))
+
+
+# Shared by preview Operators, so at most one preview is evaluated at a time
+preview_scheduler = PreviewScheduler()
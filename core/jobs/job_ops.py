@@ -0,0 +1,116 @@
+"""Main thread side of background jobs: delivery of results, progress and cancellation."""
+import logging
+
+import bpy
+import bpy.types as bt  # noqa: WPS301
+from typing_extensions import Self
+
+from .runner import JOB_CANCELLED, JOB_DONE, Job, JobRunner
+from ...util.ledger import ledger
+
+# Seconds between deliveries of finished jobs
+DELIVERY_INTERVAL = 0.1
+
+# Finished jobs handled per delivery, their callbacks write Blender data and must not stall the UI
+DELIVERY_BATCH = 4
+
+logger = logging.getLogger(__name__)
+
+# Shared by generation Operators, so jobs never evaluate the node graph concurrently
+job_runner = JobRunner()
+
+
+def run_job(job: Job, background: bool = True) -> Job:
+    """`run_job` function runs a job in the background or right away on the current thread.
+
+    Background jobs are delivered by `deliver_jobs` on a `bpy.app.timers` timer, which is registered
+    while there are jobs and reports their progress through the window manager progress API.
+
+    Args:
+        job (Job): Job to run.
+        background (bool): Whether to run on the job runner, otherwise exceptions propagate.
+
+    Returns:
+        Job: The job.
+    """
+    if not background:
+        job.result = job.function(job)
+        job.state = JOB_DONE
+        if job.on_done is not None:
+            job.on_done(job.result)
+        return job
+
+    if not job_runner.busy:
+        bpy.context.window_manager.progress_begin(0, 1)
+    job_runner.submit(job)
+    if not bpy.app.timers.is_registered(deliver_jobs):
+        bpy.app.timers.register(deliver_jobs, first_interval=DELIVERY_INTERVAL)
+        ledger.record('timers', deliver_jobs, stop_delivery, name='job delivery')
+    return job
+
+
+def deliver_jobs() -> float | None:
+    """`deliver_jobs` function calls back finished jobs on the main thread, it is a `bpy.app.timers` function.
+
+    Returns:
+        float | None: Seconds until the next delivery, None once there are no jobs left.
+    """
+    delivered = job_runner.collect(DELIVERY_BATCH)
+    for job in delivered:
+        _deliver(job)
+
+    window_manager = bpy.context.window_manager
+    # Viewports show results of jobs(e.g. overlays), they are not redrawn by a timer on their own
+    if delivered:
+        _redraw_viewports(window_manager)
+    if job_runner.busy:
+        window_manager.progress_update(job_runner.progress)
+        return DELIVERY_INTERVAL
+    window_manager.progress_end()
+    ledger.discard(deliver_jobs)
+    return None
+
+
+def stop_delivery() -> None:
+    """`stop_delivery` function unregisters the `deliver_jobs` timer, jobs that are not delivered are dropped."""
+    ledger.discard(deliver_jobs)
+    if bpy.app.timers.is_registered(deliver_jobs):
+        bpy.app.timers.unregister(deliver_jobs)
+        bpy.context.window_manager.progress_end()
+
+
+def _redraw_viewports(window_manager: bt.WindowManager) -> None:
+    for window in window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+
+def _deliver(job: Job) -> None:
+    # An exception would unregister the timer and strand every other job, so callbacks are isolated
+    try:
+        if job.state == JOB_DONE:
+            if job.on_done is not None:
+                job.on_done(job.result)
+        elif job.state == JOB_CANCELLED:
+            logger.info('Cancelled %s.', job.name)
+        elif job.on_error is not None and job.error is not None:
+            job.on_error(job.error)
+        else:
+            logger.error('%s failed: %s', job.name, job.error)
+    except Exception:  # noqa: B902, WPS424
+        logger.exception('Delivering %s failed.', job.name)
+
+
+class OT_BiomeNodes_CancelJobs(bt.Operator):  # noqa: N801
+    """`OT_BiomeNodes_CancelJobs` Operator cancels all background jobs, running ones stop at their next check."""
+
+    bl_description = 'Cancel all background generation jobs'
+
+    def execute(self: Self, context: bt.Context) -> set[str]:  # noqa: D102
+        if not job_runner.busy:
+            return {'CANCELLED'}
+
+        job_runner.cancel_all()
+        self.report({'INFO'}, 'Cancelling {count} jobs.'.format(count=len(job_runner.jobs)))
+        return {'FINISHED'}
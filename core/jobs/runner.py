@@ -0,0 +1,189 @@
+"""Background jobs: long generation work off the main thread, with progress and cancellation.
+
+Jobs run on a worker thread, heavy stages still fan out to worker processes(see `TileScheduler`).
+Finished jobs are queued and collected by the main thread in batches, so Blender data is only touched
+from there. A job polls `Job.cancelled` and reports progress with `Job.report`, the cancel check is also
+set as `active_cancel_check` while the job runs, so tiled evaluations deep inside it stop early too.
+
+This module must not depend on `bpy`.
+"""
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from typing import Any
+
+from typing_extensions import Self
+
+from ..terrain.tiling import active_cancel_check
+from ...util.ledger import ledger
+
+JOB_QUEUED = 'QUEUED'
+JOB_RUNNING = 'RUNNING'
+JOB_DONE = 'DONE'
+JOB_FAILED = 'FAILED'
+JOB_CANCELLED = 'CANCELLED'
+
+
+class Job():
+    """`Job` Class is a unit of background work and its outcome.
+
+    Args:
+        name (str): Name of the job, shown in progress reports.
+        function (Callable[[Job], Any]): Work of the job, called on a worker thread with the job itself.
+        on_done (Callable[[Any], None] | None): Called on the main thread with the result.
+        on_error (Callable[[BaseException], None] | None): Called on the main thread if the job failed.
+    """
+
+    def __init__(
+        self: Self,
+        name: str,
+        function: Callable[['Job'], Any],
+        on_done: Callable[[Any], None] | None = None,
+        on_error: Callable[[BaseException], None] | None = None,
+    ) -> None:
+        self.name = name
+        self.function = function
+        self.on_done = on_done
+        self.on_error = on_error
+        self.state = JOB_QUEUED
+        self.progress = 0.0
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self._cancel_event = threading.Event()
+
+    def cancel(self: Self) -> None:
+        """`cancel` function asks the job to stop, a queued job never starts."""
+        self._cancel_event.set()
+
+    def cancelled(self: Self) -> bool:
+        """`cancelled` function tells whether the job was asked to stop, it is a `CancelCheck`.
+
+        Returns:
+            bool: True once `cancel` was called.
+        """
+        return self._cancel_event.is_set()
+
+    def report(self: Self, progress: float) -> None:
+        """`report` function updates the progress of the job.
+
+        Args:
+            progress (float): Share of the work done, in [0, 1].
+        """
+        self.progress = min(max(progress, 0.0), 1.0)
+
+
+class JobRunner():
+    """`JobRunner` Class runs jobs in order of submission on a worker thread.
+
+    Jobs share the node graph, so they run one at a time, parallelism comes from the stages inside them.
+
+    Args:
+        logger (Logger | None): Logger object that is going to be used for debug output.
+    """
+
+    def __init__(self: Self, logger: logging.Logger | None = None) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.jobs: list[Job] = []
+        self.finished: queue.SimpleQueue[Job] = queue.SimpleQueue()
+        self.executor: ThreadPoolExecutor | None = None
+
+    @property
+    def busy(self: Self) -> bool:
+        """`busy` property tells whether any job is queued, running or not yet collected.
+
+        Returns:
+            bool: True while there are jobs to collect.
+        """
+        return bool(self.jobs)
+
+    @property
+    def progress(self: Self) -> float:
+        """`progress` property returns the mean progress of all jobs that are not collected yet.
+
+        Returns:
+            float: Share of the work done, 1 if there are no jobs.
+        """
+        if not self.jobs:
+            return 1.0
+        return sum(job.progress for job in self.jobs) / len(self.jobs)
+
+    def submit(self: Self, job: Job) -> Job:
+        """`submit` function queues a job.
+
+        Args:
+            job (Job): Job to run.
+
+        Returns:
+            Job: The submitted job.
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='BiomeNodesJob')
+            ledger.record('worker pools', self, self.shutdown, name='jobs')
+        self.jobs.append(job)
+        self.executor.submit(self._run, job)
+        return job
+
+    def cancel_all(self: Self) -> None:
+        """`cancel_all` function asks all jobs that are not collected yet to stop."""
+        for job in self.jobs:
+            job.cancel()
+
+    def collect(self: Self, max_jobs: int | None = None) -> list[Job]:
+        """`collect` function returns finished jobs, to be called from the main thread.
+
+        Args:
+            max_jobs (int | None): Maximum number of jobs to return, the rest is left for the next call.
+
+        Returns:
+            list[Job]: Finished jobs in order of completion.
+        """
+        collected: list[Job] = []
+        while max_jobs is None or len(collected) < max_jobs:
+            try:
+                job = self.finished.get_nowait()
+            except queue.Empty:
+                break
+            self.jobs.remove(job)
+            collected.append(job)
+        return collected
+
+    def shutdown(self: Self) -> None:
+        """`shutdown` function cancels all jobs and stops the worker thread."""
+        self.cancel_all()
+        if self.executor is not None:
+            ledger.discard(self)
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+        self.jobs.clear()
+
+    def _run(self: Self, job: Job) -> None:
+        if job.cancelled():
+            job.state = JOB_CANCELLED
+            self.finished.put(job)
+            return
+
+        job.state = JOB_RUNNING
+        start = time.perf_counter()
+        token = active_cancel_check.set(job.cancelled)
+        try:
+            job.result = job.function(job)
+        except CancelledError:
+            job.state = JOB_CANCELLED
+        except Exception as error:  # noqa: B902, WPS424  # Reported to the main thread
+            job.error = error
+            job.state = JOB_FAILED
+        else:
+            job.state = JOB_DONE
+            job.progress = 1.0
+        finally:
+            active_cancel_check.reset(token)
+
+        self.logger.debug('Job %s %s in %.3fs.', job.name, job.state.lower(), time.perf_counter() - start)
+        self.finished.put(job)
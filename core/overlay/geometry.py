@@ -0,0 +1,147 @@
+"""Vertex buffers of viewport overlays built from layers of the pipeline, independent of `bpy` and `gpu`.
+
+Every buffer is one contiguous NumPy array of the exact item type a GPU vertex or index buffer stores,
+`float32` positions and colors and `uint32` triangle indices, so batches are filled from them in one copy
+instead of one Python call per element. Layers are strided down to the overlay resolution first,
+the viewport doesn't need more vertices than it has pixels.
+"""
+import colorsys
+import math
+from functools import lru_cache
+
+import numpy as np
+import numpy.typing as npt
+
+from ..terrain.noise import FloatArray
+
+# Hue step between colors of consecutive species, the golden ratio keeps neighbouring species apart
+SPECIES_HUE_STEP = (math.sqrt(5) - 1) / 2
+
+
+def stride(shape: tuple[int, ...], resolution: int) -> int:
+    """`stride` function returns the step that samples a layer down to at most `resolution` cells per side.
+
+    Args:
+        shape (tuple[int, ...]): Shape of the layer.
+        resolution (int): Maximum number of cells per side.
+
+    Returns:
+        int: Step between sampled cells, 1 if the layer is small enough.
+    """
+    return max(1, math.ceil(max(shape) / max(resolution, 2)))
+
+
+@lru_cache(maxsize=8)
+def grid_indices(rows: int, columns: int) -> npt.NDArray[np.uint32]:
+    """`grid_indices` function returns triangles of a grid of vertices, cached per shape.
+
+    Indices depend only on the shape, so rebuilding an overlay of new data reuses them. Callers must not
+    modify the returned array.
+
+    Args:
+        rows (int): Number of vertex rows.
+        columns (int): Number of vertex columns.
+
+    Returns:
+        NDArray[uint32]: Vertex indices shaped `(triangles, 3)`, two triangles per cell.
+    """
+    corners = np.arange(rows * columns, dtype=np.uint32).reshape(rows, columns)[:-1, :-1].reshape(-1, 1)
+    quads = corners + np.array([0, 1, columns, columns + 1], dtype=np.uint32)
+    return np.ascontiguousarray(quads[:, [0, 1, 3, 0, 3, 2]].reshape(-1, 3))
+
+
+def grid_positions(heights: FloatArray, step: int, size: float, height_scale: float, offset: float) -> FloatArray:
+    """`grid_positions` function returns vertices of a heightmap sampled every `step` cells.
+
+    Vertices are placed like instances of the scatter: X by column and Y by row over `[0, size]`,
+    Z is the normalized height times `height_scale`.
+
+    Args:
+        heights (NDArray[float32]): Normalized heightmap.
+        step (int): Step between sampled cells, see `stride`.
+        size (float): Width and depth of the terrain.
+        height_scale (float): Height of the terrain at normalized height 1.
+        offset (float): Distance the vertices are lifted above the terrain, so they don't fight for depth with it.
+
+    Returns:
+        NDArray[float32]: Positions shaped `(vertices, 3)`.
+    """
+    rows, columns = heights.shape
+    sampled = heights[::step, ::step]
+    y_coords = np.arange(0, rows, step, dtype=np.float32) * np.float32(size / max(rows - 1, 1))
+    x_coords = np.arange(0, columns, step, dtype=np.float32) * np.float32(size / max(columns - 1, 1))
+
+    positions = np.empty((*sampled.shape, 3), dtype=np.float32)
+    positions[..., 0] = x_coords
+    positions[..., 1] = y_coords[:, np.newaxis]
+    np.multiply(sampled, np.float32(height_scale), out=positions[..., 2])
+    positions[..., 2] += np.float32(offset)
+    return positions.reshape(-1, 3)
+
+
+def biome_colors(ids: npt.NDArray[np.uint8], step: int, palette: npt.NDArray[np.float32], opacity: float) -> FloatArray:
+    """`biome_colors` function returns vertex colors of a biome ID map sampled every `step` cells.
+
+    Args:
+        ids (NDArray[uint8]): Biome IDs.
+        step (int): Step between sampled cells, see `stride`.
+        palette (NDArray[float32]): RGBA colors indexed by biome ID, see `PG_Biomes.palette`.
+        opacity (float): Alpha of the colors.
+
+    Returns:
+        NDArray[float32]: Colors shaped `(vertices, 4)`.
+    """
+    sampled = ids[::step, ::step].reshape(-1)
+    # IDs of removed rules are drawn with the last color instead of failing
+    colors = palette[np.minimum(sampled, len(palette) - 1)]
+    colors[:, 3] = opacity
+    return colors
+
+
+def density_colors(weights: FloatArray, step: int, color: tuple[float, ...], opacity: float) -> FloatArray:
+    """`density_colors` function returns vertex colors of a density mask sampled every `step` cells.
+
+    Args:
+        weights (NDArray[float32]): Density in [0, 1], e.g. blend weights of a biome.
+        step (int): Step between sampled cells, see `stride`.
+        color (tuple[float, ...]): RGB color of full density.
+        opacity (float): Alpha of full density, alpha fades out with the density.
+
+    Returns:
+        NDArray[float32]: Colors shaped `(vertices, 4)`.
+    """
+    sampled = weights[::step, ::step].reshape(-1)
+    colors = np.empty((sampled.size, 4), dtype=np.float32)
+    colors[:, :3] = color[:3]
+    np.multiply(sampled, np.float32(opacity), out=colors[:, 3])
+    return colors
+
+
+def species_palette(count: int) -> npt.NDArray[np.float32]:
+    """`species_palette` function returns distinct RGBA colors of species.
+
+    Args:
+        count (int): Number of species.
+
+    Returns:
+        NDArray[float32]: Colors shaped `(count, 4)`, the same species always gets the same color.
+    """
+    colors = np.ones((max(count, 1), 4), dtype=np.float32)
+    for index in range(len(colors)):
+        colors[index, :3] = colorsys.hsv_to_rgb((index * SPECIES_HUE_STEP) % 1, 0.75, 1)
+    return colors
+
+
+def instance_colors(species: npt.NDArray[np.int32], opacity: float) -> FloatArray:
+    """`instance_colors` function returns vertex colors of scatter instances by species.
+
+    Args:
+        species (NDArray[int32]): Species of the instances.
+        opacity (float): Alpha of the colors.
+
+    Returns:
+        NDArray[float32]: Colors shaped `(instances, 4)`.
+    """
+    palette = species_palette(int(species.max()) + 1 if species.size else 0)
+    palette[:, 3] = opacity
+    return palette[species]
@@ -0,0 +1,291 @@
+"""Operators and settings of viewport overlays of biome layers.
+
+Overlays are drawn by one `SpaceView3D` draw handler from a single GPU batch. The batch is filled
+from NumPy buffers(see `geometry`) and rebuilt only when its version changes: the content hashes
+of the `biome_graph` nodes it shows and the settings its vertices depend on. Every other redraw
+of the viewport only compares the version and draws the batch.
+"""
+import logging
+from typing import Any
+
+import bpy
+import bpy.props as bp  # noqa: WPS301
+import bpy.types as bt  # noqa: WPS301
+import numpy as np
+from typing_extensions import Self
+
+from ..biome.classification import biome_weights
+from ..class_register.decorators import register_property_group, registration_tier
+from ..graph.biome_graph import biome_graph
+from ..graph.evaluator import NodeGraph
+from .geometry import biome_colors, density_colors, grid_indices, grid_positions, instance_colors, stride
+from ...util.ledger import ledger
+
+PACK_TIER = 'nodes.overlay'
+
+OVERLAY_LAYERS = (
+    ('BIOMES', 'Biomes', 'Biome IDs in colors of the biome rules'),
+    ('DENSITY', 'Density', 'Blend weights of the active biome rule, the density scatter masks are made of'),
+    ('SCATTER', 'Scatter', 'Scattered instances as points colored by species'),
+)
+
+# Nodes of `biome_graph` each layer is drawn from, the batch is rebuilt when any of their hashes changes
+LAYER_NODES = {
+    'BIOMES': ('heightmap', 'biomes'),
+    'DENSITY': ('temperature', 'moisture', 'heightmap', 'slope', 'biome_lookup'),
+    'SCATTER': ('scatter',),
+}
+
+# Builtin shader of the batch, positions and per-vertex colors
+OVERLAY_SHADER = 'SMOOTH_COLOR'
+
+logger = logging.getLogger(__name__)
+
+
+def _redraw_viewports(settings: 'PG_Overlay', context: bt.Context) -> None:  # pylint: disable=unused-argument
+    for area in context.screen.areas if context.screen is not None else ():
+        if area.type == 'VIEW_3D':
+            area.tag_redraw()
+
+
+@register_property_group(bt.Scene, 'bn_overlay')
+class PG_Overlay(bt.PropertyGroup):  # noqa: N801
+    """Settings of the viewport overlay, stored per Scene."""
+
+    enabled: bp.BoolProperty(name='Show Overlay', update=_redraw_viewports)
+    layer: bp.EnumProperty(name='Layer', items=OVERLAY_LAYERS, default='BIOMES', update=_redraw_viewports)
+    opacity: bp.FloatProperty(
+        name='Opacity',
+        default=0.5,
+        min=0,
+        max=1,
+        subtype='FACTOR',
+        update=_redraw_viewports,
+    )
+    resolution: bp.IntProperty(
+        name='Resolution',
+        description='Maximum number of vertices along a side of drawn layers, larger layers are sampled down',
+        default=256,
+        min=2,
+        max=4096,
+        update=_redraw_viewports,
+    )
+    offset: bp.FloatProperty(
+        name='Offset',
+        description='Height of the overlay above the terrain',
+        default=0.05,
+        min=0,
+        subtype='DISTANCE',
+        update=_redraw_viewports,
+    )
+    point_size: bp.FloatProperty(name='Point Size', default=4, min=1, max=32, update=_redraw_viewports)
+
+    def geometry_key(self: Self) -> tuple[Any, ...]:
+        """`geometry_key` function returns the settings vertices of the overlay depend on.
+
+        Point size is a draw state and is not part of the key, changing it doesn't rebuild the batch.
+
+        Returns:
+            tuple[Any, ...]: Settings of the overlay and of the terrain it is drawn over.
+        """
+        scene = self.id_data
+        key: tuple[Any, ...] = (self.layer, round(self.opacity, 3), self.resolution, self.offset)
+        if self.layer == 'SCATTER':
+            return key
+        terrain = scene.bn_heightmap
+        key += (terrain.size, terrain.height_scale)
+        biomes = scene.bn_biomes
+        if self.layer == 'BIOMES':
+            return (*key, tuple(tuple(rule.color) for rule in biomes.rules))
+        rule_index = min(biomes.active_rule_index, len(biomes.rules) - 1)
+        return (*key, rule_index, tuple(biomes.rules[rule_index].color) if rule_index >= 0 else None)
+
+
+class OverlayRenderer():
+    """`OverlayRenderer` Class draws the overlay of the current Scene in every 3D viewport.
+
+    The draw handler is recorded in the `ledger`, so it is removed with the add-on. A batch is built
+    only from results already in the memory cache of the graph and only while no job holds the graph,
+    a version whose results are not cached is remembered and looked up again only once the graph caches
+    new results(see `NodeGraph.cache_updates`), not every redraw.
+
+    Args:
+        graph (NodeGraph): Graph the layers are read from.
+        logger (Logger | None): Logger object that is going to be used for debug output.
+    """
+
+    def __init__(self: Self, graph: NodeGraph, logger: logging.Logger | None = None) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.graph = graph
+        self.handler: Any = None
+        self.shader: Any = None
+        self.batch: Any = None
+        self.version: tuple[Any, ...] | None = None
+        self.missing: tuple[Any, ...] | None = None
+        self.missing_updates = -1
+
+    @property
+    def running(self: Self) -> bool:
+        """Whether the draw handler is installed."""
+        return self.handler is not None
+
+    def start(self: Self) -> None:
+        """`start` function installs the draw handler, if it is not installed yet."""
+        if self.handler is not None:
+            return
+        self.handler = bt.SpaceView3D.draw_handler_add(self.draw, (), 'WINDOW', 'POST_VIEW')
+        ledger.record('draw handlers', self, self.stop, name='biome overlay')
+
+    def stop(self: Self) -> None:
+        """`stop` function removes the draw handler and frees the batch."""
+        ledger.discard(self)
+        if self.handler is not None:
+            bt.SpaceView3D.draw_handler_remove(self.handler, 'WINDOW')
+            self.handler = None
+        self.batch = None
+        self.shader = None
+        self.version = None
+        self.missing = None
+
+    def layer_version(self: Self, settings: PG_Overlay) -> tuple[Any, ...]:
+        """`layer_version` function returns the version of the data the overlay of a Scene shows.
+
+        Args:
+            settings (PG_Overlay): Overlay settings of the Scene.
+
+        Returns:
+            tuple[Any, ...]: Content hashes of the drawn nodes and the geometry settings.
+        """
+        hashes = tuple(self.graph.hashes.get(name) for name in LAYER_NODES[settings.layer])
+        return (hashes, settings.geometry_key())
+
+    def draw(self: Self) -> None:
+        """`draw` function draws the overlay, it is the draw handler and runs on every viewport redraw."""
+        settings = bpy.context.scene.bn_overlay
+        if not settings.enabled:
+            return
+
+        version = self.layer_version(settings)
+        if version != self.version and (version != self.missing or self.graph.cache_updates != self.missing_updates):
+            self.rebuild(settings)
+        if self.batch is None:
+            return
+
+        import gpu  # noqa: WPS433  # Not available in `--background` mode, where nothing is drawn
+
+        gpu.state.blend_set('ALPHA')
+        gpu.state.depth_test_set('LESS_EQUAL')
+        gpu.state.point_size_set(settings.point_size)
+        self.shader.bind()
+        self.batch.draw(self.shader)
+        gpu.state.depth_test_set('NONE')
+        gpu.state.blend_set('NONE')
+
+    def rebuild(self: Self, settings: PG_Overlay) -> None:
+        """`rebuild` function rebuilds the batch from cached results of the graph.
+
+        Args:
+            settings (PG_Overlay): Overlay settings of the Scene.
+        """
+        with self.graph.try_lock() as locked:
+            # A job evaluates the graph, the current batch is drawn until a later redraw
+            if not locked:
+                return
+            results: dict[str, Any] = {}
+            for name in LAYER_NODES[settings.layer]:
+                found, result = self.graph.cached(name)
+                if not found:
+                    break
+                results[name] = result
+            # Looking results up brings hashes of dirty nodes up to date
+            version = self.layer_version(settings)
+            cache_updates = self.graph.cache_updates
+
+        buffers = None
+        if len(results) == len(LAYER_NODES[settings.layer]):
+            buffers = self.buffers(settings, results)
+        # Results of the settings are not evaluated yet, a batch of other results would be misleading
+        if buffers is None:
+            self.batch = None
+            self.version = None
+            self.missing = version
+            self.missing_updates = cache_updates
+            return
+
+        from gpu_extras.batch import batch_for_shader  # noqa: WPS433
+        import gpu  # noqa: WPS433
+
+        primitive, positions, colors, indices = buffers
+        if self.shader is None:
+            self.shader = gpu.shader.from_builtin(OVERLAY_SHADER)
+        self.batch = batch_for_shader(self.shader, primitive, {'pos': positions, 'color': colors}, indices=indices)
+        self.version = version
+        self.logger.debug('Rebuilt the %s overlay of %d vertices.', settings.layer, len(positions))
+
+    @staticmethod
+    def buffers(settings: PG_Overlay, results: dict[str, Any]) -> tuple[str, Any, Any, Any] | None:
+        """`buffers` function returns vertex buffers of the overlay.
+
+        Args:
+            settings (PG_Overlay): Overlay settings of the Scene.
+            results (dict[str, Any]): Results of the nodes of the layer, see `LAYER_NODES`.
+
+        Returns:
+            tuple[str, Any, Any, Any] | None: Primitive type, positions, colors and indices(None for points),
+                None if there is nothing to draw.
+        """
+        if settings.layer == 'SCATTER':
+            instances = results['scatter']
+            if not len(instances):
+                return None
+            positions = np.ascontiguousarray(instances['position'])
+            return 'POINTS', positions, instance_colors(instances['species'], settings.opacity), None
+
+        biomes = settings.id_data.bn_biomes
+        if not biomes.rules:
+            return None
+
+        rule_index = min(biomes.active_rule_index, len(biomes.rules) - 1)
+        # Rules added since the last classification have no weights in the cached lookup yet
+        if settings.layer == 'DENSITY' and rule_index >= results['biome_lookup'].weights.shape[0]:
+            return None
+
+        heights = results['heightmap']
+        step = stride(heights.shape, settings.resolution)
+        terrain = settings.id_data.bn_heightmap
+        positions = grid_positions(heights, step, terrain.size, terrain.height_scale, settings.offset)
+        rows, columns = heights[::step, ::step].shape
+        if settings.layer == 'BIOMES':
+            colors = biome_colors(results['biomes'], step, biomes.palette(), settings.opacity)
+        else:
+            # Weights are looked up for sampled cells only
+            layers = (results[name][::step, ::step] for name in ('temperature', 'moisture', 'heightmap', 'slope'))
+            weights = biome_weights(*layers, lookup=results['biome_lookup'], biome=rule_index)
+            colors = density_colors(weights, 1, tuple(biomes.rules[rule_index].color), settings.opacity)
+        return 'TRIS', positions, colors, grid_indices(rows, columns)
+
+
+# Shared by all Scenes, only the Scene of the drawn viewport is read
+overlay_renderer = OverlayRenderer(biome_graph)
+
+
+@registration_tier(PACK_TIER)
+class OT_BiomeNodes_ToggleOverlay(bt.Operator):  # noqa: N801
+    """`OT_BiomeNodes_ToggleOverlay` Operator shows or hides the biome overlay of the Scene in 3D viewports.
+
+    Layers are drawn from results of the last evaluation of `biome_graph`, e.g. biomes are shown
+    once they are classified.
+    """
+
+    bl_description = 'Show or hide biome layers over the terrain in 3D viewports'
+
+    def execute(self: Self, context: bt.Context) -> set[str]:  # noqa: D102
+        settings = context.scene.bn_overlay
+        settings.enabled = not settings.enabled
+        if settings.enabled:
+            overlay_renderer.start()
+        return {'FINISHED'}
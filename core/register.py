@@ -1,31 +1,191 @@
 """Main registration point for builtin bpy Classes."""
-from ..util.core_utils import import_all_modules
-from .class_register.icon_reg import RegisterIcon
-from .class_register.operator_reg import RegisterOperators
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any
+
+import bpy.types as bt  # noqa: WPS301
+
+from ..util.core_utils import ClassIndex, get_cache_path
+from ..util.ledger import ledger
+from ..util.log import configure_logging
+from ..util.module_manifest import discover_modules
+from ..util.profiler import profiler
+from .class_register.hot_reload import HotReloader
+from .class_register.icon_reg import IconGroup, RegisterIcon
+from .class_register.operator_reg import OperatorNamingCache, RegisterOperators
 from .class_register.prop_reg import RegisterPropertyGroups
+from .class_register.tiers import TierRegistry
+
+# Registration profile of the add-on, 'batch' registers only what headless bakes need, see `reg`
+REGISTRATION_PROFILE_ENV = 'BIOME_NODES_REGISTRATION'
+FULL_PROFILE = 'full'
+BATCH_PROFILE = 'batch'
+
+base_classes = {
+    'Operator': bt.Operator,
+    'PropertyGroup': bt.PropertyGroup,
+    'IconGroup': IconGroup,
+}
 
-modules = import_all_modules()
+# Names of `Registration` fields that are read from this module, see `__getattr__`
+REGISTRATION_ATTRIBUTES = frozenset((
+    'modules',
+    'class_index',
+    'register_operators',
+    'register_pgroups',
+    'register_icons',
+    'tier_registry',
+    'hot_reloader',
+))
+
+
+@dataclass
+class Registration():
+    """`Registration` Class holds discovered modules and the register classes instances of the add-on.
+
+    Args:
+        modules (list[str]): Names of modules that contain registrable Classes.
+        class_index (ClassIndex): Classes of `modules` bucketed by base Class, shared by register classes.
+        register_operators (RegisterOperators): Register of Operators.
+        register_pgroups (RegisterPropertyGroups): Register of PropertyGroups.
+        register_icons (RegisterIcon): Register of icons.
+        tier_registry (TierRegistry): Registers Operators and PropertyGroups of not eager tiers on first use.
+        hot_reloader (HotReloader): Reloads changed modules while developing.
+    """
 
-# Initialise register classes instances
-register_operators = RegisterOperators(modules)
-register_pgroups = RegisterPropertyGroups(modules)
-register_icons = RegisterIcon(modules)
+    modules: list[str]
+    class_index: ClassIndex
+    register_operators: RegisterOperators
+    register_pgroups: RegisterPropertyGroups
+    register_icons: RegisterIcon
+    tier_registry: TierRegistry
+    hot_reloader: HotReloader
+
+
+_registration: Registration | None = None
+
+
+def build_registration() -> Registration:
+    """`build_registration` function discovers modules and creates register classes instances once.
+
+    Nothing is discovered or imported on import of the add-on, the work is done on `reg` or on first access
+    of a `REGISTRATION_ATTRIBUTES` attribute of this module.
+
+    Returns:
+        Registration: Registration of the add-on.
+    """
+    global _registration  # noqa: WPS420  # pylint: disable=global-statement
+    if _registration is not None:
+        return _registration
 
+    # Only modules that contain registrable Classes are imported, see `ModuleManifest`
+    with profiler.phase('module discovery'):
+        modules = discover_modules(base_classes)
 
-def reg() -> None:
+    # Classes of all modules are bucketed by base Class in one pass and shared by register classes
+    with profiler.phase('class index'):
+        class_index = ClassIndex(modules, base_classes.values())
+
+    register_operators = RegisterOperators(
+        modules,
+        class_index=class_index,
+        naming_cache=OperatorNamingCache(get_cache_path('operator_naming.json')),
+    )
+    register_pgroups = RegisterPropertyGroups(modules, class_index=class_index)
+    register_icons = RegisterIcon(modules, class_index)
+
+    # Operators and PropertyGroups of not eager tiers are registered on first use, see `registration_tier`
+    tier_registry = TierRegistry([register_operators, register_pgroups])
+
+    _registration = Registration(
+        modules=modules,
+        class_index=class_index,
+        register_operators=register_operators,
+        register_pgroups=register_pgroups,
+        register_icons=register_icons,
+        tier_registry=tier_registry,
+        # Reloads changed modules while developing, this module holds the registers and is never reloaded
+        hot_reloader=HotReloader(
+            class_index,
+            register_operators,
+            register_pgroups,
+            tier_registry,
+            excluded=(__name__,),
+        ),
+    )
+    return _registration
+
+
+def __getattr__(name: str) -> Any:
+    """Builds the registration on first access of its attributes(e.g. `register_operators`), see PEP 562."""
+    if name in REGISTRATION_ATTRIBUTES:
+        return getattr(build_registration(), name)
+    raise AttributeError('module {module!r} has no attribute {name!r}'.format(module=__name__, name=name))
+
+
+def registration_profile() -> str:
+    """`registration_profile` function returns the registration profile set in the environment.
+
+    Returns:
+        str: `BATCH_PROFILE` or `FULL_PROFILE`, the default.
+    """
+    profile = os.environ.get(REGISTRATION_PROFILE_ENV, FULL_PROFILE).lower()
+    return BATCH_PROFILE if profile == BATCH_PROFILE else FULL_PROFILE
+
+
+def reg(deferred: bool = True, profile: str | None = None) -> None:
     """1. Registers Operator Classes.
 
     2. Registers PropertyGroup Classes.
+
+    The batch profile(render farm bakes in `--background` mode) skips icons and pointer properties
+    of PropertyGroups, and logs warnings only instead of summaries of registered Classes.
+    Set `BIOME_NODES_LOG_FORMAT=json` to output log records as JSON Lines, see `configure_logging`.
+    Set `BIOME_NODES_PROFILE=1` to output timings of every registration phase, see `RegistrationProfiler`.
+    Set `BIOME_NODES_HOT_RELOAD=1` to reload changed modules while the add-on is enabled, see `HotReloader`.
+    Set `BIOME_NODES_TRACE_MEMORY=1` to report memory retained across enable/disable cycles, see `ResourceLedger`.
+
+    Args:
+        deferred (bool): If True - only eager tiers are registered, the rest is registered on first use \
+        or on the following event loop iterations, whichever comes first.
+        profile (str | None): `FULL_PROFILE` or `BATCH_PROFILE`, see `registration_profile` if not specified.
     """
-    register_icons.register()
-    register_operators.register()
-    register_pgroups.register()
+    configure_logging()
+    ledger.start_tracing()
+    registration = build_registration()
+    batch = (profile or registration_profile()) == BATCH_PROFILE
+    registration.register_pgroups.assign_pointers = not batch
+    for logger in (
+        registration.register_operators.logger,
+        registration.register_pgroups.logger,
+        registration.tier_registry.logger,
+    ):
+        logger.setLevel(logging.WARNING if batch else logging.NOTSET)
+
+    if not batch:
+        with profiler.phase('icons'):
+            registration.register_icons.register()
+    # Headless bakes have no event loop to register requested tiers on
+    if deferred and not batch:
+        registration.tier_registry.register_eager()
+        registration.tier_registry.request_pending()
+    else:
+        registration.tier_registry.register_all()
+    if registration.hot_reloader.enabled():
+        registration.hot_reloader.watch()
+    profiler.dump('Register')
 
 
 def unreg() -> None:
-    """1. Unregisters PropertyGroup Classes.
+    """Releases everything recorded in the `ledger` in reverse order of creation.
 
-    2. Unregisters Operator Classes.
+    That is draw handlers, timers, worker pools, preview collections, pointer properties,
+    PropertyGroup and Operator Classes.
     """
-    register_pgroups.unregister()
-    register_operators.unregister()
+    ledger.release()
+    # Nothing registered is left, registers only forget their state(e.g. live tiers)
+    if _registration is not None:
+        _registration.tier_registry.unregister()
+        _registration.register_icons.unregister()
+    profiler.dump('Unregister')
@@ -0,0 +1,134 @@
+"""Structure-of-arrays buffers of biome instances.
+
+Every field of instances is one contiguous NumPy array, so a million instances are a handful of
+allocations instead of a million Python objects, and every field can be handed to `foreach_set`
+as is: a C-contiguous array of the exact item type is read by Blender without conversion.
+"""
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+from typing_extensions import Self
+
+# Field name to item type and shape of one instance
+INSTANCE_FIELDS: dict[str, tuple[type[np.generic], tuple[int, ...]]] = {
+    'position': (np.float32, (3,)),
+    'rotation': (np.float32, (3,)),
+    'scale': (np.float32, (3,)),
+    'species': (np.int32, ()),
+}
+
+# Smallest capacity a growing buffer allocates
+MIN_CAPACITY = 1024
+
+
+class InstanceBuffer():
+    """`InstanceBuffer` Class stores instances as one array per field, growing in chunks.
+
+    Capacity grows geometrically, so appending chunks is amortized linear. Fields are returned as views
+    of the used part of the arrays, they stay valid until the buffer grows.
+
+    Args:
+        capacity (int): Number of instances to allocate up front.
+    """
+
+    def __init__(self: Self, capacity: int = 0) -> None:
+        self.count = 0
+        self.arrays: dict[str, npt.NDArray[Any]] = {
+            name: np.empty((capacity, *shape), dtype=dtype) for name, (dtype, shape) in INSTANCE_FIELDS.items()
+        }
+
+    def __len__(self: Self) -> int:
+        """Returns the number of instances."""
+        return self.count
+
+    def __getitem__(self: Self, name: str) -> npt.NDArray[Any]:
+        """Returns a view of a field of all instances."""
+        return self.arrays[name][:self.count]
+
+    @property
+    def capacity(self: Self) -> int:
+        """Number of instances the buffer holds without growing."""
+        return len(self.arrays['species'])
+
+    @property
+    def nbytes(self: Self) -> int:
+        """Memory held by the arrays of the buffer, used by `ResultCache`."""
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def reserve(self: Self, capacity: int) -> None:
+        """`reserve` function makes sure the buffer holds `capacity` instances without growing.
+
+        Args:
+            capacity (int): Number of instances.
+        """
+        if capacity <= self.capacity:
+            return
+
+        for name, array in self.arrays.items():
+            grown = np.empty((capacity, *array.shape[1:]), dtype=array.dtype)
+            grown[:self.count] = array[:self.count]
+            self.arrays[name] = grown
+
+    def append(self: Self, **chunk: npt.ArrayLike) -> None:
+        """`append` function adds a chunk of instances.
+
+        Args:
+            chunk (ArrayLike): Values of every field for the chunk, see `INSTANCE_FIELDS`, values with
+            fewer dimensions(e.g. one scale for all instances) are broadcast.
+
+        Raises:
+            ValueError: If fields are missing or unknown.
+        """
+        if set(chunk) != set(INSTANCE_FIELDS):
+            raise ValueError('Instance chunk fields {fields} differ from {expected}.'.format(
+                fields=sorted(chunk),
+                expected=sorted(INSTANCE_FIELDS),
+            ),
+            )
+
+        size = len(np.asarray(chunk['position']))
+        if self.count + size > self.capacity:
+            self.reserve(max(self.count + size, 2 * self.capacity, MIN_CAPACITY))
+
+        for name, values in chunk.items():
+            self.arrays[name][self.count:self.count + size] = values
+        self.count += size
+
+    def select(self: Self, selection: npt.NDArray[Any] | slice) -> 'InstanceBuffer':
+        """`select` function returns a buffer of a subset of instances.
+
+        Slices share memory with this buffer, masks and index arrays are gathered into a compact copy.
+
+        Args:
+            selection (NDArray | slice): Boolean mask, indices or a slice of instances.
+
+        Returns:
+            InstanceBuffer: Buffer of the selected instances.
+        """
+        selected = InstanceBuffer()
+        selected.arrays = {name: self[name][selection] for name in self.arrays}
+        selected.count = len(selected.arrays['species'])
+        return selected
+
+    def of_species(self: Self, species: int) -> 'InstanceBuffer':
+        """`of_species` function returns a buffer of instances of one species.
+
+        Args:
+            species (int): Index of the species.
+
+        Returns:
+            InstanceBuffer: Compact buffer of the instances.
+        """
+        return self.select(self['species'] == species)
+
+    def flat(self: Self, name: str) -> npt.NDArray[Any]:
+        """`flat` function returns a field as a flat contiguous array, the format `foreach_set` reads directly.
+
+        Args:
+            name (str): Name of the field.
+
+        Returns:
+            NDArray: One dimensional view of the field, a copy only if the field is not contiguous.
+        """
+        return np.ascontiguousarray(self[name]).reshape(-1)
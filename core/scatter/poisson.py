@@ -0,0 +1,519 @@
+"""Poisson-disk scatter of biome instances over a heightmap.
+
+Points of a species are kept in a `SpatialHash`, a grid of cells of size `radius / sqrt(2)`: a cell can hold
+at most one point, so the grid is a dense array and neighbour lookups are a fixed window of cells.
+Sampling follows Bridson's grid, but instead of growing an active list point by point, one candidate is
+thrown into every empty cell of a phase at once. Cells of a phase are 3 cells apart, so their candidates
+can never conflict with each other and a whole phase is tested and inserted with a few array operations.
+A `CoverageGrid` of subcells tracks where no point fits anymore, so candidates rarely miss and full cells
+drop out, which keeps the number of rounds small regardless of the number of points.
+"""
+import math
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+from typing_extensions import Self
+
+from ...util.rng import RandomStreams
+from ..terrain.heightmap import slope_angles
+from ..terrain.noise import FloatArray
+from .instances import InstanceBuffer
+
+# Cells of one phase are this many cells apart, `radius` spans 2 cells, so candidates of a phase never conflict
+PHASE_STRIDE = 3
+
+# Cells of a `SpatialHash` are split into this many subcells per axis to track covered area
+SUBDIVISIONS = 3
+
+
+@dataclass(frozen=True)
+class Species():  # pylint: disable=too-many-instance-attributes
+    """`Species` Class describes placement rules of one kind of instances(e.g. trees, rocks, grass).
+
+    Args:
+        name (str): Name of the species.
+        radius (float): Minimum distance between instances of the species.
+        exclusion (float): Minimum distance to instances of previous species, the larger exclusion \
+        of both species is used.
+        density (float): Share of the densest packing that is kept, in [0, 1].
+        min_altitude (float): Lowest normalized height instances are placed at.
+        max_altitude (float): Highest normalized height instances are placed at.
+        max_slope (float): Steepest slope instances are placed on, in radians.
+        min_scale (float): Smallest random uniform scale of instances.
+        max_scale (float): Largest random uniform scale of instances.
+    """
+
+    name: str
+    radius: float
+    exclusion: float = 0
+    density: float = 1
+    min_altitude: float = 0
+    max_altitude: float = 1
+    max_slope: float = math.pi / 2
+    min_scale: float = 1
+    max_scale: float = 1
+
+
+@dataclass(frozen=True)
+class ScatterParameters():
+    """`ScatterParameters` Class stores everything a scatter depends on.
+
+    Args:
+        size (float): Width and depth of the terrain the heightmap is stretched over.
+        height_scale (float): Height of the terrain at normalized height 1.
+        seed (int): Seed of the scatter, every species gets its own stream.
+        attempts (int): Failed candidates after which a subcell is given up, at most 255.
+        species (tuple[Species, ...]): Species in order of priority, earlier species exclude later ones.
+    """
+
+    size: float = 100
+    height_scale: float = 10
+    seed: int = 0
+    attempts: int = 3
+    species: tuple[Species, ...] = ()
+
+
+class SpatialHash():
+    """`SpatialHash` Class is a dense grid of points with a minimum distance between them.
+
+    Cells are `radius / sqrt(2)` wide, so a cell holds at most one point and all points closer than
+    `radius` to a location are found in the 5x5 cells around it. Coordinates are stored in flat arrays
+    indexed by `row * columns + column`, NaN for empty cells.
+
+    Args:
+        size (float): Width and depth of the covered square.
+        radius (float): Minimum distance between points.
+    """
+
+    def __init__(self: Self, size: float, radius: float) -> None:
+        self.size = size
+        self.radius = radius
+        self.cell_size = radius / math.sqrt(2)
+        self.columns = max(1, math.ceil(size / self.cell_size))
+        self.x_cells = np.full(self.columns * self.columns, np.nan)
+        self.y_cells = np.full(self.columns * self.columns, np.nan)
+
+    def cell_of(self: Self, coords: npt.NDArray[np.float64]) -> npt.NDArray[np.int64]:
+        """`cell_of` function returns cell indices of coordinates along one axis.
+
+        Args:
+            coords (NDArray[float64]): Coordinates in [0, size].
+
+        Returns:
+            NDArray[int64]: Indices of cells.
+        """
+        return np.clip((coords / self.cell_size).astype(np.int64), 0, self.columns - 1)
+
+    def insert(self: Self, x: npt.NDArray[np.float64], y: npt.NDArray[np.float64]) -> None:  # noqa: WPS111
+        """`insert` function stores points, callers guarantee they are `radius` apart.
+
+        Args:
+            x (NDArray[float64]): X coordinates.
+            y (NDArray[float64]): Y coordinates.
+        """
+        cells = self.cell_of(y) * self.columns + self.cell_of(x)
+        self.x_cells[cells] = x
+        self.y_cells[cells] = y
+
+    def points(self: Self) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.int64]]:
+        """`points` function returns all stored points with their cells.
+
+        Returns:
+            tuple[NDArray[float64], NDArray[int64]]: Points shaped `(count, 2)` and flat indices of their cells.
+        """
+        cells = np.flatnonzero(~np.isnan(self.x_cells))
+        return np.column_stack((self.x_cells[cells], self.y_cells[cells])), cells
+
+    def remove(self: Self, cells: npt.NDArray[np.int64]) -> None:
+        """`remove` function empties cells.
+
+        Args:
+            cells (NDArray[int64]): Flat indices of cells, see `points`.
+        """
+        self.x_cells[cells] = np.nan
+        self.y_cells[cells] = np.nan
+
+    def neighbours(
+        self: Self,
+        x: npt.NDArray[np.float64],  # noqa: WPS111
+        y: npt.NDArray[np.float64],  # noqa: WPS111
+        reach: float,
+    ) -> Iterator[tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]]:
+        """`neighbours` function yields coordinates of cells that can hold points within `reach` of locations.
+
+        One pair of arrays is yielded per cell offset, lookups past the border repeat border cells,
+        which only yields some stored points twice.
+
+        Args:
+            x (NDArray[float64]): X coordinates.
+            y (NDArray[float64]): Y coordinates.
+            reach (float): Query distance.
+
+        Yields:
+            tuple[NDArray[float64], NDArray[float64]]: X and Y coordinates of neighbours, NaN for empty cells.
+        """
+        cell_reach = math.ceil(reach / self.cell_size)
+        rows = self.cell_of(y)
+        columns = self.cell_of(x)
+        row_starts = {
+            offset: np.clip(rows + offset, 0, self.columns - 1) * self.columns
+            for offset in range(-cell_reach, cell_reach + 1)
+        }
+        shifted_columns = {
+            offset: np.clip(columns + offset, 0, self.columns - 1)
+            for offset in range(-cell_reach, cell_reach + 1)
+        }
+        for row_offset, row_start in row_starts.items():
+            for column_offset, column in shifted_columns.items():
+                # Closest distance between points of the two cells
+                gap = math.hypot(max(abs(row_offset) - 1, 0), max(abs(column_offset) - 1, 0)) * self.cell_size
+                if gap < reach:
+                    cells = row_start + column
+                    yield self.x_cells[cells], self.y_cells[cells]
+
+    def conflicts(
+        self: Self,
+        x: npt.NDArray[np.float64],  # noqa: WPS111
+        y: npt.NDArray[np.float64],  # noqa: WPS111
+        radius: float,
+    ) -> npt.NDArray[np.bool_]:
+        """`conflicts` function tests locations for stored points closer than `radius`.
+
+        Args:
+            x (NDArray[float64]): X coordinates.
+            y (NDArray[float64]): Y coordinates.
+            radius (float): Query distance.
+
+        Returns:
+            NDArray[bool]: True for locations with a stored point closer than `radius`.
+        """
+        squared_radius = radius * radius
+        conflict = np.zeros(x.shape, dtype=bool)
+        for x_neighbours, y_neighbours in self.neighbours(x, y, radius):
+            # NaN of empty cells never compares true
+            conflict |= (x_neighbours - x) ** 2 + (y_neighbours - y) ** 2 < squared_radius
+        return conflict
+
+
+def sample_grid(
+    grid: npt.NDArray[Any],
+    x: npt.NDArray[np.float64],  # noqa: WPS111
+    y: npt.NDArray[np.float64],  # noqa: WPS111
+    size: float,
+) -> npt.NDArray[Any]:
+    """`sample_grid` function looks up values of a grid stretched over the terrain, nearest cell.
+
+    Args:
+        grid (NDArray): Grid shaped `(rows, columns)`, row 0 at y = 0.
+        x (NDArray[float64]): X coordinates in [0, size].
+        y (NDArray[float64]): Y coordinates in [0, size].
+        size (float): Width and depth of the terrain.
+
+    Returns:
+        NDArray: Values at the coordinates.
+    """
+    rows, columns = grid.shape
+    row = np.clip(np.rint(y / size * (rows - 1)).astype(np.int64), 0, rows - 1)
+    column = np.clip(np.rint(x / size * (columns - 1)).astype(np.int64), 0, columns - 1)
+    return grid[row, column]
+
+
+def interpolate_grid(
+    grid: FloatArray,
+    x: npt.NDArray[np.float64],  # noqa: WPS111
+    y: npt.NDArray[np.float64],  # noqa: WPS111
+    size: float,
+) -> FloatArray:
+    """`interpolate_grid` function looks up values of a grid stretched over the terrain, bilinear.
+
+    Args:
+        grid (NDArray[float32]): Grid shaped `(rows, columns)`, row 0 at y = 0.
+        x (NDArray[float64]): X coordinates in [0, size].
+        y (NDArray[float64]): Y coordinates in [0, size].
+        size (float): Width and depth of the terrain.
+
+    Returns:
+        NDArray[float32]: Values at the coordinates.
+    """
+    rows, columns = grid.shape
+    row_coords = np.clip(y / size * (rows - 1), 0, rows - 1)
+    column_coords = np.clip(x / size * (columns - 1), 0, columns - 1)
+    row = np.minimum(row_coords.astype(np.int64), max(rows - 2, 0))
+    column = np.minimum(column_coords.astype(np.int64), max(columns - 2, 0))
+    row_next = np.minimum(row + 1, rows - 1)
+    column_next = np.minimum(column + 1, columns - 1)
+    row_weight = (row_coords - row).astype(np.float32)
+    column_weight = (column_coords - column).astype(np.float32)
+
+    lower = grid[row, column] + column_weight * (grid[row, column_next] - grid[row, column])
+    upper = grid[row_next, column] + column_weight * (grid[row_next, column_next] - grid[row_next, column])
+    return lower + row_weight * (upper - lower)
+
+
+def slope_map(heights: FloatArray, parameters: ScatterParameters) -> FloatArray:
+    """`slope_map` function returns the slope angle of every cell of a heightmap.
+
+    Args:
+        heights (NDArray[float32]): Normalized heightmap.
+        parameters (ScatterParameters): Parameters of the scatter, for the terrain size and height.
+
+    Returns:
+        NDArray[float32]: Slopes in radians.
+    """
+    return slope_angles(heights, parameters.size, parameters.height_scale)
+
+
+class CoverageGrid():
+    """`CoverageGrid` Class tracks subcells of a `SpatialHash` no new point can be placed in.
+
+    A subcell is covered if it lies entirely within the exclusion distance of a single point, or if
+    the species may not be placed at its center. Candidates are only thrown into uncovered subcells,
+    so success rates stay high until the terrain is full, and cells without uncovered subcells are dropped.
+
+    Args:
+        spatial_hash (SpatialHash): Hash of the sampled species.
+        allowed (NDArray[bool]): Grid of heightmap cells the species may be placed on.
+    """
+
+    def __init__(self: Self, spatial_hash: SpatialHash, allowed: npt.NDArray[np.bool_]) -> None:
+        self.spatial_hash = spatial_hash
+        self.extent = spatial_hash.cell_size / SUBDIVISIONS
+        self.columns = spatial_hash.columns * SUBDIVISIONS
+
+        # Nearest lookups are separable, so the mask is sampled along rows and columns only
+        centers = (np.arange(self.columns) + 0.5) * self.extent
+        rows, columns = allowed.shape
+        size = spatial_hash.size
+        mask_rows = np.clip(np.rint(centers / size * (rows - 1)).astype(np.int64), 0, rows - 1)
+        mask_columns = np.clip(np.rint(centers / size * (columns - 1)).astype(np.int64), 0, columns - 1)
+        outside = centers - self.extent / 2 >= size
+        self.covered = ~allowed[mask_rows[:, None], mask_columns[None, :]]
+        self.covered[outside, :] = True
+        self.covered[:, outside] = True
+        self.covered = self.covered.ravel()
+        self.failures = np.zeros(self.covered.size, dtype=np.uint8)
+
+        # Subcells of a cell in flat order, relative to the first subcell of the cell
+        steps = np.arange(SUBDIVISIONS)
+        self.cell_subcells = (steps[:, None] * self.columns + steps[None, :]).ravel()
+
+    def stamp(
+        self: Self,
+        x: npt.NDArray[np.float64],  # noqa: WPS111
+        y: npt.NDArray[np.float64],  # noqa: WPS111
+        distance: float,
+    ) -> None:
+        """`stamp` function covers subcells that lie entirely within `distance` of points.
+
+        Args:
+            x (NDArray[float64]): X coordinates of points.
+            y (NDArray[float64]): Y coordinates of points.
+            distance (float): Exclusion distance of points.
+        """
+        rows = (y / self.extent).astype(np.int64)
+        columns = (x / self.extent).astype(np.int64)
+        # Distances from points to the sides of their own subcell
+        left = x - columns * self.extent
+        right = self.extent - left
+        bottom = y - rows * self.extent
+        top = self.extent - bottom
+        squared_distance = distance * distance
+        reach = math.ceil(distance / self.extent)
+        for row_offset in range(-reach, reach + 1):
+            for column_offset in range(-reach, reach + 1):
+                # Farthest corner of the other subcell is at least this far
+                if math.hypot(abs(row_offset), abs(column_offset)) * self.extent >= distance:
+                    continue
+                shifted_rows = rows + row_offset
+                shifted_columns = columns + column_offset
+                x_corner = _far_side(left, right, column_offset * self.extent)
+                y_corner = _far_side(bottom, top, row_offset * self.extent)
+                inside = (
+                    (x_corner ** 2 + y_corner ** 2 < squared_distance)
+                    & (shifted_rows >= 0) & (shifted_rows < self.columns)
+                    & (shifted_columns >= 0) & (shifted_columns < self.columns)
+                )
+                self.covered[shifted_rows[inside] * self.columns + shifted_columns[inside]] = True
+
+    def candidates(
+        self: Self,
+        cells: npt.NDArray[np.int64],
+        rng: np.random.Generator,
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64], npt.NDArray[np.int64], npt.NDArray[np.bool_]]:
+        """`candidates` function throws one candidate into a random uncovered subcell of every cell.
+
+        Args:
+            cells (NDArray[int64]): Flat indices of cells of the `SpatialHash`.
+            rng (Generator): Random generator.
+
+        Returns:
+            tuple[NDArray[float64], NDArray[float64], NDArray[int64], NDArray[bool]]: X and Y coordinates \
+            of candidates, their subcells and False for cells without uncovered subcells, whose candidates \
+            are meaningless.
+        """
+        rows, columns = np.divmod(cells, self.spatial_hash.columns)
+        first_subcells = rows * SUBDIVISIONS * self.columns + columns * SUBDIVISIONS
+        subcells = first_subcells[:, None] + self.cell_subcells[None, :]
+
+        # Random priorities of uncovered subcells, the highest one is picked
+        priorities = rng.random(subcells.shape)
+        priorities[self.covered[subcells]] = -1
+        picked = priorities.argmax(axis=1)
+        alive = priorities[np.arange(len(cells)), picked] >= 0
+
+        picked_subcells = subcells[np.arange(len(cells)), picked]
+        subcell_rows, subcell_columns = np.divmod(picked_subcells, self.columns)
+        x = (subcell_columns + rng.random(len(cells))) * self.extent  # noqa: WPS111
+        y = (subcell_rows + rng.random(len(cells))) * self.extent  # noqa: WPS111
+        return x, y, picked_subcells, alive
+
+    def reject(self: Self, subcells: npt.NDArray[np.int64], attempts: int) -> None:
+        """`reject` function counts failed candidates, subcells are covered after `attempts` failures.
+
+        Slivers left between disks are smaller than subcells, so they are given up after a few misses
+        instead of keeping their cells alive forever.
+
+        Args:
+            subcells (NDArray[int64]): Subcells of failed candidates, at most one candidate per subcell.
+            attempts (int): Failed candidates after which a subcell is given up.
+        """
+        self.failures[subcells] += 1
+        self.covered[subcells[self.failures[subcells] >= attempts]] = True
+
+
+def _far_side(
+    lower: npt.NDArray[np.float64],
+    upper: npt.NDArray[np.float64],
+    shift: float,
+) -> npt.NDArray[np.float64]:
+    # Distance from points to the far side of the subcell `shift` away along one axis
+    if shift > 0:
+        return upper + shift
+    if shift < 0:
+        return lower - shift
+    return np.maximum(lower, upper)
+
+
+def sample_species(  # noqa: WPS210, WPS211
+    species: Species,
+    allowed: npt.NDArray[np.bool_],
+    exclusions: list[tuple[SpatialHash, float]],
+    parameters: ScatterParameters,
+    rng: np.random.Generator,
+) -> SpatialHash:
+    """`sample_species` function fills the terrain with points of one species, at least `radius` apart.
+
+    Args:
+        species (Species): Species to sample.
+        allowed (NDArray[bool]): Grid of heightmap cells the species may be placed on.
+        exclusions (list[tuple[SpatialHash, float]]): Points of previous species with distances to keep.
+        parameters (ScatterParameters): Parameters of the scatter.
+        rng (Generator): Random generator of the species.
+
+    Returns:
+        SpatialHash: Hash of sampled points, before density thinning.
+    """
+    spatial_hash = SpatialHash(parameters.size, species.radius)
+    coverage = CoverageGrid(spatial_hash, allowed)
+    for other_hash, distance in exclusions:
+        other_points, _ = other_hash.points()
+        coverage.stamp(other_points[:, 0], other_points[:, 1], distance)
+
+    columns = np.arange(spatial_hash.columns)
+    phases = [
+        (columns[row::PHASE_STRIDE, None] * spatial_hash.columns + columns[None, column::PHASE_STRIDE]).ravel()
+        for row in range(PHASE_STRIDE)
+        for column in range(PHASE_STRIDE)
+    ]
+
+    # Every round either fills a cell or counts a failure of one of its subcells, so rounds are bounded
+    while any(cells.size for cells in phases):
+        for phase_index in rng.permutation(len(phases)):
+            cells = phases[phase_index]
+            if not cells.size:
+                continue
+
+            x, y, subcells, alive = coverage.candidates(cells, rng)  # noqa: WPS111
+            # Subcells are masked at their centers, candidates near their borders may fall onto other heightmap cells
+            # or, in subcells straddling the far edges, off the terrain
+            inside = (x < parameters.size) & (y < parameters.size)
+            accepted = alive & inside & sample_grid(allowed, x, y, parameters.size)
+            accepted &= ~spatial_hash.conflicts(x, y, species.radius)
+            for other_hash, distance in exclusions:
+                accepted &= ~other_hash.conflicts(x, y, distance)
+
+            spatial_hash.insert(x[accepted], y[accepted])
+            coverage.stamp(x[accepted], y[accepted], species.radius)
+            rejected = alive & ~accepted
+            coverage.reject(subcells[rejected], min(parameters.attempts, 255))
+            phases[phase_index] = cells[rejected]
+
+    return spatial_hash
+
+
+def scatter(  # noqa: WPS210
+    heights: FloatArray,
+    parameters: ScatterParameters,
+    density_maps: dict[str, FloatArray] | None = None,
+) -> InstanceBuffer:
+    """`scatter` function places instances of all species over a heightmap.
+
+    Species are sampled in order, every species avoids instances of previous ones. The densest packing
+    of a species is thinned to its density, multiplied by its density map if there is one, so thinning
+    never breaks minimum distances.
+
+    Args:
+        heights (NDArray[float32]): Normalized heightmap, row 0 at y = 0.
+        parameters (ScatterParameters): Parameters of the scatter.
+        density_maps (dict[str, NDArray[float32]] | None): Grids of densities in [0, 1] by species name.
+
+    Returns:
+        InstanceBuffer: Instances of all species.
+    """
+    if density_maps is None:
+        density_maps = {}
+
+    slopes = slope_map(heights, parameters)
+    placed: list[tuple[Species, SpatialHash]] = []
+    instances = InstanceBuffer()
+
+    for index, species in enumerate(parameters.species):
+        # Every species and purpose has its own stream, so e.g. changing a density never moves other instances
+        streams = RandomStreams(parameters.seed).child('scatter', index)
+        allowed = (heights >= species.min_altitude) & (heights <= species.max_altitude)
+        allowed &= slopes <= species.max_slope
+        exclusions = [
+            (other_hash, max(species.exclusion, other.exclusion))
+            for other, other_hash in placed
+            if max(species.exclusion, other.exclusion) > 0
+        ]
+        spatial_hash = sample_species(species, allowed, exclusions, parameters, streams.generator('sample'))
+
+        # Attributes are drawn for the densest packing before thinning, so survivors keep theirs
+        points, cells = spatial_hash.points()
+        yaw = streams.generator('rotation').random(len(points)) * 2 * np.pi
+        scale = streams.generator('scale').uniform(species.min_scale, species.max_scale, len(points))
+        density = np.full(len(points), species.density, dtype=np.float32)
+        density_map = density_maps.get(species.name)
+        if density_map is not None:
+            density *= sample_grid(density_map, points[:, 0], points[:, 1], parameters.size)
+        kept = streams.generator('density').random(len(points)) < density
+        spatial_hash.remove(cells[~kept])
+        points = points[kept]
+
+        placed.append((species, spatial_hash))
+        instances.append(
+            position=np.column_stack((
+                points,
+                interpolate_grid(heights, points[:, 0], points[:, 1], parameters.size) * parameters.height_scale,
+            )),
+            # Random rotation around the up axis
+            rotation=np.column_stack((np.zeros((len(points), 2)), yaw[kept])),
+            scale=scale[kept, None],
+            species=index,
+        )
+
+    return instances
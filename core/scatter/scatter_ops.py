@@ -0,0 +1,203 @@
+"""Operators and settings of the scatter engine."""
+import logging
+import math
+
+import bpy
+import bpy.props as bp  # noqa: WPS301
+import bpy.types as bt  # noqa: WPS301
+from typing_extensions import Self
+
+from ..class_register.decorators import register_property_group, registration_tier
+from ..graph.biome_graph import biome_graph
+from ..jobs.job_ops import run_job
+from ..jobs.runner import Job
+from .instances import InstanceBuffer
+from .poisson import ScatterParameters, Species
+
+PACK_TIER = 'nodes.scatter'
+
+# Instance fields stored as point attributes, with attribute types and `foreach_set` keys
+INSTANCE_ATTRIBUTES = {
+    'rotation': ('FLOAT_VECTOR', 'vector'),
+    'scale': ('FLOAT_VECTOR', 'vector'),
+    'species': ('INT', 'value'),
+}
+
+logger = logging.getLogger(__name__)
+
+
+class PG_ScatterSpecies(bt.PropertyGroup):  # noqa: N801
+    """Placement rules of one species, an item of `PG_Scatter.species`."""
+
+    name: bp.StringProperty(name='Name', default='Species')
+    radius: bp.FloatProperty(name='Radius', default=1, min=0.01, subtype='DISTANCE')
+    exclusion: bp.FloatProperty(
+        name='Exclusion',
+        description='Minimum distance to instances of species above this one',
+        default=0,
+        min=0,
+        subtype='DISTANCE',
+    )
+    density: bp.FloatProperty(name='Density', default=1, min=0, max=1, subtype='FACTOR')
+    min_altitude: bp.FloatProperty(name='Min Altitude', default=0, min=0, max=1, subtype='FACTOR')
+    max_altitude: bp.FloatProperty(name='Max Altitude', default=1, min=0, max=1, subtype='FACTOR')
+    max_slope: bp.FloatProperty(name='Max Slope', default=math.pi / 2, min=0, max=math.pi / 2, subtype='ANGLE')
+    min_scale: bp.FloatProperty(name='Min Scale', default=1, min=0)
+    max_scale: bp.FloatProperty(name='Max Scale', default=1, min=0)
+
+    def species(self: Self) -> Species:
+        """`species` function returns engine rules of the settings.
+
+        Returns:
+            Species: Placement rules of the species.
+        """
+        return Species(
+            name=self.name,
+            radius=self.radius,
+            exclusion=self.exclusion,
+            density=self.density,
+            min_altitude=self.min_altitude,
+            max_altitude=self.max_altitude,
+            max_slope=self.max_slope,
+            min_scale=self.min_scale,
+            max_scale=self.max_scale,
+        )
+
+
+@register_property_group(bt.Scene, 'bn_scatter')
+class PG_Scatter(bt.PropertyGroup):  # noqa: N801
+    """Settings of the scatter engine, stored per Scene."""
+
+    object_name: bp.StringProperty(name='Object', default='BN Scatter')
+    seed: bp.IntProperty(
+        name='Seed',
+        description='Selects the random stream of the scatter below the Scene global seed',
+        default=0,
+        min=0,
+    )
+    attempts: bp.IntProperty(
+        name='Attempts',
+        description='Failed candidates after which a part of the terrain is considered full',
+        default=3,
+        min=1,
+        max=255,
+    )
+    species: bp.CollectionProperty(type=PG_ScatterSpecies)
+    active_species_index: bp.IntProperty(name='Active Species', default=0, min=0)
+
+    def parameters(self: Self) -> ScatterParameters:
+        """`parameters` function returns engine parameters of the settings.
+
+        Returns:
+            ScatterParameters: Parameters of the scatter.
+        """
+        terrain = self.id_data.bn_heightmap
+        return ScatterParameters(
+            size=terrain.size,
+            height_scale=terrain.height_scale,
+            seed=self.id_data.bn_random.derive_seed('scatter', self.seed),
+            attempts=self.attempts,
+            species=tuple(species.species() for species in self.species),
+        )
+
+
+def write_instances(name: str, instances: InstanceBuffer) -> bt.Object:
+    """`write_instances` function stores instances as points of a mesh Object, ready for instancing.
+
+    Every field is written with one bulk `foreach_set` call, positions as vertex coordinates and the rest
+    as point attributes of the same names, instead of creating an Object per instance.
+
+    Args:
+        name (str): Name of the Object and its mesh, an existing mesh is cleared and reused.
+        instances (InstanceBuffer): Instances to store.
+
+    Returns:
+        Object: Object with one vertex per instance.
+    """
+    mesh = bpy.data.meshes.get(name)
+    if mesh is None:
+        mesh = bpy.data.meshes.new(name)
+    else:
+        mesh.clear_geometry()
+
+    mesh.vertices.add(len(instances))
+    mesh.vertices.foreach_set('co', instances.flat('position'))
+    for field, (attribute_type, attribute_key) in INSTANCE_ATTRIBUTES.items():
+        attribute = mesh.attributes.new(field, attribute_type, 'POINT')
+        attribute.data.foreach_set(attribute_key, instances.flat(field))
+    mesh.update()
+
+    obj = bpy.data.objects.get(name)
+    if obj is None:
+        obj = bpy.data.objects.new(name, mesh)
+        bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+@registration_tier(PACK_TIER)
+class OT_BiomeNodes_Scatter(bt.Operator):  # noqa: N801
+    """`OT_BiomeNodes_Scatter` Operator scatters instances of the Scene species over the heightmap.
+
+    The scatter is the 'scatter' node of `biome_graph`, downstream of the 'heightmap' node,
+    so changing only scatter settings does not regenerate the heightmap. It runs as a background job by default.
+    """
+
+    bl_description = 'Scatter instances of the Scene species over the heightmap'
+
+    background: bp.BoolProperty(
+        name='Background',
+        description='Scatter as a background job, without blocking the UI',
+        default=True,
+    )
+
+    def execute(self: Self, context: bt.Context) -> set[str]:  # noqa: D102
+        settings = context.scene.bn_scatter
+        if not settings.species:
+            self.report({'WARNING'}, 'No species to scatter.')
+            return {'CANCELLED'}
+
+        heightmap_parameters = context.scene.bn_heightmap.parameters()
+        scatter_parameters = settings.parameters()
+        object_name = settings.object_name
+
+        def evaluate(job: Job) -> InstanceBuffer:
+            with biome_graph.lock:
+                biome_graph.set_parameters('heightmap', parameters=heightmap_parameters)
+                biome_graph.set_parameters('scatter', parameters=scatter_parameters)
+                return biome_graph.evaluate('scatter', job.cancelled, job.report)
+
+        def done(instances: InstanceBuffer) -> None:
+            write_instances(object_name, instances)
+            logger.info('Scattered %d instances.', len(instances))
+
+        run_job(Job('Scatter', evaluate, on_done=done), self.background)
+        return {'FINISHED'}
+
+
+@registration_tier(PACK_TIER)
+class OT_BiomeNodes_AddScatterSpecies(bt.Operator):  # noqa: N801
+    """`OT_BiomeNodes_AddScatterSpecies` Operator adds a species to the Scene scatter settings."""
+
+    bl_description = 'Add a species to the scatter settings'
+
+    def execute(self: Self, context: bt.Context) -> set[str]:  # noqa: D102
+        settings = context.scene.bn_scatter
+        settings.species.add()
+        settings.active_species_index = len(settings.species) - 1
+        return {'FINISHED'}
+
+
+@registration_tier(PACK_TIER)
+class OT_BiomeNodes_RemoveScatterSpecies(bt.Operator):  # noqa: N801
+    """`OT_BiomeNodes_RemoveScatterSpecies` Operator removes the active species from the Scene scatter settings."""
+
+    bl_description = 'Remove the active species from the scatter settings'
+
+    def execute(self: Self, context: bt.Context) -> set[str]:  # noqa: D102
+        settings = context.scene.bn_scatter
+        if not settings.species:
+            return {'CANCELLED'}
+
+        settings.species.remove(settings.active_species_index)
+        settings.active_species_index = max(0, min(settings.active_species_index, len(settings.species) - 1))
+        return {'FINISHED'}
@@ -0,0 +1,261 @@
+"""Heightmap engine: fractal noise, domain warping and erosion filters over `float32` grids.
+
+Noise is evaluated tile by tile, so temporaries are bounded by the tile size and not by the
+resolution of the heightmap. Filters that need neighbours(erosion, blur) run over the whole grid.
+"""
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from .noise import FloatArray, NoiseFunction, fbm, perlin, permutation, ridged, simplex
+
+BASIS_FUNCTIONS: dict[str, NoiseFunction] = {
+    'PERLIN': perlin,
+    'SIMPLEX': simplex,
+}
+
+# Domain warp offsets, so warp fields of X and Y are not correlated with each other and with the base
+WARP_OFFSETS = ((np.float32(5.2), np.float32(1.3)), (np.float32(-3.7), np.float32(9.2)))
+
+
+@dataclass(frozen=True)
+class HeightmapParameters():  # pylint: disable=too-many-instance-attributes
+    """`HeightmapParameters` Class stores everything a heightmap depends on.
+
+    Args:
+        resolution (int): Width and height of the heightmap in cells.
+        seed (int): Seed of the noise.
+        basis (str): Basis noise, one of `BASIS_FUNCTIONS`.
+        fractal (str): 'FBM' or 'RIDGED'.
+        scale (float): Number of base noise features across the heightmap.
+        octaves (int): Number of octaves.
+        lacunarity (float): Frequency multiplier between octaves.
+        gain (float): Amplitude multiplier between octaves.
+        warp_strength (float): Domain warp displacement in base noise features, 0 disables warping.
+        warp_scale (float): Frequency of the warp field relative to the base noise.
+        exponent (float): Height redistribution exponent, higher values flatten valleys.
+        erosion_iterations (int): Iterations of thermal erosion, 0 disables erosion.
+        talus (float): Height difference between neighbouring cells above which material slides.
+        erosion_rate (float): Share of the excess height moved per iteration, at most 0.25.
+        blur_radius (int): Radius of the final box blur in cells, 0 disables blur.
+        tile_size (int): Width and height of tiles noise is evaluated in.
+    """
+
+    resolution: int = 1024
+    seed: int = 0
+    basis: str = 'PERLIN'
+    fractal: str = 'FBM'
+    scale: float = 4
+    octaves: int = 6
+    lacunarity: float = 2
+    gain: float = 0.5
+    warp_strength: float = 0
+    warp_scale: float = 1
+    exponent: float = 1
+    erosion_iterations: int = 0
+    talus: float = 0.004
+    erosion_rate: float = 0.25
+    blur_radius: int = 0
+    tile_size: int = 512
+
+
+def evaluate_tile(  # noqa: WPS210
+    parameters: HeightmapParameters,
+    x_start: int,
+    y_start: int,
+    width: int,
+    height: int,
+) -> FloatArray:
+    """`evaluate_tile` function evaluates noise of a region of the heightmap, without filters.
+
+    Args:
+        parameters (HeightmapParameters): Parameters of the heightmap.
+        x_start (int): First column of the region, may be outside of the heightmap.
+        y_start (int): First row of the region, may be outside of the heightmap.
+        width (int): Number of columns.
+        height (int): Number of rows.
+
+    Returns:
+        NDArray[float32]: Heights of the region in [0, 1], shaped `(height, width)`.
+    """
+    perm = permutation(parameters.seed)
+    basis = BASIS_FUNCTIONS[parameters.basis]
+    fractal = ridged if parameters.fractal == 'RIDGED' else fbm
+    cell_size = np.float32(parameters.scale / parameters.resolution)
+
+    # Broadcasting a row against a column evaluates the grid without building coordinate grids
+    x_coords = (np.arange(x_start, x_start + width, dtype=np.float32) * cell_size)[None, :]
+    y_coords = (np.arange(y_start, y_start + height, dtype=np.float32) * cell_size)[:, None]
+
+    if parameters.warp_strength:
+        warp_scale = np.float32(parameters.warp_scale)
+        strength = np.float32(parameters.warp_strength)
+        (x_warp_x, x_warp_y), (y_warp_x, y_warp_y) = WARP_OFFSETS
+        x_warped = x_coords + strength * fbm(
+            basis, x_coords * warp_scale + x_warp_x, y_coords * warp_scale + x_warp_y, perm, octaves=3,
+        )
+        y_warped = y_coords + strength * fbm(
+            basis, x_coords * warp_scale + y_warp_x, y_coords * warp_scale + y_warp_y, perm, octaves=3,
+        )
+        x_coords, y_coords = x_warped, y_warped
+
+    heights = fractal(
+        basis,
+        x_coords,
+        y_coords,
+        perm,
+        octaves=parameters.octaves,
+        lacunarity=parameters.lacunarity,
+        gain=parameters.gain,
+    )
+    heights = np.broadcast_to(heights, (height, width))
+
+    # Fixed mapping instead of min/max normalisation, so tiles agree with each other
+    heights = np.clip(heights * np.float32(0.5) + np.float32(0.5), 0, 1).astype(np.float32)
+    if parameters.exponent != 1:
+        np.power(heights, np.float32(parameters.exponent), out=heights)
+    return heights
+
+
+def thermal_erosion(heights: FloatArray, iterations: int, talus: float, rate: float = 0.25) -> None:
+    """`thermal_erosion` function lets material slide down slopes steeper than `talus`, in place.
+
+    Flux between every pair of neighbouring cells is antisymmetric, so material is conserved.
+
+    Args:
+        heights (NDArray[float32]): Heightmap to erode.
+        iterations (int): Number of iterations.
+        talus (float): Height difference between neighbouring cells above which material slides.
+        rate (float): Share of the excess height moved per iteration, clamped to 0.25 for stability.
+    """
+    rate32 = np.float32(min(rate, 0.25))
+    talus32 = np.float32(talus)
+    flux = np.empty_like(heights)
+    delta = np.empty_like(heights)
+
+    for _ in range(iterations):
+        delta.fill(0)
+        # Horizontal and vertical neighbour pairs, each pair exchanges material once
+        for axis in (0, 1):
+            lead = [slice(None), slice(None)]
+            trail = [slice(None), slice(None)]
+            lead[axis] = slice(1, None)
+            trail[axis] = slice(None, -1)
+            pair_flux = flux[tuple(trail)]
+
+            np.subtract(heights[tuple(trail)], heights[tuple(lead)], out=pair_flux)
+            excess = np.maximum(np.abs(pair_flux) - talus32, 0)
+            np.copysign(excess, pair_flux, out=pair_flux)
+            pair_flux *= rate32
+
+            delta[tuple(trail)] -= pair_flux
+            delta[tuple(lead)] += pair_flux
+        heights += delta
+
+
+def box_blur(heights: FloatArray, radius: int) -> FloatArray:
+    """`box_blur` function blurs a heightmap with a separable box filter of cumulative sums.
+
+    Args:
+        heights (NDArray[float32]): Heightmap to blur.
+        radius (int): Radius of the filter in cells.
+
+    Returns:
+        NDArray[float32]: Blurred heightmap, edges are clamped.
+    """
+    if radius <= 0:
+        return heights
+
+    blurred = heights
+    size = 2 * radius + 1
+    for axis in (0, 1):
+        pad_width = [(0, 0), (0, 0)]
+        pad_width[axis] = (radius + 1, radius)
+        cumulative = np.cumsum(np.pad(blurred, pad_width, mode='edge'), axis=axis, dtype=np.float64)
+        upper = [slice(None), slice(None)]
+        lower = [slice(None), slice(None)]
+        upper[axis] = slice(size, None)
+        lower[axis] = slice(None, -size)
+        blurred = ((cumulative[tuple(upper)] - cumulative[tuple(lower)]) / size).astype(np.float32)
+    return blurred
+
+
+def apply_filters(heights: FloatArray, parameters: HeightmapParameters) -> FloatArray:
+    """`apply_filters` function applies erosion and blur to a whole heightmap.
+
+    Args:
+        heights (NDArray[float32]): Heightmap to filter, may be modified in place.
+        parameters (HeightmapParameters): Parameters of the heightmap.
+
+    Returns:
+        NDArray[float32]: Filtered heightmap.
+    """
+    if parameters.erosion_iterations:
+        thermal_erosion(heights, parameters.erosion_iterations, parameters.talus, parameters.erosion_rate)
+    return box_blur(heights, parameters.blur_radius)
+
+
+def slope_angles(heights: FloatArray, size: float, height_scale: float) -> FloatArray:
+    """`slope_angles` function returns the slope angle of every cell of a heightmap.
+
+    Args:
+        heights (NDArray[float32]): Normalized heightmap.
+        size (float): Width and depth of the terrain the heightmap is stretched over.
+        height_scale (float): Height of the terrain at normalized height 1.
+
+    Returns:
+        NDArray[float32]: Slopes in radians.
+    """
+    if min(heights.shape) < 2:
+        return np.zeros_like(heights)
+    spacing = size / (heights.shape[0] - 1)
+    y_gradient, x_gradient = np.gradient(heights * np.float32(height_scale), spacing)
+    return np.arctan(np.hypot(x_gradient, y_gradient)).astype(np.float32)
+
+
+def reduced_parameters(parameters: HeightmapParameters, divisor: int) -> HeightmapParameters:
+    """`reduced_parameters` function returns parameters of a lower resolution version of a heightmap.
+
+    Noise is sampled in heightmap space, so features stay in place. Cell based settings(erosion
+    iterations, blur radius, talus) are scaled with the cell size, so filters have a similar effect.
+
+    Args:
+        parameters (HeightmapParameters): Parameters of the heightmap.
+        divisor (int): Factor the resolution is divided by.
+
+    Returns:
+        HeightmapParameters: Parameters of the reduced heightmap, at least 1 cell wide.
+    """
+    if divisor <= 1:
+        return parameters
+    return replace(
+        parameters,
+        resolution=max(1, parameters.resolution // divisor),
+        erosion_iterations=-(-parameters.erosion_iterations // divisor),
+        talus=parameters.talus * divisor,
+        blur_radius=parameters.blur_radius // divisor,
+    )
+
+
+def generate_heightmap(parameters: HeightmapParameters) -> FloatArray:
+    """`generate_heightmap` function generates a heightmap tile by tile and applies filters.
+
+    Args:
+        parameters (HeightmapParameters): Parameters of the heightmap.
+
+    Returns:
+        NDArray[float32]: Heightmap shaped `(resolution, resolution)`, row 0 is the bottom row.
+    """
+    resolution = parameters.resolution
+    tile_size = max(1, parameters.tile_size)
+    heights = np.empty((resolution, resolution), dtype=np.float32)
+
+    for y_start in range(0, resolution, tile_size):
+        for x_start in range(0, resolution, tile_size):
+            tile_height = min(tile_size, resolution - y_start)
+            tile_width = min(tile_size, resolution - x_start)
+            heights[y_start:y_start + tile_height, x_start:x_start + tile_width] = evaluate_tile(
+                parameters, x_start, y_start, tile_width, tile_height,
+            )
+
+    return apply_filters(heights, parameters)
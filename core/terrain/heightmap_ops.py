@@ -0,0 +1,281 @@
+"""Operators and settings of the heightmap engine."""
+from functools import partial
+
+import bpy
+import bpy.props as bp  # noqa: WPS301
+import bpy.types as bt  # noqa: WPS301
+import numpy as np
+from typing_extensions import Self
+
+from ..class_register.decorators import register_property_group, registration_tier
+from ..graph.biome_graph import biome_graph
+from ..graph.preview import PREVIEW_DIVISORS, PreviewLevel, PreviewResult, preview_scheduler
+from ..jobs.job_ops import run_job
+from ..jobs.runner import Job
+from .heightmap import BASIS_FUNCTIONS, HeightmapParameters, reduced_parameters
+from .noise import FloatArray
+from .tiling import generate_heightmap_tiled, tile_workers
+
+PACK_TIER = 'nodes.terrain'
+
+# Coarser preview levels are skipped, they would be too blurry to be useful
+MIN_PREVIEW_RESOLUTION = 16
+
+# Seconds between polls of finished preview levels
+PREVIEW_INTERVAL = 0.05
+
+
+@register_property_group(bt.Scene, 'bn_heightmap')
+class PG_Heightmap(bt.PropertyGroup):  # noqa: N801
+    """Settings of the heightmap engine and dimensions of the terrain, stored per Scene.
+
+    Dimensions are not heightmap parameters, heights are normalized, biomes, scatter and the overlay read them.
+    """
+
+    image_name: bp.StringProperty(name='Image', default='BN Heightmap')
+    resolution: bp.IntProperty(name='Resolution', default=1024, min=16, soft_max=8192)
+    size: bp.FloatProperty(name='Terrain Size', default=100, min=0.01, subtype='DISTANCE')
+    height_scale: bp.FloatProperty(name='Terrain Height', default=10, min=0, subtype='DISTANCE')
+    seed: bp.IntProperty(
+        name='Seed',
+        description='Selects the random stream of the heightmap below the Scene global seed',
+        default=0,
+        min=0,
+    )
+    basis: bp.EnumProperty(
+        name='Basis',
+        items=[(name, name.capitalize(), '') for name in BASIS_FUNCTIONS],
+        default='PERLIN',
+    )
+    fractal: bp.EnumProperty(
+        name='Fractal',
+        items=[
+            ('FBM', 'fBm', 'Fractional Brownian motion'),
+            ('RIDGED', 'Ridged', 'Ridged multifractal'),
+        ],
+        default='FBM',
+    )
+    scale: bp.FloatProperty(name='Scale', default=4, min=0.01)
+    octaves: bp.IntProperty(name='Octaves', default=6, min=1, max=16)
+    lacunarity: bp.FloatProperty(name='Lacunarity', default=2, min=1)
+    gain: bp.FloatProperty(name='Gain', default=0.5, min=0, max=1)
+    warp_strength: bp.FloatProperty(name='Warp Strength', default=0, min=0)
+    warp_scale: bp.FloatProperty(name='Warp Scale', default=1, min=0.01)
+    exponent: bp.FloatProperty(name='Exponent', default=1, min=0.01)
+    erosion_iterations: bp.IntProperty(name='Erosion Iterations', default=0, min=0)
+    talus: bp.FloatProperty(name='Talus', default=0.004, min=0, precision=4)
+    erosion_rate: bp.FloatProperty(name='Erosion Rate', default=0.25, min=0, max=0.25)
+    blur_radius: bp.IntProperty(name='Blur Radius', default=0, min=0)
+    tile_size: bp.IntProperty(name='Tile Size', default=512, min=16)
+    workers: bp.IntProperty(
+        name='Workers',
+        description='Number of worker processes evaluating tiles, 0 uses all CPUs. Results do not depend on it',
+        default=0,
+        min=0,
+    )
+
+    def parameters(self: Self) -> HeightmapParameters:
+        """`parameters` function returns engine parameters of the settings.
+
+        Returns:
+            HeightmapParameters: Parameters of the heightmap.
+        """
+        return HeightmapParameters(
+            resolution=self.resolution,
+            seed=self.id_data.bn_random.derive_seed('heightmap', self.seed),
+            basis=self.basis,
+            fractal=self.fractal,
+            scale=self.scale,
+            octaves=self.octaves,
+            lacunarity=self.lacunarity,
+            gain=self.gain,
+            warp_strength=self.warp_strength,
+            warp_scale=self.warp_scale,
+            exponent=self.exponent,
+            erosion_iterations=self.erosion_iterations,
+            talus=self.talus,
+            erosion_rate=self.erosion_rate,
+            blur_radius=self.blur_radius,
+            tile_size=self.tile_size,
+        )
+
+
+def float_image(name: str, width: int, height: int) -> bt.Image:
+    """`float_image` function returns a float Image of a size, an existing Image of a different size is resized.
+
+    Resizing keeps the Image datablock, so materials and editors showing it keep showing it.
+
+    Args:
+        name (str): Name of the Image.
+        width (int): Width in pixels.
+        height (int): Height in pixels.
+
+    Returns:
+        Image: Float Image with non-color data.
+    """
+    image = bpy.data.images.get(name)
+    if image is None:
+        return bpy.data.images.new(name, width, height, alpha=False, float_buffer=True, is_data=True)
+    if tuple(image.size) != (width, height):
+        image.scale(width, height)
+    return image
+
+
+def write_image(name: str, heights: FloatArray) -> bt.Image:
+    """`write_image` function stores a heightmap in a float Image with one bulk `foreach_set` call.
+
+    Args:
+        name (str): Name of the Image, an existing Image of a different size is resized.
+        heights (NDArray[float32]): Heightmap shaped `(height, width)`.
+
+    Returns:
+        Image: Image with heights in RGB channels.
+    """
+    height, width = heights.shape
+    image = float_image(name, width, height)
+
+    pixels = np.empty((height, width, 4), dtype=np.float32)
+    pixels[..., :3] = heights[..., None]
+    pixels[..., 3] = 1
+    image.pixels.foreach_set(pixels.ravel())
+    image.update()
+    return image
+
+
+@registration_tier(PACK_TIER)
+class OT_BiomeNodes_GenerateHeightmap(bt.Operator):  # noqa: N801
+    """`OT_BiomeNodes_GenerateHeightmap` Operator generates a heightmap Image from the Scene heightmap settings.
+
+    The heightmap is the 'heightmap' node of `biome_graph`, so it is recomputed only if the settings changed,
+    and it is persistent, so settings of a previous session reopen it from the layer cache.
+    Tiles are evaluated on `tile_scheduler` worker processes, by default as a background job.
+    """
+
+    bl_description = 'Generate a heightmap Image from the Scene heightmap settings'
+
+    background: bp.BoolProperty(
+        name='Background',
+        description='Generate as a background job, without blocking the UI',
+        default=True,
+    )
+
+    def execute(self: Self, context: bt.Context) -> set[str]:  # noqa: D102
+        settings = context.scene.bn_heightmap
+        parameters = settings.parameters()
+        image_name = settings.image_name
+
+        workers = settings.workers or None
+
+        def generate(job: Job) -> FloatArray:
+            # Unchanged settings reuse the cached heightmap, changed ones recompute it and everything downstream
+            with tile_workers(workers), biome_graph.lock:
+                biome_graph.set_parameters('heightmap', parameters=parameters)
+                return biome_graph.evaluate('heightmap', job.cancelled, job.report)
+
+        run_job(Job('Heightmap', generate, on_done=partial(write_image, image_name)), self.background)
+        self.report({'INFO'}, '{action} {size}x{size} heightmap.'.format(
+            action='Generating' if self.background else 'Generated',
+            size=parameters.resolution,
+        ),
+        )
+        return {'FINISHED'}
+
+
+def heightmap_levels(parameters: HeightmapParameters, workers: int | None = None) -> list[PreviewLevel]:
+    """`heightmap_levels` function returns preview levels of a heightmap, see `PREVIEW_DIVISORS`.
+
+    Args:
+        parameters (HeightmapParameters): Parameters of the heightmap.
+        workers (int | None): Number of tile worker processes, see `TileScheduler.evaluate`.
+
+    Returns:
+        list[PreviewLevel]: Levels from the coarsest to full resolution.
+    """
+    divisors = [
+        divisor for divisor in PREVIEW_DIVISORS
+        if divisor > 1 and parameters.resolution // divisor >= MIN_PREVIEW_RESOLUTION
+    ]
+    return [
+        partial(generate_heightmap_tiled, reduced_parameters(parameters, divisor), workers=workers)
+        for divisor in (*divisors, 1)
+    ]
+
+
+@registration_tier(PACK_TIER)
+class OT_BiomeNodes_PreviewHeightmap(bt.Operator):  # noqa: N801
+    """`OT_BiomeNodes_PreviewHeightmap` Operator previews heightmap settings progressively while they are edited.
+
+    Every change of the settings requests coarse to full resolution levels from `preview_scheduler`,
+    which cancels evaluation of the previous settings. A window timer polls finished levels and writes
+    the newest one into the Image, so the UI never waits for an evaluation. The full resolution level
+    is stored in `biome_graph`, so generating the heightmap afterwards is a cache hit. Esc stops the preview.
+    """
+
+    bl_description = 'Preview the heightmap progressively while its settings are edited, Esc to stop'
+
+    def invoke(self: Self, context: bt.Context, event: bt.Event) -> set[str]:  # noqa: D102
+        self._parameters: HeightmapParameters | None = None
+        self._timer = context.window_manager.event_timer_add(PREVIEW_INTERVAL, window=context.window)
+        context.window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self: Self, context: bt.Context, event: bt.Event) -> set[str]:  # noqa: D102
+        if event.type == 'ESC':
+            self.cancel(context)
+            return {'CANCELLED'}
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        settings = context.scene.bn_heightmap
+        parameters = settings.parameters()
+        if parameters != self._parameters:
+            self._request(context, parameters)
+
+        results = preview_scheduler.poll()
+        if results:
+            self._show(context, results[-1])
+        return {'PASS_THROUGH'}
+
+    def cancel(self: Self, context: bt.Context) -> None:  # noqa: D102
+        preview_scheduler.cancel()
+        context.window_manager.event_timer_remove(self._timer)
+        context.workspace.status_text_set(None)
+
+    def _request(self: Self, context: bt.Context, parameters: HeightmapParameters) -> None:
+        self._parameters = parameters
+
+        # Reverting a setting shows the cached heightmap at once, unless a background job holds the graph
+        with biome_graph.try_lock() as locked:
+            found, heights = biome_graph.cached('heightmap', parameters=parameters) if locked else (False, None)
+        if found:
+            preview_scheduler.cancel()
+            write_image(context.scene.bn_heightmap.image_name, heights)
+            self._redraw(context, 'Heightmap preview: cached')
+            return
+
+        levels = heightmap_levels(parameters, context.scene.bn_heightmap.workers or None)
+        self._levels = len(levels)
+        preview_scheduler.request(levels)
+
+    def _show(self: Self, context: bt.Context, result: PreviewResult) -> None:
+        if result.error is not None:
+            self.report({'ERROR'}, 'Heightmap preview failed: {error}'.format(error=result.error))
+            return
+
+        write_image(context.scene.bn_heightmap.image_name, result.value)
+        if result.final:
+            with biome_graph.try_lock() as locked:
+                if locked:
+                    biome_graph.store('heightmap', result.value, parameters=self._parameters)
+        self._redraw(context, 'Heightmap preview: level {level}/{levels}'.format(
+            level=result.level + 1,
+            levels=self._levels,
+        ),
+        )
+
+    @staticmethod
+    def _redraw(context: bt.Context, status: str) -> None:
+        context.workspace.status_text_set('{status}, Esc to stop'.format(status=status))
+        for area in context.screen.areas:
+            if area.type in {'IMAGE_EDITOR', 'VIEW_3D'}:
+                area.tag_redraw()
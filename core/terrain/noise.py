@@ -0,0 +1,231 @@
+"""Vectorized 2D noise functions.
+
+Every function takes coordinate arrays that broadcast against each other(e.g. a row and a column)
+and evaluates the whole grid at once in `float32`. Noise is defined over absolute coordinates, so any
+tile of a grid can be evaluated on its own and matches the same region of a full evaluation.
+"""
+from collections.abc import Callable
+
+import numpy as np
+import numpy.typing as npt
+
+from ...util.rng import RandomStreams
+
+FloatArray = npt.NDArray[np.float32]
+NoiseFunction = Callable[[FloatArray, FloatArray, npt.NDArray[np.int64]], FloatArray]
+
+PERMUTATION_SIZE = 256
+
+# Unit gradients of 8 directions, shared by Perlin and simplex noise
+GRADIENTS = np.array(
+    [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1)],
+    dtype=np.float32,
+) / np.array([1, 1, 1, 1, np.sqrt(2), np.sqrt(2), np.sqrt(2), np.sqrt(2)], dtype=np.float32)[:, None]
+
+SIMPLEX_SKEW = np.float32(0.5 * (np.sqrt(3) - 1))
+SIMPLEX_UNSKEW = np.float32((3 - np.sqrt(3)) / 6)
+
+# Gustavson's factor of 70 assumes gradients of length sqrt(2), gradients above are unit
+SIMPLEX_SCALE = np.float32(70 * np.sqrt(2))
+
+
+def permutation(seed: int) -> npt.NDArray[np.int64]:
+    """`permutation` function returns a doubled permutation table of lattice hashes.
+
+    Args:
+        seed (int): Seed of the permutation.
+
+    Returns:
+        NDArray[int64]: Permutation of `range(256)` repeated twice, so lookups never wrap.
+    """
+    table = RandomStreams(seed).generator('permutation').permutation(PERMUTATION_SIZE).astype(np.int64)
+    return np.concatenate((table, table))
+
+
+def _gradient_dot(
+    hashes: npt.NDArray[np.int64],
+    x: FloatArray,  # noqa: WPS111
+    y: FloatArray,  # noqa: WPS111
+) -> FloatArray:
+    gradients = GRADIENTS[hashes & 7]
+    return gradients[..., 0] * x + gradients[..., 1] * y
+
+
+def _fade(t: FloatArray) -> FloatArray:  # noqa: WPS111
+    return t * t * t * (t * (t * 6 - 15) + 10)
+
+
+def perlin(
+    x: FloatArray,  # noqa: WPS111
+    y: FloatArray,  # noqa: WPS111
+    perm: npt.NDArray[np.int64],
+) -> FloatArray:
+    """`perlin` function evaluates gradient(Perlin) noise.
+
+    Args:
+        x (NDArray[float32]): X coordinates.
+        y (NDArray[float32]): Y coordinates.
+        perm (NDArray[int64]): Permutation table, see `permutation`.
+
+    Returns:
+        NDArray[float32]: Noise in roughly [-1, 1].
+    """
+    x_floor = np.floor(x)
+    y_floor = np.floor(y)
+    x_frac = (x - x_floor).astype(np.float32, copy=False)
+    y_frac = (y - y_floor).astype(np.float32, copy=False)
+    x_cell = x_floor.astype(np.int64) & (PERMUTATION_SIZE - 1)
+    y_cell = y_floor.astype(np.int64) & (PERMUTATION_SIZE - 1)
+
+    x_hash = perm[x_cell]
+    x_next_hash = perm[x_cell + 1]
+    u_fade = _fade(x_frac)
+    v_fade = _fade(y_frac)
+
+    lower = _lerp(
+        _gradient_dot(perm[x_hash + y_cell], x_frac, y_frac),
+        _gradient_dot(perm[x_next_hash + y_cell], x_frac - 1, y_frac),
+        u_fade,
+    )
+    upper = _lerp(
+        _gradient_dot(perm[x_hash + y_cell + 1], x_frac, y_frac - 1),
+        _gradient_dot(perm[x_next_hash + y_cell + 1], x_frac - 1, y_frac - 1),
+        u_fade,
+    )
+    return (_lerp(lower, upper, v_fade) * np.float32(np.sqrt(2))).astype(np.float32, copy=False)
+
+
+def simplex(
+    x: FloatArray,  # noqa: WPS111
+    y: FloatArray,  # noqa: WPS111
+    perm: npt.NDArray[np.int64],
+) -> FloatArray:
+    """`simplex` function evaluates 2D simplex noise.
+
+    Args:
+        x (NDArray[float32]): X coordinates.
+        y (NDArray[float32]): Y coordinates.
+        perm (NDArray[int64]): Permutation table, see `permutation`.
+
+    Returns:
+        NDArray[float32]: Noise in roughly [-1, 1].
+    """
+    skew = (x + y) * SIMPLEX_SKEW
+    i_cell = np.floor(x + skew)
+    j_cell = np.floor(y + skew)
+    unskew = (i_cell + j_cell) * SIMPLEX_UNSKEW
+    x0 = (x - (i_cell - unskew)).astype(np.float32, copy=False)
+    y0 = (y - (j_cell - unskew)).astype(np.float32, copy=False)
+
+    # Second corner of the triangle the point is in
+    lower_triangle = x0 > y0
+    i_step = lower_triangle.astype(np.int64)
+    j_step = 1 - i_step
+
+    x1 = x0 - i_step + SIMPLEX_UNSKEW
+    y1 = y0 - j_step + SIMPLEX_UNSKEW
+    x2 = x0 - 1 + 2 * SIMPLEX_UNSKEW
+    y2 = y0 - 1 + 2 * SIMPLEX_UNSKEW
+
+    i_hash = i_cell.astype(np.int64) & (PERMUTATION_SIZE - 1)
+    j_hash = j_cell.astype(np.int64) & (PERMUTATION_SIZE - 1)
+
+    total = _simplex_corner(perm[i_hash + perm[j_hash]], x0, y0)
+    total += _simplex_corner(perm[i_hash + i_step + perm[j_hash + j_step]], x1, y1)
+    total += _simplex_corner(perm[i_hash + 1 + perm[j_hash + 1]], x2, y2)
+    return (total * SIMPLEX_SCALE).astype(np.float32, copy=False)
+
+
+def _simplex_corner(
+    hashes: npt.NDArray[np.int64],
+    x: FloatArray,  # noqa: WPS111
+    y: FloatArray,  # noqa: WPS111
+) -> FloatArray:
+    falloff = np.maximum(np.float32(0.5) - x * x - y * y, np.float32(0))
+    falloff *= falloff
+    return falloff * falloff * _gradient_dot(hashes, x, y)
+
+
+def _lerp(start: FloatArray, end: FloatArray, weight: FloatArray) -> FloatArray:
+    return start + weight * (end - start)
+
+
+def fbm(  # noqa: WPS211
+    noise: NoiseFunction,
+    x: FloatArray,  # noqa: WPS111
+    y: FloatArray,  # noqa: WPS111
+    perm: npt.NDArray[np.int64],
+    octaves: int = 6,
+    lacunarity: float = 2,
+    gain: float = 0.5,
+) -> FloatArray:
+    """`fbm` function sums octaves of noise(fractional Brownian motion).
+
+    Args:
+        noise (NoiseFunction): Basis noise, e.g. `perlin` or `simplex`.
+        x (NDArray[float32]): X coordinates.
+        y (NDArray[float32]): Y coordinates.
+        perm (NDArray[int64]): Permutation table, see `permutation`.
+        octaves (int): Number of octaves.
+        lacunarity (float): Frequency multiplier between octaves.
+        gain (float): Amplitude multiplier between octaves.
+
+    Returns:
+        NDArray[float32]: Noise in roughly [-1, 1].
+    """
+    total = np.zeros(np.broadcast_shapes(np.shape(x), np.shape(y)), dtype=np.float32)
+    frequency = np.float32(1)
+    amplitude = np.float32(1)
+    norm = np.float32(0)
+    for octave in range(octaves):
+        # Octaves are shifted, so lattice points of different octaves don't line up
+        shift = np.float32(octave * 17.31)
+        total += amplitude * noise(x * frequency + shift, y * frequency - shift, perm)
+        norm += amplitude
+        frequency *= np.float32(lacunarity)
+        amplitude *= np.float32(gain)
+    return total / max(norm, np.float32(1e-6))
+
+
+def ridged(  # noqa: WPS211
+    noise: NoiseFunction,
+    x: FloatArray,  # noqa: WPS111
+    y: FloatArray,  # noqa: WPS111
+    perm: npt.NDArray[np.int64],
+    octaves: int = 6,
+    lacunarity: float = 2,
+    gain: float = 0.5,
+) -> FloatArray:
+    """`ridged` function sums octaves of ridged multifractal noise.
+
+    Every octave is weighted by the previous one, so ridges get detail and valleys stay smooth.
+
+    Args:
+        noise (NoiseFunction): Basis noise, e.g. `perlin` or `simplex`.
+        x (NDArray[float32]): X coordinates.
+        y (NDArray[float32]): Y coordinates.
+        perm (NDArray[int64]): Permutation table, see `permutation`.
+        octaves (int): Number of octaves.
+        lacunarity (float): Frequency multiplier between octaves.
+        gain (float): Amplitude multiplier between octaves.
+
+    Returns:
+        NDArray[float32]: Noise in roughly [-1, 1].
+    """
+    shape = np.broadcast_shapes(np.shape(x), np.shape(y))
+    total = np.zeros(shape, dtype=np.float32)
+    weight = np.ones(shape, dtype=np.float32)
+    frequency = np.float32(1)
+    amplitude = np.float32(1)
+    norm = np.float32(0)
+    for octave in range(octaves):
+        shift = np.float32(octave * 17.31)
+        signal = np.float32(1) - np.abs(noise(x * frequency + shift, y * frequency - shift, perm))
+        signal *= signal
+        signal *= weight
+        weight = np.clip(signal * 2, 0, 1)
+        total += amplitude * signal
+        norm += amplitude
+        frequency *= np.float32(lacunarity)
+        amplitude *= np.float32(gain)
+    return total / max(norm, np.float32(1e-6)) * 2 - 1
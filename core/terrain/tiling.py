@@ -0,0 +1,381 @@
+"""Tiled evaluation of large grids on a process pool.
+
+The output domain is split into tiles, every tile is evaluated over its region extended by a halo,
+so filters that need neighbours(erosion, blur) see the same input as over the whole grid, and only
+the core region is written. Workers write straight into a `multiprocessing.shared_memory` buffer,
+results are never pickled back. A tile depends only on its geometry, so results are bit-identical
+for any number of workers and any completion order.
+
+Worker processes are spawned, not forked(forking Blender is unsafe), and this module with its
+imports must not depend on `bpy`.
+"""
+import itertools
+import multiprocessing
+import os
+import sys
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Executor, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any
+
+import numpy as np
+from typing_extensions import Self
+
+from .heightmap import HeightmapParameters, apply_filters, evaluate_tile
+from .noise import FloatArray
+from ...util.ledger import ledger
+
+TileFunction = Callable[[Any, int, int, int, int], FloatArray]
+
+# Polled between tiles, returns True once the evaluation is no longer needed
+CancelCheck = Callable[[], bool]
+
+# Cancel check of the job running in the current thread, used by evaluations that got none explicitly,
+# e.g. tiles of a heightmap evaluated as a node of a graph
+active_cancel_check: ContextVar[CancelCheck | None] = ContextVar('active_cancel_check', default=None)
+
+# Number of workers of evaluations in the current thread that got none explicitly, see `tile_workers`
+active_workers: ContextVar[int | None] = ContextVar('active_workers', default=None)
+
+# Runs in every worker before anything is unpickled: registers the add-on package without executing
+# its `__init__`, which imports `bpy` and is not importable outside of Blender
+WORKER_BOOTSTRAP = '''
+import sys
+import types
+
+package = types.ModuleType({name!r})
+package.__path__ = [{path!r}]
+sys.modules.setdefault({name!r}, package)
+'''
+
+
+@dataclass(frozen=True)
+class Tile():
+    """`Tile` Class is a rectangular region of a grid with a halo.
+
+    Args:
+        x_start (int): First column of the core region.
+        y_start (int): First row of the core region.
+        width (int): Number of columns of the core region.
+        height (int): Number of rows of the core region.
+        halo (int): Width of the halo around the core region, clipped to the grid.
+    """
+
+    x_start: int
+    y_start: int
+    width: int
+    height: int
+    halo: int = 0
+
+    def extended(self: Self, shape: tuple[int, int]) -> tuple[int, int, int, int]:
+        """`extended` function returns the region of the tile including the halo, clipped to the grid.
+
+        Args:
+            shape (tuple[int, int]): Shape of the grid, `(rows, columns)`.
+
+        Returns:
+            tuple[int, int, int, int]: First column, first row, number of columns and rows.
+        """
+        rows, columns = shape
+        x_start = max(0, self.x_start - self.halo)
+        y_start = max(0, self.y_start - self.halo)
+        x_end = min(columns, self.x_start + self.width + self.halo)
+        y_end = min(rows, self.y_start + self.height + self.halo)
+        return x_start, y_start, x_end - x_start, y_end - y_start
+
+
+def split_tiles(shape: tuple[int, int], tile_size: int, halo: int = 0) -> list[Tile]:
+    """`split_tiles` function splits a grid into tiles, row by row.
+
+    Args:
+        shape (tuple[int, int]): Shape of the grid, `(rows, columns)`.
+        tile_size (int): Width and height of tiles, tiles at the end of rows and columns may be smaller.
+        halo (int): Width of the halo of every tile.
+
+    Returns:
+        list[Tile]: Tiles covering the grid without overlaps of their core regions.
+    """
+    rows, columns = shape
+    tile_size = max(1, tile_size)
+    return [
+        Tile(x_start, y_start, min(tile_size, columns - x_start), min(tile_size, rows - y_start), halo)
+        for y_start in range(0, rows, tile_size)
+        for x_start in range(0, columns, tile_size)
+    ]
+
+
+def spawn_executor(workers: int) -> ProcessPoolExecutor:
+    """`spawn_executor` function returns a pool of spawned worker processes that can import the add-on package.
+
+    Args:
+        workers (int): Number of worker processes.
+
+    Returns:
+        ProcessPoolExecutor: Pool of workers, functions submitted to it must not depend on `bpy`.
+    """
+    package_name = __name__.split('.', maxsplit=1)[0]
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=exec,
+        initargs=(
+            WORKER_BOOTSTRAP.format(name=package_name, path=sys.modules[package_name].__path__[0]),
+            {},
+        ),
+    )
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    # Spawned workers share the resource tracker of the parent, which owns and unlinks the buffer
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def evaluate_into(  # noqa: WPS211
+    output: FloatArray,
+    tile: Tile,
+    tile_function: TileFunction,
+    arguments: Any,
+) -> None:
+    """`evaluate_into` function evaluates a tile over its extended region and writes its core region.
+
+    Args:
+        output (NDArray[float32]): Grid to write into.
+        tile (Tile): Tile to evaluate.
+        tile_function (TileFunction): Called with `arguments` and the extended region, \
+        returns values of the extended region.
+        arguments (Any): First argument of `tile_function`.
+    """
+    x_start, y_start, width, height = tile.extended(output.shape)
+    values = tile_function(arguments, x_start, y_start, width, height)
+
+    x_offset = tile.x_start - x_start
+    y_offset = tile.y_start - y_start
+    output[tile.y_start:tile.y_start + tile.height, tile.x_start:tile.x_start + tile.width] = values[
+        y_offset:y_offset + tile.height, x_offset:x_offset + tile.width,
+    ]
+
+
+def _evaluate_shared(  # noqa: WPS211
+    name: str,
+    shape: tuple[int, int],
+    tile: Tile,
+    tile_function: TileFunction,
+    arguments: Any,
+) -> None:
+    buffer = _attach(name)
+    try:
+        evaluate_into(np.ndarray(shape, dtype=np.float32, buffer=buffer.buf), tile, tile_function, arguments)
+    finally:
+        buffer.close()
+
+
+class TileScheduler():
+    """`TileScheduler` Class evaluates tiles of grids on a pool of spawned worker processes.
+
+    The pool is created on first use and kept alive between evaluations, `shutdown` stops it.
+    With one worker or one tile everything is evaluated in the current process.
+    Evaluations may run from several threads at once(e.g. a preview next to an Operator), each with its own
+    number of workers: an evaluation keeps at most that many tiles in the pool. The pool is only replaced
+    by a larger one while no evaluation uses it, until then larger evaluations use the workers it has.
+
+    Args:
+        workers (int | None): Default number of worker processes, number of CPUs if not specified.
+    """
+
+    def __init__(self: Self, workers: int | None = None) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.executor: Executor | None = None
+        self._executor_workers = 0
+        self._runs = 0
+        self._lock = threading.Lock()
+
+    def evaluate(  # noqa: WPS211
+        self: Self,
+        shape: tuple[int, int],
+        tiles: list[Tile],
+        tile_function: TileFunction,
+        arguments: Any,
+        cancelled: CancelCheck | None = None,
+        workers: int | None = None,
+    ) -> FloatArray:
+        """`evaluate` function evaluates all tiles of a grid.
+
+        Args:
+            shape (tuple[int, int]): Shape of the grid, `(rows, columns)`.
+            tiles (list[Tile]): Tiles covering the grid, see `split_tiles`.
+            tile_function (TileFunction): Module level function, called with `arguments` and a region.
+            arguments (Any): First argument of `tile_function`, must be picklable.
+            cancelled (CancelCheck | None): Polled whenever a tile completes, pending tiles are dropped \
+            once it returns True.
+            workers (int | None): Number of worker processes of this evaluation, `workers` if not specified.
+
+        Returns:
+            NDArray[float32]: Evaluated grid.
+
+        Raises:
+            CancelledError: If the evaluation was cancelled.
+        """
+        workers = workers or self.workers
+        if workers <= 1 or len(tiles) <= 1:
+            output = np.empty(shape, dtype=np.float32)
+            for tile in tiles:
+                if cancelled is not None and cancelled():
+                    raise CancelledError()
+                evaluate_into(output, tile, tile_function, arguments)
+            return output
+
+        executor, workers = self._acquire(workers)
+        try:
+            return self._evaluate_pool(executor, workers, shape, tiles, tile_function, arguments, cancelled)
+        finally:
+            with self._lock:
+                self._runs -= 1
+
+    def shutdown(self: Self) -> None:
+        """`shutdown` function stops worker processes."""
+        if self.executor is not None:
+            ledger.discard(self)
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+    @staticmethod
+    def _evaluate_pool(  # noqa: WPS211
+        executor: Executor,
+        workers: int,
+        shape: tuple[int, int],
+        tiles: list[Tile],
+        tile_function: TileFunction,
+        arguments: Any,
+        cancelled: CancelCheck | None,
+    ) -> FloatArray:
+        buffer = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 4)
+        try:
+            # At most `workers` tiles are submitted at once, other evaluations share the pool
+            unsubmitted = iter(tiles)
+            futures: list[Any] = []
+            pending: set[Any] = set()
+            while True:
+                for tile in itertools.islice(unsubmitted, workers - len(pending)):
+                    future = executor.submit(_evaluate_shared, buffer.name, shape, tile, tile_function, arguments)
+                    futures.append(future)
+                    pending.add(future)
+                if not pending:
+                    break
+                _, pending = wait(pending, timeout=None if cancelled is None else 0.05, return_when=FIRST_COMPLETED)
+                if (pending or len(futures) < len(tiles)) and cancelled is not None and cancelled():
+                    for future in pending:
+                        future.cancel()
+                    # Running tiles still write into the buffer, it is released only after they finish
+                    wait(pending)
+                    raise CancelledError()
+            for future in futures:
+                future.result()
+            return np.array(np.ndarray(shape, dtype=np.float32, buffer=buffer.buf))
+        finally:
+            buffer.close()
+            buffer.unlink()
+
+    def _acquire(self: Self, workers: int) -> tuple[Executor, int]:
+        # Returns the pool and the number of its workers an evaluation may use, the evaluation must release it
+        with self._lock:
+            if self.executor is None or (self._executor_workers < workers and not self._runs):
+                self.shutdown()
+                self.executor = spawn_executor(workers)
+                self._executor_workers = workers
+                ledger.record('worker pools', self, self.shutdown, name='tiles')
+            self._runs += 1
+            return self.executor, min(workers, self._executor_workers)
+
+
+def heightmap_halo(parameters: HeightmapParameters) -> int:
+    """`heightmap_halo` function returns the halo a heightmap tile needs for its filters.
+
+    Every erosion iteration spreads material by one cell, the blur reaches `blur_radius` cells.
+
+    Args:
+        parameters (HeightmapParameters): Parameters of the heightmap.
+
+    Returns:
+        int: Width of the halo in cells.
+    """
+    return parameters.erosion_iterations + parameters.blur_radius
+
+
+def heightmap_tile(
+    parameters: HeightmapParameters,
+    x_start: int,
+    y_start: int,
+    width: int,
+    height: int,
+) -> FloatArray:
+    """`heightmap_tile` function evaluates noise and filters of a region of a heightmap.
+
+    Args:
+        parameters (HeightmapParameters): Parameters of the heightmap.
+        x_start (int): First column of the region.
+        y_start (int): First row of the region.
+        width (int): Number of columns.
+        height (int): Number of rows.
+
+    Returns:
+        NDArray[float32]: Filtered heights of the region.
+    """
+    return apply_filters(evaluate_tile(parameters, x_start, y_start, width, height), parameters)
+
+
+# Shared by generation Operators, so worker processes are spawned once per session
+tile_scheduler = TileScheduler()
+
+
+@contextmanager
+def tile_workers(workers: int | None) -> Iterator[None]:
+    """`tile_workers` function sets the number of workers of tiled evaluations in the current thread.
+
+    Tiled nodes of a graph get no arguments but their parameters, they use `active_workers` instead.
+
+    Args:
+        workers (int | None): Number of worker processes, `TileScheduler.workers` if not specified.
+
+    Yields:
+        None: Evaluations inside the block use `workers`.
+    """
+    token = active_workers.set(workers)
+    try:
+        yield
+    finally:
+        active_workers.reset(token)
+
+
+def generate_heightmap_tiled(
+    parameters: HeightmapParameters,
+    cancelled: CancelCheck | None = None,
+    workers: int | None = None,
+) -> FloatArray:
+    """`generate_heightmap_tiled` function generates a heightmap with `tile_scheduler`.
+
+    Args:
+        parameters (HeightmapParameters): Parameters of the heightmap.
+        cancelled (CancelCheck | None): Polled between tiles, see `TileScheduler.evaluate`, \
+        `active_cancel_check` if not specified.
+        workers (int | None): Number of worker processes, `active_workers` if not specified.
+
+    Returns:
+        NDArray[float32]: Heightmap shaped `(resolution, resolution)`.
+    """
+    shape = (parameters.resolution, parameters.resolution)
+    tiles = split_tiles(shape, parameters.tile_size, heightmap_halo(parameters))
+    return tile_scheduler.evaluate(
+        shape,
+        tiles,
+        heightmap_tile,
+        parameters,
+        cancelled or active_cancel_check.get(),
+        workers or active_workers.get(),
+    )
+
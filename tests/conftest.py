@@ -0,0 +1,19 @@
+"""Makes the add-on importable without Blender.
+
+The package `__init__` imports `bpy`, so the package is registered as a stub pointing at the repository,
+the same way worker processes and benchmarks import it. `bpy` is the stand-in of the benchmarks
+(`benchmarks/fake_bpy`), so modules of Operators import, but only their `bpy`-free logic can be tested.
+"""
+import sys
+import types
+from pathlib import Path
+
+PACKAGE_NAME = 'BiomeNodes'
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FAKE_BPY = REPO_ROOT / 'benchmarks' / 'fake_bpy'
+
+sys.path.insert(0, str(FAKE_BPY))
+
+package = types.ModuleType(PACKAGE_NAME)
+package.__path__ = [str(REPO_ROOT)]
+sys.modules.setdefault(PACKAGE_NAME, package)
@@ -0,0 +1,37 @@
+"""Tests of the on-disk `LayerCache`."""
+from pathlib import Path
+
+import numpy as np
+
+from BiomeNodes.core.graph.disk_cache import INDEX_NAME, LayerCache
+from BiomeNodes.util.ledger import ledger
+
+VERSION = (1, 0, 0)
+
+
+def test_hits_update_index_on_flush(tmp_path: Path) -> None:
+    cache = LayerCache(directory=tmp_path, version=VERSION)
+    cache.put('layer', np.arange(10))
+    written = (tmp_path / INDEX_NAME).read_text(encoding='utf-8')
+
+    np.testing.assert_array_equal(cache.get('layer'), np.arange(10))
+    assert (tmp_path / INDEX_NAME).read_text(encoding='utf-8') == written
+
+    cache.flush()
+    assert (tmp_path / INDEX_NAME).read_text(encoding='utf-8') != written
+    assert cache not in ledger.entries
+
+
+def test_unwritable_directory_degrades_to_memory(tmp_path: Path) -> None:
+    # A directory below a file can never be created
+    blocker = tmp_path / 'file'
+    blocker.write_bytes(b'')
+    cache = LayerCache(directory=blocker / 'layers', version=VERSION)
+
+    cache.put('layer', np.arange(10))
+    assert not cache.writable
+    assert cache.get('layer') is None
+
+    cache.put('layer', np.arange(10))
+    cache.clear()
+    assert not list(tmp_path.glob('*.tmp'))
@@ -0,0 +1,48 @@
+"""Tests of incremental evaluation of `NodeGraph`."""
+import numpy as np
+
+from BiomeNodes.core.graph.evaluator import GraphNode, NodeGraph
+
+# Results of 4000 bytes in a budget of 5000 bytes, the cache holds one result at a time
+RESULT_SIZE = 1000
+CACHE_BUDGET = 5000
+
+
+def counting_graph(calls: list[str]) -> NodeGraph:
+    """Returns a graph `a -> b` whose functions record their calls."""
+
+    def node_a() -> np.ndarray:
+        calls.append('a')
+        return np.zeros(RESULT_SIZE, dtype=np.float32)
+
+    def node_b(a_result: np.ndarray) -> np.ndarray:
+        calls.append('b')
+        return a_result + 1
+
+    graph = NodeGraph(max_bytes=CACHE_BUDGET)
+    graph.add_node(GraphNode('a', node_a))
+    graph.add_node(GraphNode('b', node_b, inputs=('a',)))
+    return graph
+
+
+def test_cached_output_skips_evicted_inputs() -> None:
+    calls: list[str] = []
+    graph = counting_graph(calls)
+    graph.evaluate('b')
+    assert calls == ['a', 'b']
+    assert not graph.cache.get(graph.hashes['a'])[0]
+
+    calls.clear()
+    result = graph.evaluate('b')
+    assert not calls
+    assert result[0] == 1
+
+
+def test_missing_output_evaluates_missing_inputs_only() -> None:
+    calls: list[str] = []
+    graph = counting_graph(calls)
+    graph.evaluate('a')
+    calls.clear()
+
+    graph.evaluate('b')
+    assert calls == ['b']
@@ -0,0 +1,33 @@
+"""Tests of graph files and the references they store."""
+from pathlib import Path
+
+import pytest
+
+from BiomeNodes.core.graph.evaluator import GraphNode, NodeGraph, function_reference
+from BiomeNodes.core.graph.graph_file import FORMAT_VERSION, HEADER, MAGIC, GraphFile, encode, save_graph
+from BiomeNodes.util.rng import RandomStreams
+
+
+def test_references_are_package_relative() -> None:
+    assert function_reference(RandomStreams) == 'util.rng:RandomStreams'
+
+
+def test_loaded_hashes_match_recomputed_hashes(tmp_path: Path) -> None:
+    graph = NodeGraph()
+    graph.add_node(GraphNode('streams', RandomStreams, parameters={'seed': 7}))
+    path = tmp_path / 'graph.bngraph'
+    hashes = save_graph(graph, path)
+
+    loaded = NodeGraph()
+    with GraphFile(path) as graph_file:
+        graph_file.load(graph=loaded)
+    assert loaded.node_hash(loaded.nodes['streams']) == hashes['streams']
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_malformed_index_is_rejected(tmp_path: Path) -> None:
+    path = tmp_path / 'graph.bngraph'
+    path.write_bytes(HEADER.pack(MAGIC, FORMAT_VERSION, HEADER.size) + encode({'nodes': {'streams': (1, 2)}}))
+
+    with pytest.raises(ValueError, match='malformed index'):
+        GraphFile(path)
@@ -0,0 +1,31 @@
+"""Tests of vertex buffers of viewport overlays."""
+from types import SimpleNamespace
+
+import numpy as np
+
+from BiomeNodes.core.biome.classification import BiomeRule, ClassifierParameters, build_lookup
+from BiomeNodes.core.overlay.overlay_ops import OverlayRenderer
+
+SHAPE = (8, 8)
+
+
+def test_density_of_rule_added_after_classification_is_not_drawn() -> None:
+    lookup = build_lookup(ClassifierParameters(rules=(BiomeRule('low'), BiomeRule('high', altitude=(0.5, 1)))))
+    rules = [SimpleNamespace(color=(1, 0, 0)) for _ in range(3)]
+    biomes = SimpleNamespace(rules=rules, active_rule_index=2)
+    terrain = SimpleNamespace(size=100, height_scale=10)
+    settings = SimpleNamespace(
+        layer='DENSITY',
+        opacity=0.5,
+        resolution=8,
+        offset=0,
+        id_data=SimpleNamespace(bn_biomes=biomes, bn_heightmap=terrain),
+    )
+    layers = {name: np.zeros(SHAPE, dtype=np.float32) for name in ('temperature', 'moisture', 'heightmap', 'slope')}
+
+    assert OverlayRenderer.buffers(settings, {**layers, 'biome_lookup': lookup}) is None
+
+    biomes.active_rule_index = 1
+    primitive, positions, colors, _ = OverlayRenderer.buffers(settings, {**layers, 'biome_lookup': lookup})
+    assert primitive == 'TRIS'
+    assert len(positions) == len(colors) == SHAPE[0] * SHAPE[1]
@@ -0,0 +1,16 @@
+"""Tests of Poisson disk scattering."""
+import numpy as np
+
+from BiomeNodes.core.scatter.poisson import ScatterParameters, Species, scatter
+
+SIZE = 30
+
+
+def test_positions_lie_on_the_terrain() -> None:
+    parameters = ScatterParameters(size=SIZE, species=(Species('tree', radius=0.7), Species('rock', radius=0.3)))
+    instances = scatter(np.zeros((64, 64), dtype=np.float32), parameters)
+
+    positions = instances['position']
+    assert len(positions)
+    assert (positions[:, :2] >= 0).all()
+    assert (positions[:, :2] < SIZE).all()
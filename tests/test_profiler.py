@@ -0,0 +1,19 @@
+"""Tests of the registration profiler."""
+import logging
+
+import pytest
+
+from BiomeNodes.util.profiler import RegistrationProfiler
+
+
+def test_dump_outputs_table_under_warning_level(caplog: pytest.LogCaptureFixture) -> None:
+    parent = logging.getLogger('BiomeNodes.tests')
+    parent.setLevel(logging.WARNING)
+    profiler = RegistrationProfiler(enabled=True, logger=logging.getLogger('BiomeNodes.tests.profiler'))
+    with profiler.phase('register_class', 'PG_Test'):
+        pass
+
+    with caplog.at_level(logging.NOTSET):
+        profiler.dump('Register')
+    assert any(record.getMessage().startswith('Register profile:') for record in caplog.records)
+    assert not profiler.phases
@@ -0,0 +1,34 @@
+"""Tests of tiled evaluation on the shared `TileScheduler`."""
+import numpy as np
+
+from BiomeNodes.core.terrain.heightmap import HeightmapParameters
+from BiomeNodes.core.terrain.tiling import TileScheduler, heightmap_halo, heightmap_tile, split_tiles
+
+PARAMETERS = HeightmapParameters(resolution=64, tile_size=16, blur_radius=2)
+
+
+def test_workers_per_evaluation_share_one_pool() -> None:
+    scheduler = TileScheduler(workers=1)
+    shape = (PARAMETERS.resolution, PARAMETERS.resolution)
+    tiles = split_tiles(shape, PARAMETERS.tile_size, heightmap_halo(PARAMETERS))
+    try:
+        serial = scheduler.evaluate(shape, tiles, heightmap_tile, PARAMETERS)
+        parallel = scheduler.evaluate(shape, tiles, heightmap_tile, PARAMETERS, workers=2)
+        executor = scheduler.executor
+        # Later evaluations reuse the pool instead of spawning workers again
+        assert np.array_equal(scheduler.evaluate(shape, tiles, heightmap_tile, PARAMETERS, workers=2), serial)
+        assert scheduler.executor is executor
+    finally:
+        scheduler.shutdown()
+    assert np.array_equal(parallel, serial)
+    assert scheduler.workers == 1
+
+
+def test_pool_in_use_is_not_replaced() -> None:
+    scheduler = TileScheduler(workers=1)
+    try:
+        executor, workers = scheduler._acquire(2)  # noqa: WPS437
+        # A larger evaluation while another one runs gets the workers of the running pool
+        assert scheduler._acquire(4) == (executor, workers)  # noqa: WPS437
+    finally:
+        scheduler.shutdown()
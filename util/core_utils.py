@@ -1,19 +1,27 @@
 # noqa: D100
+import hashlib
 import importlib
 import inspect
+import os
 import pkgutil
 import sys
 from abc import ABC  # noqa: H306
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import TypeVar
 
+from typing_extensions import Self
+
 _T = TypeVar('_T')  # noqa: WPS111
 
 
 def get_classes(module_name: str, class_type: type[_T]) -> list[type[_T]]:
     """`get_classes` function returns the list of Classes of a specific type.
 
+    Direct and indirect Subclasses are returned, the type itself is not.
+    Prefer `ClassIndex` when Classes of several types are needed.
+
     Args:
         module_name (str): The name of the module.
         class_type (type[T]): The type of the class to get.
@@ -23,10 +31,87 @@ def get_classes(module_name: str, class_type: type[_T]) -> list[type[_T]]:
     """
     classes = sys.modules[module_name].__dict__.values()
     return [
-        class_obj for class_obj in classes if inspect.isclass(class_obj) and class_type in class_obj.__bases__
+        class_obj for class_obj in classes
+        if inspect.isclass(class_obj) and class_obj is not class_type and class_type in class_obj.__mro__
     ]
 
 
+class ClassIndex():
+    """`ClassIndex` Class buckets Classes of modules by every registrable base Class in one pass.
+
+    Every Class is looked at once, its `__mro__` is matched against the base Classes, so indirect
+    Subclasses are found as well. A Class that is imported into several modules is indexed only
+    for the first module, so it is never registered twice. Base Classes themselves are not indexed.
+
+    Args:
+        modules (list[str]): List of module names to index.
+        base_classes (Iterable[type]): Registrable base Classes.
+    """
+
+    def __init__(
+        self: Self,
+        modules: list[str],
+        base_classes: Iterable[type],
+    ) -> None:
+        self.modules = modules
+        self.base_classes = tuple(base_classes)
+        self.buckets: dict[type, list[list[type]]] = {
+            base_class: [[] for _ in modules] for base_class in self.base_classes
+        }
+
+        seen: set[type] = set()
+        for module_index in range(len(modules)):
+            self._index_module(module_index, seen)
+
+    def reindex(self: Self, module_name: str) -> None:
+        """`reindex` function indexes Classes of a module again, e.g. after the module is reloaded.
+
+        Lists of Classes are updated in place, so lists returned by `get` stay valid.
+        A module that is not indexed yet is appended to the modules.
+
+        Args:
+            module_name (str): Name of the module.
+        """
+        if module_name not in self.modules:
+            self.modules.append(module_name)
+            for buckets in self.buckets.values():
+                buckets.append([])
+
+        module_index = self.modules.index(module_name)
+        for buckets in self.buckets.values():
+            buckets[module_index].clear()
+
+        # Classes of other modules stay indexed for the module they were found in first
+        seen = {
+            class_obj
+            for buckets in self.buckets.values()
+            for classes in buckets
+            for class_obj in classes
+        }
+        self._index_module(module_index, seen)
+
+    def get(self: Self, class_type: type[_T]) -> list[list[type[_T]]]:
+        """`get` function returns indexed Classes of a specific type.
+
+        Args:
+            class_type (type[T]): One of the base Classes of the index.
+
+        Returns:
+            list[list[type[T]]]: Lists of Classes of a specified type per module.
+        """
+        return self.buckets[class_type]  # type: ignore[return-value]
+
+    def _index_module(self: Self, module_index: int, seen: set[type]) -> None:
+        bases = frozenset(self.base_classes)
+        for class_obj in sys.modules[self.modules[module_index]].__dict__.values():
+            if not isinstance(class_obj, type) or class_obj in seen or class_obj in bases:
+                continue
+            seen.add(class_obj)
+
+            for base_class in bases.intersection(class_obj.__mro__):
+                self.buckets[base_class][module_index].append(class_obj)
+
+
 def get_class_attrs(
     class_object: object,
     attribute_type: type[_T],
@@ -77,18 +162,91 @@ def list_all_modules_helper(package_name: str | None = None) -> list[str]:
     return module_names
 
 
-def import_all_modules() -> list[str]:
-    """`import_all_modules` function imports all necessary modules to prevent errors.
+def get_cache_path(file_name: str, package_name: str | None = None) -> Path:
+    """`get_cache_path` function returns the path of an add-on cache file.
+
+    Cache files are stored in the package's `__pycache__` directory, next to the bytecode they mirror.
+
+    Args:
+        file_name (str): The name of the cache file.
+        package_name (str | None): The name of the package, \
+        if not specified will be extracted from the module name.
+
+    Returns:
+        Path: Path of the cache file, the directory may not exist yet.
+    """
+    if package_name is None:
+        package_name = __name__.split('.', maxsplit=1)[0]
+
+    return Path(importlib.import_module(package_name).__path__[0]) / '__pycache__' / file_name
+
+
+def get_user_cache_path(directory_name: str, package_name: str | None = None) -> Path:
+    """`get_user_cache_path` function returns the path of a directory for large add-on caches in the user profile.
+
+    The add-on directory can be read-only and is replaced on every update, so large caches are kept
+    in the extension user directory, or in the user cache directory of the platform(e.g. `~/.cache`)
+    for legacy add-ons and outside of Blender.
+
+    Args:
+        directory_name (str): The name of the cache directory.
+        package_name (str | None): The name of the package, \
+        if not specified will be extracted from the module name.
 
     Returns:
-        list[str]: List of package's modules.
+        Path: Path of the cache directory, it may not exist yet.
     """
-    modules = list_all_modules_helper()
+    if package_name is None:
+        package_name = __name__.rsplit('.', maxsplit=2)[0]
+
+    try:
+        import bpy.utils  # noqa: WPS433  # Not available in worker processes
+        return Path(bpy.utils.extension_path_user(package_name, path=directory_name, create=False))
+    # Legacy add-ons aren't extensions and Blender before 4.2 has no extension directories
+    except (ImportError, AttributeError, ValueError):
+        pass
+
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+    elif sys.platform == 'darwin':
+        base = Path.home() / 'Library' / 'Caches'
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / package_name.rsplit('.', maxsplit=1)[-1] / directory_name
+
 
-    # Importing the modules, some may be repeated but it's not a big problem
-    _ = [importlib.import_module(module) for module in modules]
+def get_addon_version(package_name: str | None = None) -> tuple[int, ...]:
+    """`get_addon_version` function returns the version of the add-on from its `bl_info`.
+
+    Args:
+        package_name (str | None): The name of the package, \
+        if not specified will be extracted from the module name.
+
+    Returns:
+        tuple[int, ...]: Version of the add-on, `(0,)` if the package has no `bl_info`.
+    """
+    if package_name is None:
+        package_name = __name__.split('.', maxsplit=1)[0]
 
-    return modules
+    bl_info = getattr(importlib.import_module(package_name), 'bl_info', {})
+    return tuple(bl_info.get('version', (0,)))
+
+
+def file_hash(path: str | Path, chunk_size: int = 1 << 20) -> str:
+    """`file_hash` function returns the SHA-1 hex digest of a file's content.
+
+    Args:
+        path (str | Path): Path of the file.
+        chunk_size (int): Size of chunks the file is read in.
+
+    Returns:
+        str: Hex digest of the file's content.
+    """
+    digest = hashlib.sha1(usedforsecurity=False)
+    with open(path, 'rb') as hashed_file:
+        while chunk := hashed_file.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
 @dataclass(frozen=True)
@@ -124,6 +282,18 @@ class CONSTANTS(ABC):
         ),
     )
 
+    # pylint: disable=invalid-name
+    default_registration_tier: str = 'core'
+
+    # pylint: disable=invalid-name
+    eager_registration_tiers: frozenset[str] = field(
+        default_factory=lambda: frozenset(
+            (
+                'core',
+            ),
+        ),
+    )
+
     @dataclass(frozen=True)
     class BColors(ABC):
         """`BColors` class is a dataclass that stores terminal color codes.
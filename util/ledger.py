@@ -0,0 +1,168 @@
+# noqa: D100
+import logging
+import os
+import tracemalloc
+from collections.abc import Callable, Hashable
+from pathlib import Path
+from typing import Any
+
+from typing_extensions import Self
+
+TRACE_MEMORY_ENV = 'BIOME_NODES_TRACE_MEMORY'
+
+# Frames kept per traced allocation, enough to tell which function of the add-on holds the memory
+TRACE_FRAMES = 4
+
+# Allocation sites listed in a memory report
+TRACE_TOP = 10
+
+# Allocations are reported at the most recent frame in the add-on, where they are retained from
+PACKAGE_DIRECTORY = str(Path(__file__).resolve().parent.parent)
+
+Release = Callable[[], Any]
+
+
+def _site(traceback: tracemalloc.Traceback) -> tracemalloc.Frame:
+    for frame in reversed(traceback):
+        if frame.filename.startswith(PACKAGE_DIRECTORY):
+            return frame
+    return traceback[-1]
+
+
+class ResourceLedger():
+    """`ResourceLedger` Class records resources the add-on creates and releases them in exact reverse order.
+
+    Registered Classes, pointer properties, preview collections, timers, draw handlers and worker pools are recorded
+    when they are created, owners discard entries of resources they release themselves. `release` tears
+    down everything that is left, so repeated enable/disable cycles don't accumulate anything.
+
+    Memory tracing is opt-in: if `BIOME_NODES_TRACE_MEMORY` environment variable is set to a non-empty value
+    other than '0', `release` reports memory retained since the previous `release` with `tracemalloc`.
+
+    Args:
+        trace_memory (bool | None): Whether to trace memory, if not specified will be taken from the environment.
+        logger (Logger | None): Logger object to use for Info output and errors of releases.
+    """
+
+    def __init__(
+        self: Self,
+        trace_memory: bool | None = None,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        if trace_memory is None:
+            trace_memory = os.environ.get(TRACE_MEMORY_ENV, '0') not in {'', '0'}
+        self.trace_memory = trace_memory
+
+        self.entries: dict[Hashable, tuple[str, str, Release]] = {}
+        self.snapshot: tracemalloc.Snapshot | None = None
+
+    def __len__(self: Self) -> int:
+        """Number of recorded resources."""
+        return len(self.entries)
+
+    def __contains__(self: Self, key: Hashable) -> bool:
+        """Whether a resource is recorded."""
+        return key in self.entries
+
+    def record(self: Self, kind: str, key: Hashable, release: Release, name: str | None = None) -> None:
+        """`record` function records a created resource, a resource that is already recorded keeps its place.
+
+        Args:
+            kind (str): Kind of the resource, e.g. 'Operators' or 'timers'.
+            key (Hashable): Identity of the resource, e.g. the Class or `(bpy_struct, attribute)`.
+            release (Release): Function that releases the resource.
+            name (str | None): Name of the resource in reports, `key` if not specified.
+        """
+        if key not in self.entries:
+            self.entries[key] = (kind, str(key) if name is None else name, release)
+
+    def discard(self: Self, key: Hashable) -> None:
+        """`discard` function forgets a resource that was released by its owner.
+
+        Args:
+            key (Hashable): Identity of the resource.
+        """
+        self.entries.pop(key, None)
+
+    def release(self: Self) -> dict[str, int]:
+        """`release` function releases all recorded resources, the last recorded first.
+
+        A failing release is logged and doesn't stop the others.
+
+        Returns:
+            dict[str, int]: Number of released resources by kind.
+        """
+        released: dict[str, int] = {}
+        while self.entries:
+            kind, name, release = self.entries.pop(next(reversed(self.entries)))
+            try:
+                release()
+            except Exception:  # noqa: B902  # Everything else must still be released
+                self.logger.exception('Releasing %s %s failed.', kind, name)
+                continue
+            released[kind] = released.get(kind, 0) + 1
+
+        if released and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                'Released %s.',
+                ', '.join('{count} {kind}'.format(count=count, kind=kind) for kind, count in released.items()),
+                extra={'fields': {'released': released}},
+            )
+        if self.trace_memory:
+            self.report_memory()
+        return released
+
+    def start_tracing(self: Self) -> None:
+        """`start_tracing` function starts `tracemalloc` if memory tracing is enabled, it is called on register."""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+
+    def report_memory(self: Self) -> list[tracemalloc.StatisticDiff]:
+        """`report_memory` function logs memory retained since the previous report, the first report is the baseline.
+
+        Returns:
+            list[StatisticDiff]: Allocation sites that grew the most, empty for the baseline.
+        """
+        if not tracemalloc.is_tracing():
+            return []
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        ))
+        previous, self.snapshot = self.snapshot, snapshot
+        if previous is None:
+            return []
+
+        statistics = snapshot.compare_to(previous, 'traceback')
+        retained = sum(statistic.size_diff for statistic in statistics)
+        top = [statistic for statistic in statistics if statistic.size_diff > 0][:TRACE_TOP]
+        self.logger.warning(
+            'Retained %+.1f KiB since the previous unregister:\n%s',
+            retained / 1024,
+            '\n'.join(
+                '{size:+10.1f} KiB {blocks:+6d} blocks  {frame}'.format(
+                    size=statistic.size_diff / 1024,
+                    blocks=statistic.count_diff,
+                    frame=_site(statistic.traceback),
+                )
+                for statistic in top
+            ),
+            extra={'fields': {
+                'retained_bytes': retained,
+                'sites': [
+                    {'frame': str(_site(statistic.traceback)), 'size_diff': statistic.size_diff}
+                    for statistic in top
+                ],
+            }},
+        )
+        return top
+
+
+# Shared by the registration pipeline and long-lived services, released by `unreg()`
+ledger = ResourceLedger()
@@ -0,0 +1,133 @@
+# noqa: D100
+import json
+import logging
+import os
+import re
+import sys
+from collections.abc import Iterable
+from typing import Any, TextIO
+
+from typing_extensions import Self
+
+from .core_utils import CONSTANTS
+
+LOG_FORMAT_ENV = 'BIOME_NODES_LOG_FORMAT'
+TEXT_FORMAT = 'text'
+JSON_FORMAT = 'json'
+
+# Escape sequences of terminal colors, stripped from messages that don't go to a terminal
+ANSI_PATTERN = re.compile(r'\x1b\[[0-9;]*m')
+
+# Root logger of the add-on, every module logs to a child of it
+PACKAGE_LOGGER = __name__.split('.')[0]
+
+
+class TextFormatter(logging.Formatter):
+    """`TextFormatter` Class formats records as text, colored by level only if the stream is a terminal.
+
+    Colors are added here rather than in messages, so records stay plain for other handlers.
+
+    Args:
+        color (bool): Whether to color messages, ANSI sequences are stripped from messages otherwise.
+    """
+
+    def __init__(self: Self, color: bool) -> None:
+        super().__init__('%(message)s')
+        self.color = color
+        self.colors = CONSTANTS().BColors
+
+    def format(self: Self, record: logging.LogRecord) -> str:  # noqa: D102
+        message = super().format(record)
+        if not self.color:
+            return ANSI_PATTERN.sub('', message)
+        if record.levelno >= logging.WARNING:
+            return '{color}{message}{endc}'.format(color=self.colors.warning, message=message, endc=self.colors.endc)
+        return '{color}{message}{endc}'.format(color=self.colors.info, message=message, endc=self.colors.endc)
+
+
+class JsonFormatter(logging.Formatter):
+    """`JsonFormatter` Class formats records as JSON Lines for machine consumption, e.g. by render farm tools.
+
+    Every line has the time, level, logger and message, fields passed with `extra={'fields': ...}` are merged in.
+    """
+
+    def format(self: Self, record: logging.LogRecord) -> str:  # noqa: D102
+        line: dict[str, Any] = {
+            'time': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': ANSI_PATTERN.sub('', record.getMessage()),
+        }
+        line.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            line['exception'] = self.formatException(record.exc_info)
+        return json.dumps(line, default=str)
+
+
+def log_format() -> str:
+    """`log_format` function returns the log format set in the environment.
+
+    Returns:
+        str: `JSON_FORMAT` or `TEXT_FORMAT`, the default.
+    """
+    return JSON_FORMAT if os.environ.get(LOG_FORMAT_ENV, '').lower() == JSON_FORMAT else TEXT_FORMAT
+
+
+def configure_logging(stream: TextIO | None = None, output_format: str | None = None) -> logging.Handler:
+    """`configure_logging` function installs the handler of the add-on logger, replacing a previous one.
+
+    Records of the add-on don't propagate to the root logger, so they are not output twice. Levels are
+    still inherited, e.g. from the root logger of Blender or of a batch bake.
+
+    Args:
+        stream (TextIO | None): Stream to output to, `sys.stderr` if not specified.
+        output_format (str | None): `TEXT_FORMAT` or `JSON_FORMAT`, see `log_format` if not specified.
+
+    Returns:
+        Handler: The installed handler.
+    """
+    if stream is None:
+        stream = sys.stderr
+    if output_format is None:
+        output_format = log_format()
+
+    handler = logging.StreamHandler(stream)
+    if output_format == JSON_FORMAT:
+        handler.setFormatter(JsonFormatter())
+    else:
+        isatty = getattr(stream, 'isatty', None)
+        handler.setFormatter(TextFormatter(color=bool(isatty and isatty())))
+    handler.bn_handler = True  # type: ignore[attr-defined]
+
+    logger = logging.getLogger(PACKAGE_LOGGER)
+    for previous in [previous for previous in logger.handlers if getattr(previous, 'bn_handler', False)]:
+        logger.removeHandler(previous)
+    logger.addHandler(handler)
+    logger.propagate = False
+    return handler
+
+
+def log_summary(logger: logging.Logger, action: str, kind: str, classes: Iterable[type]) -> None:
+    """`log_summary` function logs one record per registration phase instead of one per Class.
+
+    Nothing is formatted if INFO is disabled, names of Classes are only listed in the message at DEBUG level,
+    JSON records always carry them as fields.
+
+    Args:
+        logger (Logger): Logger to log to.
+        action (str): Past tense of the phase, e.g. 'Registered'.
+        kind (str): Plural of the kind of Classes, e.g. 'Operators'.
+        classes (Iterable[type]): Classes of the phase, nothing is logged if empty.
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
+    names = [class_obj.__name__ for class_obj in classes]
+    if not names:
+        return
+
+    fields = {'action': action, 'kind': kind, 'count': len(names), 'classes': names}
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.info('%s %d %s: %s.', action, len(names), kind, ', '.join(names), extra={'fields': fields})
+    else:
+        logger.info('%s %d %s.', action, len(names), kind, extra={'fields': fields})
@@ -0,0 +1,248 @@
+# noqa: D100
+import importlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from typing_extensions import Self
+
+from .core_utils import ClassIndex, file_hash, get_cache_path
+from .profiler import profiler
+
+MANIFEST_VERSION = 1
+
+
+class ModuleManifest():  # noqa: WPS214
+    """`ModuleManifest` Class caches the result of module discovery between add-on startups.
+
+    The manifest maps every module of the package to the names of registrable Classes it contains,
+    keyed by file `mtime`, size and content hash. Directories are keyed by their `mtime`, which changes
+    whenever an entry is added, removed or renamed, so unchanged subtrees are never listed again.
+    On a warm start only the manifest is read and only the modules that contain registrable Classes
+    are imported. Changed files invalidate their own entry and nothing else.
+
+    Args:
+        package_name (str): The name of the package to discover modules in.
+        path (str | Path): Path of the JSON manifest file.
+        base_classes (dict[str, type]): Registrable base Classes, keyed by the name stored in the manifest.
+        logger (Logger | None): Logger object that is going to be used for debug output.
+    """
+
+    def __init__(
+        self: Self,
+        package_name: str,
+        path: str | Path,
+        base_classes: dict[str, type],
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.package_name = package_name
+        self.path = Path(path)
+        self.base_classes = base_classes
+        self.modules: dict[str, dict[str, Any]] = {}
+        self.directories: dict[str, dict[str, Any]] = {}
+        self.dirty = False
+
+    def load(self: Self) -> None:
+        """`load` function reads the manifest from disk, an unreadable or stale manifest is discarded."""
+        try:
+            with self.path.open(encoding='utf-8') as manifest_file:
+                data = json.load(manifest_file)
+        except (OSError, ValueError):
+            self.dirty = True
+            return
+
+        if data.get('version') != MANIFEST_VERSION or data.get('package') != self.package_name:
+            self.dirty = True
+            return
+        if data.get('bases') != sorted(self.base_classes):
+            self.dirty = True
+            return
+
+        self.modules = data.get('modules', {})
+        self.directories = data.get('directories', {})
+
+    def save(self: Self) -> None:
+        """`save` function writes the manifest to disk if anything has changed since `load`."""
+        if not self.dirty:
+            return
+
+        data = {
+            'version': MANIFEST_VERSION,
+            'package': self.package_name,
+            'bases': sorted(self.base_classes),
+            'modules': self.modules,
+            'directories': self.directories,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with tmp_path.open('w', encoding='utf-8') as manifest_file:
+                json.dump(data, manifest_file, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as error:
+            # Read-only installations still work, they just pay for a cold discovery every time
+            self.logger.debug('Could not write module manifest %s: %s.', self.path, error)
+            return
+        self.dirty = False
+
+    def list_modules(self: Self) -> list[str]:
+        """`list_modules` function returns all module names of the package, re-listing only changed directories.
+
+        Returns:
+            list[str]: List of module names of the package.
+        """
+        package = importlib.import_module(self.package_name)
+        root = Path(package.__path__[0])
+
+        seen_directories: set[str] = set()
+        module_names = self._list_directory(root, root, self.package_name, seen_directories)
+
+        # Forget directories that were removed since the last run
+        for stale in set(self.directories) - seen_directories:
+            del self.directories[stale]  # noqa: WPS420
+            self.dirty = True
+
+        return module_names
+
+    def discover(self: Self) -> list[str]:
+        """`discover` function returns and imports modules that contain registrable Classes.
+
+        Modules whose manifest entry is still valid are not imported unless they contain registrable Classes.
+        Modules that are new or changed are imported once to refresh their entry.
+
+        Returns:
+            list[str]: List of module names that contain registrable Classes.
+        """
+        self.load()
+        module_names = self.list_modules()
+        root = Path(importlib.import_module(self.package_name).__path__[0])
+
+        registrable = []
+        for module_name in module_names:
+            entry = self.modules.get(module_name)
+            relative_name = module_name[len(self.package_name) + 1:]
+            module_path = root.joinpath(*relative_name.split('.')).with_suffix('.py')
+
+            if entry is None or not self._entry_is_valid(entry, module_path):
+                entry = self._record(module_name, module_path)
+
+            if any(entry['classes'].values()):
+                registrable.append(module_name)
+
+        for stale in set(self.modules) - set(module_names):
+            del self.modules[stale]  # noqa: WPS420
+            self.dirty = True
+
+        # Importing the modules, some may be already imported while refreshing entries
+        for module in registrable:
+            with profiler.phase('imports', module):
+                importlib.import_module(module)
+
+        self.save()
+        return registrable
+
+    def _list_directory(
+        self: Self,
+        directory: Path,
+        root: Path,
+        package_name: str,
+        seen_directories: set[str],
+    ) -> list[str]:
+        key = directory.relative_to(root).as_posix()
+        seen_directories.add(key)
+
+        mtime_ns = directory.stat().st_mtime_ns
+        entry = self.directories.get(key)
+        if entry is None or entry['mtime_ns'] != mtime_ns:
+            entry = self._scan_directory(directory, mtime_ns)
+            self.directories[key] = entry
+            self.dirty = True
+
+        module_names = ['{package}.{module}'.format(package=package_name, module=name) for name in entry['modules']]
+        for sub_package in entry['packages']:
+            module_names += self._list_directory(
+                directory / sub_package,
+                root,
+                '{package}.{module}'.format(package=package_name, module=sub_package),
+                seen_directories,
+            )
+        return module_names
+
+    @staticmethod
+    def _scan_directory(directory: Path, mtime_ns: int) -> dict[str, Any]:
+        modules = []
+        packages = []
+        with os.scandir(directory) as entries:
+            for dir_entry in entries:
+                name = dir_entry.name
+                if name.startswith('.') or name in {'__init__.py', '__pycache__'}:
+                    continue
+                if dir_entry.is_dir():
+                    if os.path.isfile(os.path.join(dir_entry.path, '__init__.py')):
+                        packages.append(name)
+                elif name.endswith('.py') and name[:-3].isidentifier():
+                    modules.append(name[:-3])
+        return {'mtime_ns': mtime_ns, 'modules': sorted(modules), 'packages': sorted(packages)}
+
+    def _entry_is_valid(self: Self, entry: dict[str, Any], module_path: Path) -> bool:
+        try:
+            stat = module_path.stat()
+        except OSError:
+            return False
+
+        if entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return True
+
+        # Touched but not modified(e.g. checkout), keep the entry and refresh the key
+        if entry['size'] == stat.st_size and entry['sha1'] == file_hash(module_path):
+            entry['mtime_ns'] = stat.st_mtime_ns
+            self.dirty = True
+            return True
+        return False
+
+    def _record(self: Self, module_name: str, module_path: Path) -> dict[str, Any]:
+        self.logger.debug('Refreshing module manifest entry for %s.', module_name)
+        with profiler.phase('imports', module_name):
+            importlib.import_module(module_name)
+
+        stat = module_path.stat()
+        class_index = ClassIndex([module_name], self.base_classes.values())
+        entry = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha1': file_hash(module_path),
+            'classes': {
+                base_name: sorted(class_obj.__qualname__ for class_obj in class_index.get(base_class)[0])
+                for base_name, base_class in self.base_classes.items()
+            },
+        }
+        self.modules[module_name] = entry
+        self.dirty = True
+        return entry
+
+
+def discover_modules(base_classes: dict[str, type], package_name: str | None = None) -> list[str]:
+    """`discover_modules` function imports modules with registrable Classes using the package's `ModuleManifest`.
+
+    The manifest is stored in the package's `__pycache__` directory, next to the bytecode it mirrors.
+
+    Args:
+        base_classes (dict[str, type]): Registrable base Classes, keyed by the name stored in the manifest.
+        package_name (str | None): The name of the package, \
+        if not specified will be extracted from the module name.
+
+    Returns:
+        list[str]: List of module names that contain registrable Classes.
+    """
+    if package_name is None:
+        package_name = __name__.split('.', maxsplit=1)[0]
+
+    manifest = ModuleManifest(package_name, get_cache_path('module_manifest.json', package_name), base_classes)
+    return manifest.discover()
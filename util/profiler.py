@@ -0,0 +1,160 @@
+# noqa: D100
+import json
+import logging
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from typing_extensions import Self
+
+PROFILE_ENV = 'BIOME_NODES_PROFILE'
+PROFILE_JSON_ENV = 'BIOME_NODES_PROFILE_JSON'
+
+
+class RegistrationProfiler():
+    """`RegistrationProfiler` Class records wall time of registration phases.
+
+    Profiling is opt-in: it is enabled if `BIOME_NODES_PROFILE` environment variable is set to a non-empty
+    value other than '0'. If `BIOME_NODES_PROFILE_JSON` is set, `dump` appends reports to that path(JSON Lines).
+    Disabled profiler costs a single attribute check per phase.
+
+    Args:
+        enabled (bool | None): Whether to record, if not specified will be taken from the environment.
+        logger (Logger | None): Logger object that is going to be used to output the report table.
+    """
+
+    def __init__(
+        self: Self,
+        enabled: bool | None = None,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        if enabled is None:
+            enabled = os.environ.get(PROFILE_ENV, '0') not in {'', '0'}
+        self.enabled = enabled
+
+        self.phases: dict[str, list[float]] = {}
+        self.details: dict[str, dict[str, float]] = {}
+
+    @contextmanager
+    def phase(self: Self, name: str, detail: str | None = None) -> Iterator[None]:
+        """`phase` context manager measures wall time of the wrapped block.
+
+        Repeated phases are accumulated, e.g. `register_class` is recorded once per Class.
+
+        Args:
+            name (str): Name of the phase.
+            detail (str | None): Optional name of the item(e.g. Class name) to record separately.
+
+        Yields:
+            None: Control to the measured block.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases.setdefault(name, []).append(elapsed)
+            if detail is not None:
+                phase_details = self.details.setdefault(name, {})
+                phase_details[detail] = phase_details.get(detail, 0) + elapsed
+
+    def reset(self: Self) -> None:
+        """`reset` function forgets all recorded timings."""
+        self.phases.clear()
+        self.details.clear()
+
+    def report(self: Self) -> dict[str, Any]:
+        """`report` function returns recorded timings as a structured report.
+
+        Returns:
+            dict[str, Any]: Phases in recording order with call count, total and max time in milliseconds, \
+            and per item timings.
+        """
+        return {
+            'phases': [
+                {
+                    'name': name,
+                    'calls': len(timings),
+                    'total_ms': round(sum(timings) * 1000, 3),
+                    'max_ms': round(max(timings) * 1000, 3),
+                }
+                for name, timings in self.phases.items()
+            ],
+            'details': {
+                name: {detail: round(elapsed * 1000, 3) for detail, elapsed in details.items()}
+                for name, details in self.details.items()
+            },
+        }
+
+    def to_json(self: Self, label: str | None = None) -> str:
+        """`to_json` function returns the report as JSON.
+
+        Args:
+            label (str | None): Optional label of the report(e.g. 'register').
+
+        Returns:
+            str: JSON encoded report.
+        """
+        return json.dumps({'label': label, **self.report()})
+
+    def log_table(self: Self, label: str = 'Registration', slowest: int = 5) -> None:
+        """`log_table` function outputs a compact table of phases and the slowest items through the logger.
+
+        Args:
+            label (str): Label of the table.
+            slowest (int): Number of the slowest items to output per phase.
+        """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
+        report = self.report()
+        lines = ['{phase:<28}{calls:>8}{total:>12}{max:>12}'.format(
+            phase='phase', calls='calls', total='total ms', max='max ms',
+        ),
+        ]
+        for phase in report['phases']:
+            lines.append('{name:<28}{calls:>8}{total_ms:>12.3f}{max_ms:>12.3f}'.format(**phase))
+            details = sorted(report['details'].get(phase['name'], {}).items(), key=lambda item: -item[1])
+            for detail, elapsed in details[:slowest]:
+                lines.append('  {detail:<34}{elapsed:>24.3f}'.format(detail=detail[-34:], elapsed=elapsed))
+
+        self.logger.info('%s profile:\n%s', label, '\n'.join(lines), extra={'fields': {'label': label, **report}})
+
+    def dump(self: Self, label: str) -> None:
+        """`dump` function outputs the report if profiling is enabled and anything was recorded, then resets.
+
+        The table is always logged, even if the add-on logger inherits a level above INFO(Blender's is WARNING),
+        JSON is appended only if `BIOME_NODES_PROFILE_JSON` is set.
+
+        Args:
+            label (str): Label of the report(e.g. 'Register').
+        """
+        if not self.enabled or not self.phases:
+            return
+
+        # Profiling was asked for, so its logger outputs INFO regardless of the inherited level
+        if not self.logger.isEnabledFor(logging.INFO):
+            self.logger.setLevel(logging.INFO)
+        self.log_table(label)
+        json_path = os.environ.get(PROFILE_JSON_ENV)
+        if json_path:
+            with Path(json_path).open('a', encoding='utf-8') as json_file:
+                json_file.write(self.to_json(label))
+                json_file.write('\n')
+        self.reset()
+
+
+# Shared by the registration pipeline, so phases of `build_registration` and `reg()` end up in one report
+profiler = RegistrationProfiler()
@@ -0,0 +1,91 @@
+"""Deterministic random streams partitioned by seed and stream keys.
+
+Every random consumer(a node, a species, a tile, a purpose within them) draws from its own stream,
+identified by a path of keys under a seed. Streams are independent `SeedSequence` children fed to
+counter-based `Philox` generators, so a stream does not depend on how many other streams exist,
+which worker evaluates it or in which order. Adding a species or a tile never shifts the numbers
+of the others, and results are bit-identical for any number of workers.
+"""
+import zlib
+from dataclasses import dataclass
+
+import numpy as np
+from typing_extensions import Self
+
+StreamKey = int | str
+
+
+def stream_key(key: StreamKey) -> int:
+    """`stream_key` function converts a key of a stream path to an integer that is stable between sessions.
+
+    Args:
+        key (StreamKey): Non-negative integer(e.g. an index) or a string(e.g. a node name).
+
+    Returns:
+        int: Integer key, strings are hashed with CRC-32 since `hash` of strings is salted per process.
+
+    Raises:
+        ValueError: If an integer key is negative.
+    """
+    if isinstance(key, str):
+        return zlib.crc32(key.encode('utf-8'))
+    if key < 0:
+        raise ValueError('Stream keys must be non-negative, got {key}.'.format(key=key))
+    return int(key)
+
+
+@dataclass(frozen=True)
+class RandomStreams():
+    """`RandomStreams` Class is a node of a tree of random streams, picklable and hashable.
+
+    Args:
+        seed (int): Root seed of the tree.
+        path (tuple[int, ...]): Keys of this node, see `stream_key`.
+    """
+
+    seed: int
+    path: tuple[int, ...] = ()
+
+    def child(self: Self, *keys: StreamKey) -> 'RandomStreams':
+        """`child` function returns streams below this node, e.g. of one tile of a node.
+
+        Args:
+            keys (StreamKey): Keys of the child below this node.
+
+        Returns:
+            RandomStreams: Streams of the child.
+        """
+        return RandomStreams(self.seed, self.path + tuple(stream_key(key) for key in keys))
+
+    def seed_sequence(self: Self, *keys: StreamKey) -> np.random.SeedSequence:
+        """`seed_sequence` function returns the seed sequence of a stream.
+
+        Args:
+            keys (StreamKey): Keys of the stream below this node.
+
+        Returns:
+            SeedSequence: Seed sequence, equal to spawning children of the root seed along the path.
+        """
+        return np.random.SeedSequence(self.seed, spawn_key=self.child(*keys).path)
+
+    def generator(self: Self, *keys: StreamKey) -> np.random.Generator:
+        """`generator` function returns a fresh generator of a stream, the same for the same keys.
+
+        Args:
+            keys (StreamKey): Keys of the stream below this node.
+
+        Returns:
+            Generator: Generator backed by `Philox`.
+        """
+        return np.random.Generator(np.random.Philox(self.seed_sequence(*keys)))
+
+    def derive_seed(self: Self, *keys: StreamKey) -> int:
+        """`derive_seed` function returns an integer seed of a stream, for code that takes plain seeds.
+
+        Args:
+            keys (StreamKey): Keys of the stream below this node.
+
+        Returns:
+            int: Seed in `[0, 2**32)`.
+        """
+        return int(self.seed_sequence(*keys).generate_state(1, np.uint32)[0])
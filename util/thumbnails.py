@@ -0,0 +1,96 @@
+# noqa: D100
+import logging
+import os
+import threading
+from functools import cache
+from importlib.util import find_spec
+from pathlib import Path
+from types import ModuleType
+
+from typing_extensions import Self
+
+from .core_utils import file_hash
+
+
+@cache
+def pillow_image() -> ModuleType | None:
+    """`pillow_image` function imports the image decoder on first use, so importing the add-on doesn't pay for it.
+
+    Returns:
+        ModuleType | None: `PIL.Image`, or None if Pillow(optional) is not installed.
+    """
+    try:
+        from PIL import Image  # noqa: WPS433
+    except ImportError:  # Without Pillow icons are loaded at full resolution
+        return None
+    return Image
+
+
+def pillow_available() -> bool:
+    """`pillow_available` function tells whether Pillow is installed, without importing it.
+
+    Returns:
+        bool: Whether `pillow_image` can return the decoder.
+    """
+    return find_spec('PIL') is not None
+
+
+class ThumbnailCache():
+    """`ThumbnailCache` Class stores downscaled copies of images on disk, keyed by the hash of the source file.
+
+    `prepare` is thread-safe and is meant to run on a thread pool: reading, hashing, decoding and
+    encoding release the GIL. If Pillow is not installed, `prepare` returns the source path, see `pillow_available`.
+
+    Args:
+        directory (str | Path): Directory of cached thumbnails.
+        size (int): Maximal width and height of thumbnails in pixels.
+        logger (Logger | None): Logger object that is going to be used to raise warnings.
+    """
+
+    def __init__(
+        self: Self,
+        directory: str | Path,
+        size: int = 128,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(__name__)
+        else:
+            self.logger = logger
+
+        self.directory = Path(directory)
+        self.size = size
+
+    def prepare(self: Self, path: str | Path) -> Path:
+        """`prepare` function returns the path of a thumbnail of an image, creating it if it is not cached yet.
+
+        Args:
+            path (str | Path): Path of the source image.
+
+        Returns:
+            Path: Path of the thumbnail, or of the source image if it can't be downscaled.
+        """
+        path = Path(path)
+        image_module = pillow_image()
+        if image_module is None:
+            return path
+
+        try:
+            thumbnail_path = self.directory / '{digest}_{size}.png'.format(digest=file_hash(path), size=self.size)
+            if thumbnail_path.exists():
+                return thumbnail_path
+
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Unique per thread, the same image may be prepared concurrently by several icon groups
+            tmp_path = thumbnail_path.with_suffix('.{pid}.{tid}.tmp'.format(
+                pid=os.getpid(),
+                tid=threading.get_ident(),
+            ))
+            with image_module.open(path) as image:
+                image.thumbnail((self.size, self.size))
+                image.save(tmp_path, format='PNG')
+            os.replace(tmp_path, thumbnail_path)
+        except OSError as error:
+            self.logger.debug('Could not create thumbnail of %s: %s.', path, error)
+            return path
+        return thumbnail_path